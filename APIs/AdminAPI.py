@@ -1,4 +1,4 @@
-from Controllers.AdminController import _patchUser, _listUsers
+from Controllers.AdminController import _patchUser, _listUsers, _authCacheStats
 from flask import Blueprint, jsonify, request
 from Utils.Decorators import Authorize
 from Utils.Enums import Permissions
@@ -15,4 +15,10 @@ def adminListUsers():
 @Authorize(Permissions.ADMIN)
 def adminPatchUser(uid: int):
     response, code = _patchUser(uid, request.json or {})
+    return jsonify(response), code
+
+@adminBP.route("/auth-cache", methods=["GET"])
+@Authorize(Permissions.ADMIN)
+def adminAuthCacheStats():
+    response, code = _authCacheStats()
     return jsonify(response), code
\ No newline at end of file
@@ -1,10 +1,12 @@
 from Controllers.AuthController import _registerUser, _loginUser
-from Utils.Helpers.RequestHelpers import handleKwargsEndpoint
+from Utils.Helpers.RequestHelpers import handleKwargsEndpoint, Validator
 from flask import Blueprint, request, jsonify
 from Utils.Decorators import Ratelimited
 
 authBP = Blueprint("auth", __name__)
 
+CREDENTIAL_FIELDS = Validator([("username", str, True), ("password", str, True)])
+
 @authBP.route("/register", methods=["POST"])
 @Ratelimited
 def registerUser():
@@ -38,8 +40,7 @@ def registerUser():
             description: Already exists
     """
     data = request.json or {}
-    fields = [("username", str, True), ("password", str, True)]
-    return handleKwargsEndpoint(data, fields, _registerUser)
+    return handleKwargsEndpoint(data, CREDENTIAL_FIELDS, _registerUser)
 
 @authBP.route("/login", methods=["POST"])
 @Ratelimited
@@ -76,6 +77,4 @@ def loginUser():
             description: User does not exist
     """
     data = request.json or {}
-    fields = [("username", str, True), ("password", str, True)]
-    
-    return handleKwargsEndpoint(data, fields, _loginUser)
\ No newline at end of file
+    return handleKwargsEndpoint(data, CREDENTIAL_FIELDS, _loginUser)
\ No newline at end of file
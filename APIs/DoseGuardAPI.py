@@ -2,96 +2,163 @@ from Controllers.DoseGuardController import (_createCaregiver, _createPatient, _
                                             _createSchedule, _attachDoseToSchedule, _attachScheduleToPatient, 
                                             _attachPatientToCaregiver, _createDoseHistory, _deleteDoseFromSchedule,
                                             _deleteScheduleFromPatient, _deletePatientFromCaregiver, _updateCaregiver,
-                                            _updateDoseHistory, _updateSchedule, _updateDose, _updatePill, _updatePatient)
+                                            _updateDoseHistory, _updateSchedule, _updateDose, _updatePill, _updatePatient,
+                                            _bulkCreatePatients, _bulkCreatePills, _bulkCreateDoses, _bulkCreateSchedules,
+                                            _bulkAttachDosesToSchedules, _bulkAttachSchedulesToPatients,
+                                            _bulkAttachPatientsToCaregivers, _bulkCreateDoseHistory,
+                                            _patientTimeline, _caregiverTimeline, _deleteDoseHistory,
+                                            _patientAdherence, _caregiverDashboard, _getDoseHistory, _listDoseHistory)
 from Utils.Helpers.DBHelpers import getFromDB, softDeleteFromDB, listFromDB, listRelatedFromDB, listNestedRelatedFromDB
-from Utils.Helpers.RequestHelpers import handleKwargsEndpoint, handleDictEndpoint
+from Utils.Helpers.RequestHelpers import handleKwargsEndpoint, handleDictEndpoint, handleBulkEndpoint, Validator
 from Models import Caregiver, Patient, Pill, Dose, Schedule, DoseHistory
 from flask import Blueprint, request, jsonify
 from Utils.Decorators import Ratelimited, Authorize
-from Utils.Enums import Permissions
+from Utils.Enums import Permissions, Granularity
+from datetime import datetime
 
 doseGuardBP = Blueprint("doseguard", __name__)
 
+PAGE_FIELDS = Validator([("limit", int, False), ("after", str, False)])
+ARCHIVED_FIELDS = Validator([("include_archived", bool, False)])
+ARCHIVED_PAGE_FIELDS = Validator([("limit", int, False), ("after", str, False), ("include_archived", bool, False)])
+TIMELINE_FIELDS = Validator([("from", datetime, False), ("to", datetime, False)])
+ADHERENCE_FIELDS = Validator([("granularity", Granularity, False), ("doseId", int, False), ("from", datetime, False), ("to", datetime, False)])
+
+CAREGIVER_FIELDS = Validator([("name", str, True), ("username", str, True), ("password", str, True)])
+PATIENT_FIELDS = Validator([("name", str, True), ("age", int, False), ("weight", float, False), ("height", float, False), ("contact", str, False)])
+PILL_FIELDS = Validator([("name", str, True), ("strength", float, True)])
+DOSE_FIELDS = Validator([("pillId", int, True), ("interval", int, True), ("amount", int, True)])
+SCHEDULE_FIELDS = Validator([("name", str, True)])
+SCHEDULE_DOSE_FIELDS = Validator([("scheduleId", int, True), ("doseId", int, True)])
+PATIENT_SCHEDULE_FIELDS = Validator([("patientId", int, True), ("scheduleId", int, True)])
+CAREGIVER_PATIENT_FIELDS = Validator([("caregiverId", int, True), ("patientId", int, True)])
+DOSE_HISTORY_FIELDS = Validator([("patientId", int, True), ("doseId", int, True), ("taken", bool, True)])
+CAREGIVER_UPDATE_FIELDS = Validator([("name", str, False), ("username", str, False), ("passwordHash", str, False)])
+PATIENT_UPDATE_FIELDS = Validator([("name", str, False), ("contact", str, False), ("age", int, False), ("weight", float, False), ("height", float, False)])
+PILL_UPDATE_FIELDS = Validator([("name", str, False), ("strength", float, False)])
+DOSE_UPDATE_FIELDS = Validator([("pillId", int, False), ("interval", int, False), ("amount", int, False)])
+SCHEDULE_UPDATE_FIELDS = Validator([("name", str, False)])
+DOSE_HISTORY_UPDATE_FIELDS = Validator([("taken", bool, False), ("doseId", int, False), ("patientId", int, False)])
+
 ### POST ###
 @doseGuardBP.route("/caregivers", methods=["POST"])
 @Ratelimited
 def createCaregiver():
     data = request.json or {}
-    fields = [("name", str, True), ("username", str, True), ("password", str, True)]
-
-    return handleKwargsEndpoint(data, fields, _createCaregiver)
+    return handleKwargsEndpoint(data, CAREGIVER_FIELDS, _createCaregiver)
 
 @doseGuardBP.route("/patients", methods=["POST"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def createPatient():
     data = request.json or {}
-    fields = [("name", str, True), ("age", int, False), ("weight", float, False), ("height", float, False), ("contact", str, False)]
-
-    return handleKwargsEndpoint(data, fields, _createPatient)
+    return handleKwargsEndpoint(data, PATIENT_FIELDS, _createPatient)
 
 @doseGuardBP.route("/pills", methods=["POST"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def createPill():
     data = request.json or {}
-    fields = [("name", str, True), ("strength", float, True)]
-
-    return handleKwargsEndpoint(data, fields, _createPill)
+    return handleKwargsEndpoint(data, PILL_FIELDS, _createPill)
 
 @doseGuardBP.route("/doses", methods=["POST"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def createDose():
     data = request.json or {}
-    fields = [("pillId", int, True), ("interval", int, True), ("amount", int, True)]
-
-    return handleKwargsEndpoint(data, fields, _createDose)
+    return handleKwargsEndpoint(data, DOSE_FIELDS, _createDose)
 
 @doseGuardBP.route("/schedules", methods=["POST"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def createSchedule():
     data = request.json or {}
-    fields = [("name", str, True)]
-
-    return handleKwargsEndpoint(data, fields, _createSchedule)
+    return handleKwargsEndpoint(data, SCHEDULE_FIELDS, _createSchedule)
 
 @doseGuardBP.route("/schedules/doses", methods=["POST"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def attachDoseToSchedule():
     data = request.json or {}
-    fields = [("scheduleId", int, True), ("doseId", int, True)]
-
-    return handleKwargsEndpoint(data, fields, _attachDoseToSchedule)
+    return handleKwargsEndpoint(data, SCHEDULE_DOSE_FIELDS, _attachDoseToSchedule)
 
 @doseGuardBP.route("/patients/schedules", methods=["POST"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def attachScheduleToPatient():
     data = request.json or {}
-    fields = [("patientId", int, True), ("scheduleId", int, True)]
-
-    return handleKwargsEndpoint(data, fields, _attachScheduleToPatient)
+    return handleKwargsEndpoint(data, PATIENT_SCHEDULE_FIELDS, _attachScheduleToPatient)
 
 @doseGuardBP.route("/caregivers/patients", methods=["POST"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def attachPatientToCaregiver():
     data = request.json or {}
-    fields = [("caregiverId", int, True), ("patientId", int, True)]
-
-    return handleKwargsEndpoint(data, fields, _attachPatientToCaregiver)
+    return handleKwargsEndpoint(data, CAREGIVER_PATIENT_FIELDS, _attachPatientToCaregiver)
 
 @doseGuardBP.route("/dose-history", methods=["POST"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def createDoseHistory():
     data = request.json or {}
-    fields = [("patientId", int, True), ("doseId", int, True), ("taken", bool, True)]
+    return handleKwargsEndpoint(data, DOSE_HISTORY_FIELDS, _createDoseHistory)
 
-    return handleKwargsEndpoint(data, fields, _createDoseHistory)
+### BULK POST ###
+@doseGuardBP.route("/patients/bulk", methods=["POST"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def createPatients():
+    data = request.get_json(silent=True)
+    return handleBulkEndpoint(data, PATIENT_FIELDS, _bulkCreatePatients)
+
+@doseGuardBP.route("/pills/bulk", methods=["POST"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def createPills():
+    data = request.get_json(silent=True)
+    return handleBulkEndpoint(data, PILL_FIELDS, _bulkCreatePills)
+
+@doseGuardBP.route("/doses/bulk", methods=["POST"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def createDoses():
+    data = request.get_json(silent=True)
+    return handleBulkEndpoint(data, DOSE_FIELDS, _bulkCreateDoses)
+
+@doseGuardBP.route("/schedules/bulk", methods=["POST"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def createSchedules():
+    data = request.get_json(silent=True)
+    return handleBulkEndpoint(data, SCHEDULE_FIELDS, _bulkCreateSchedules)
+
+@doseGuardBP.route("/schedules/doses/bulk", methods=["POST"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def attachDosesToSchedules():
+    data = request.get_json(silent=True)
+    return handleBulkEndpoint(data, SCHEDULE_DOSE_FIELDS, _bulkAttachDosesToSchedules)
+
+@doseGuardBP.route("/patients/schedules/bulk", methods=["POST"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def attachSchedulesToPatients():
+    data = request.get_json(silent=True)
+    return handleBulkEndpoint(data, PATIENT_SCHEDULE_FIELDS, _bulkAttachSchedulesToPatients)
+
+@doseGuardBP.route("/caregivers/patients/bulk", methods=["POST"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def attachPatientsToCaregivers():
+    data = request.get_json(silent=True)
+    return handleBulkEndpoint(data, CAREGIVER_PATIENT_FIELDS, _bulkAttachPatientsToCaregivers)
+
+@doseGuardBP.route("/dose-history/bulk", methods=["POST"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def createDoseHistoryEntries():
+    data = request.get_json(silent=True)
+    return handleBulkEndpoint(data, DOSE_HISTORY_FIELDS, _bulkCreateDoseHistory)
 
 ### GET ###
 @doseGuardBP.route("/caregivers/<int:caregiverId>", methods=["GET"])
@@ -133,8 +200,8 @@ def getSchedule(scheduleId):
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def getDoseHistory(entryId):
-    response, code = getFromDB(DoseHistory, entryId, "Dose history not found")
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, ARCHIVED_FIELDS,
+                                lambda include_archived=False: _getDoseHistory(entryId, include_archived))
 
 ### DELETE ###
 @doseGuardBP.route("/caregivers/<int:caregiverId>", methods=["DELETE"])
@@ -176,7 +243,7 @@ def deleteSchedule(scheduleId):
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def deleteDoseHistory(entryId):
-    response, code = softDeleteFromDB(DoseHistory, entryId, "Dose history not found")
+    response, code = _deleteDoseHistory(entryId)
     return jsonify(response), code
 
 @doseGuardBP.route("/schedules/doses", methods=["DELETE"])
@@ -184,113 +251,131 @@ def deleteDoseHistory(entryId):
 @Ratelimited
 def deleteDoseFromSchedule():
     data = request.args
-    fields = [("scheduleId", int, True), ("doseId", int, True)]
-
-    return handleDictEndpoint(data, fields, _deleteDoseFromSchedule)
+    return handleDictEndpoint(data, SCHEDULE_DOSE_FIELDS, _deleteDoseFromSchedule)
 
 @doseGuardBP.route("/patients/schedules", methods=["DELETE"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def deleteScheduleFromPatient():
     data = request.args
-    fields = [("patientId", int, True), ("scheduleId", int, True)]
-
-    return handleDictEndpoint(data, fields, _deleteScheduleFromPatient)
+    return handleDictEndpoint(data, PATIENT_SCHEDULE_FIELDS, _deleteScheduleFromPatient)
 
 @doseGuardBP.route("/caregivers/patients", methods=["DELETE"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def deletePatientFromCaregiver():
     data = request.args
-    fields = [("caregiverId", int, True), ("patientId", int, True)]
-
-    return handleDictEndpoint(data, fields, _deletePatientFromCaregiver)
+    return handleDictEndpoint(data, CAREGIVER_PATIENT_FIELDS, _deletePatientFromCaregiver)
 
 ### GET FOR ###
 @doseGuardBP.route("/caregivers/<int:caregiverId>/patients", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listPatientsForCaregiver(caregiverId):
-    response, code = listRelatedFromDB(Caregiver, caregiverId, "patients", "Caregiver not found")
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS,
+                                lambda **page: listRelatedFromDB(Caregiver, caregiverId, "patients", "Caregiver not found", **page))
 
 @doseGuardBP.route("/patients/<int:patientId>/caregivers", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listCaregiversForPatient(patientId):
-    response, code = listRelatedFromDB(Patient, patientId, "caregivers", "Patient not found")
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS,
+                                lambda **page: listRelatedFromDB(Patient, patientId, "caregivers", "Patient not found", **page))
 
 @doseGuardBP.route("/patients/<int:patientId>/schedules", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listSchedulesForPatient(patientId):
-    response, code = listRelatedFromDB(Patient, patientId, "schedules", "Patient not found")
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS,
+                                lambda **page: listRelatedFromDB(Patient, patientId, "schedules", "Patient not found", **page))
 
 @doseGuardBP.route("/schedules/<int:scheduleId>/doses", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listDosesForSchedule(scheduleId):
-    response, code = listRelatedFromDB(Schedule, scheduleId, "doses", "Schedule not found")
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS,
+                                lambda **page: listRelatedFromDB(Schedule, scheduleId, "doses", "Schedule not found", **page))
 
 @doseGuardBP.route("/pills/<int:pillId>/dose-history", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def getPillDoseHistory(pillId):
-    response, code = listNestedRelatedFromDB(Pill, pillId, ["doses", "history"], "Pill not found")
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS,
+                                lambda **page: listNestedRelatedFromDB(Pill, pillId, ["doses", "history"], "Pill not found", **page))
 
 @doseGuardBP.route("/patients/<int:patientId>/all-doses", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def getPatientSchedulesDoses(patientId):
-    response, code = listNestedRelatedFromDB(Patient, patientId, ["schedules", "doses"], "Patient not found")
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS,
+                                lambda **page: listNestedRelatedFromDB(Patient, patientId, ["schedules", "doses"], "Patient not found", **page))
+
+@doseGuardBP.route("/patients/<int:patientId>/timeline", methods=["GET"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def getPatientTimeline(patientId):
+    return handleKwargsEndpoint(request.args, TIMELINE_FIELDS,
+                                lambda **window: _patientTimeline(patientId, window.get("from"), window.get("to")))
+
+@doseGuardBP.route("/caregivers/<int:caregiverId>/timeline", methods=["GET"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def getCaregiverTimeline(caregiverId):
+    return handleKwargsEndpoint(request.args, TIMELINE_FIELDS,
+                                lambda **window: _caregiverTimeline(caregiverId, window.get("from"), window.get("to")))
+
+@doseGuardBP.route("/caregivers/<int:caregiverId>/dashboard", methods=["GET"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def getCaregiverDashboard(caregiverId):
+    response, code = _caregiverDashboard(caregiverId)
     return jsonify(response), code
 
+@doseGuardBP.route("/patients/<int:patientId>/adherence", methods=["GET"])
+@Authorize(Permissions.PRIVATE)
+@Ratelimited
+def getPatientAdherence(patientId):
+    return handleKwargsEndpoint(request.args, ADHERENCE_FIELDS,
+                                lambda **query: _patientAdherence(patientId, query.get("granularity", Granularity.DAY),
+                                                                  query.get("doseId"), query.get("from"), query.get("to")))
+
 ### GET ALL ###
 @doseGuardBP.route("/caregivers", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listCaregivers():
-    response, code = listFromDB(Caregiver)
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS, lambda **page: listFromDB(Caregiver, **page))
 
 @doseGuardBP.route("/patients", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listPatients():
-    response, code = listFromDB(Patient)
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS, lambda **page: listFromDB(Patient, **page))
 
 @doseGuardBP.route("/pills", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listPills():
-    response, code = listFromDB(Pill)
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS, lambda **page: listFromDB(Pill, **page))
 
 @doseGuardBP.route("/doses", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listDoses():
-    response, code = listFromDB(Dose)
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS, lambda **page: listFromDB(Dose, **page))
 
 @doseGuardBP.route("/schedules", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listSchedules():
-    response, code = listFromDB(Schedule)
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, PAGE_FIELDS, lambda **page: listFromDB(Schedule, **page))
 
 @doseGuardBP.route("/dose-history", methods=["GET"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def listDoseHistory():
-    response, code = listFromDB(DoseHistory)
-    return jsonify(response), code
+    return handleKwargsEndpoint(request.args, ARCHIVED_PAGE_FIELDS,
+                                lambda include_archived=False, **page: _listDoseHistory(includeArchived=include_archived, **page))
 
 ### PATCH ###
 @doseGuardBP.route("/caregivers/<int:caregiverId>", methods=["PATCH"])
@@ -298,51 +383,39 @@ def listDoseHistory():
 @Ratelimited
 def updateCaregiver(caregiverId):
     data = request.json or {}
-    fields = [("name", str, False), ("username", str, False), ("passwordHash", str, False)]
-
-    return handleKwargsEndpoint(data, fields, lambda **upd: _updateCaregiver(caregiverId, upd))
+    return handleKwargsEndpoint(data, CAREGIVER_UPDATE_FIELDS, lambda **upd: _updateCaregiver(caregiverId, upd))
 
 @doseGuardBP.route("/patients/<int:patientId>", methods=["PATCH"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def updatePatient(patientId):
     data = request.json or {}
-    fields = [("name", str, False), ("contact", str, False), ("age", int, False), ("weight", float, False), ("height", float, False)]
-
-    return handleKwargsEndpoint(data, fields, lambda **upd: _updatePatient(patientId, upd))
+    return handleKwargsEndpoint(data, PATIENT_UPDATE_FIELDS, lambda **upd: _updatePatient(patientId, upd))
 
 @doseGuardBP.route("/pills/<int:pillId>", methods=["PATCH"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def updatePill(pillId):
     data = request.json or {}
-    fields = [("name", str, False), ("strength", float, False)]
-
-    return handleKwargsEndpoint(data, fields, lambda **upd: _updatePill(pillId, upd))
+    return handleKwargsEndpoint(data, PILL_UPDATE_FIELDS, lambda **upd: _updatePill(pillId, upd))
 
 @doseGuardBP.route("/doses/<int:doseId>", methods=["PATCH"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def updateDose(doseId):
     data = request.json or {}
-    fields = [("pillId", int, False), ("interval", int, False), ("amount", int, False)]
-
-    return handleKwargsEndpoint(data, fields, lambda **upd: _updateDose(doseId, upd))
+    return handleKwargsEndpoint(data, DOSE_UPDATE_FIELDS, lambda **upd: _updateDose(doseId, upd))
 
 @doseGuardBP.route("/schedules/<int:scheduleId>", methods=["PATCH"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def updateSchedule(scheduleId):
     data = request.json or {}
-    fields = [("name", str, False)]
-
-    return handleKwargsEndpoint(data, fields, lambda **upd: _updateSchedule(scheduleId, upd))
+    return handleKwargsEndpoint(data, SCHEDULE_UPDATE_FIELDS, lambda **upd: _updateSchedule(scheduleId, upd))
 
 @doseGuardBP.route("/dose-history/<int:entryId>", methods=["PATCH"])
 @Authorize(Permissions.PRIVATE)
 @Ratelimited
 def updateDoseHistory(entryId):
     data = request.json or {}
-    fields = [("taken", bool, False), ("doseId", int, False), ("patientId", int, False)]
-
-    return handleKwargsEndpoint(data, fields, lambda **upd: _updateDoseHistory(entryId, upd))
\ No newline at end of file
+    return handleKwargsEndpoint(data, DOSE_HISTORY_UPDATE_FIELDS, lambda **upd: _updateDoseHistory(entryId, upd))
\ No newline at end of file
@@ -1,13 +1,21 @@
 from Controllers.PortfolioController import _uploadImage, _listPosts, _createPost
-from Utils.Helpers.RequestHelpers import handleKwargsEndpoint
-from flask import Blueprint, jsonify, request
+from Utils.Helpers.RequestHelpers import handleKwargsEndpoint, Validator
+from flask import Blueprint, jsonify, request, send_from_directory, abort
 from Utils.Decorators import Ratelimited
 from Utils.Types import FileStorage
+from Config import MPortfolioConfig
+import re
 
 portfolioBP = Blueprint("portfolio", __name__)
 
+POST_FIELDS = Validator([("imageURL", str, True), ("title", str, True), ("description", str, True), ("category", str, True)])
+POST_LIST_FIELDS = Validator([("category", str, False), ("state", bool, False), ("limit", int, False), ("after", str, False)])
+IMAGE_PATH = re.compile(MPortfolioConfig.PORTFOLIO_IMAGE_PATH_PATTERN)
+
 @portfolioBP.route("/image", methods=["POST"])
 def uploadImage():
+    # reject oversized bodies before the form is parsed (one chunk of slack for multipart framing)
+    request.max_content_length = MPortfolioConfig.PORTFOLIO_MAX_UPLOAD_SIZE + MPortfolioConfig.PORTFOLIO_UPLOAD_CHUNK_SIZE
     if not (img := request.files.get("image")):
         return jsonify({"error": "Missing required query parameter 'image'"}), 400
     
@@ -17,11 +25,30 @@ def uploadImage():
 @portfolioBP.route("/posts", methods=["POST"])
 def createPost(): 
     data = request.json or {}
-    fields = [("imageURL", str, True), ("title", str, True), ("description", str, True), ("category", str, True)]
-
-    return handleKwargsEndpoint(data, fields, _createPost)
+    return handleKwargsEndpoint(data, POST_FIELDS, lambda imageURL, title, description, category: _createPost(imageURL, title, description, category))
 
 @portfolioBP.route("/posts", methods=["GET"])
 def listPosts():
-    response, code = _listPosts()
-    return jsonify(response), code
\ No newline at end of file
+    args, err, code = POST_LIST_FIELDS.validate(request.args)
+    if err:
+        return jsonify(err), code
+
+    response, code, etag = _listPosts(**args, knownETags=request.if_none_match)
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = f'"{etag}"'
+
+    if code == 304:
+        return "", 304, headers
+    return jsonify(response), code, headers
+
+@portfolioBP.route("/images/<path:filename>", methods=["GET"])
+def getImage(filename):
+    # only content-addressed files are served, so a URL always maps to the same bytes
+    if not IMAGE_PATH.fullmatch(filename):
+        abort(404)
+
+    response = send_from_directory(MPortfolioConfig.PORTFOLIO_UPLOADS_FOLDER, filename,
+                                   conditional=True, max_age=MPortfolioConfig.PORTFOLIO_IMAGES_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
\ No newline at end of file
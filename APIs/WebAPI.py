@@ -1,5 +1,5 @@
 from Controllers.WebController import _getRoyaNews, _find1337xTorrents
-from Utils.Helpers.RequestHelpers import handleKwargsEndpoint
+from Utils.Helpers.RequestHelpers import handleKwargsEndpoint, Validator
 from Utils.Decorators import Authorize, Ratelimited
 from flask import Blueprint, request, jsonify
 from Utils.Enums import Permissions
@@ -7,6 +7,9 @@ from Utils.Enums import SortOrder
 
 webBP = Blueprint("web", __name__)
 
+NEWS_FIELDS = Validator([("q", str, True)])
+TORRENT_FIELDS = Validator([("q", str, True), ("tsort", SortOrder, False)])
+
 @webBP.route("/news", methods=["GET"])
 @Authorize(Permissions.GENERAL)
 @Ratelimited
@@ -21,7 +24,7 @@ def getRoyaNews():
         in: query
         type: string
         required: true
-        description: Requried search keyword.
+        description: Required search keyword(s). Every matching article is returned, newest first.
       - name: X-API-Key
         in: header
         type: string
@@ -38,9 +41,7 @@ def getRoyaNews():
             description: Error from website
     """
     data = request.args
-    fields = [("q", str, True)]
-    
-    return handleKwargsEndpoint(data, fields, _getRoyaNews)
+    return handleKwargsEndpoint(data, NEWS_FIELDS, lambda q: _getRoyaNews(q))
 
 @webBP.route("/torrent", methods=["GET"])
 @Authorize(Permissions.GENERAL)
@@ -78,6 +79,4 @@ def find1337xTorrents():
             description: Error from website
     """
     data = request.args
-    fields = [("q", str, True), ("tsort", SortOrder, False)]
-
-    return handleKwargsEndpoint(data, fields, _find1337xTorrents)
\ No newline at end of file
+    return handleKwargsEndpoint(data, TORRENT_FIELDS, lambda q, tsort=None: _find1337xTorrents(q, tsort))
\ No newline at end of file
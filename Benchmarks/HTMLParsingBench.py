@@ -0,0 +1,76 @@
+"""
+Scraper parsing cost: full ``html.parser`` trees vs strained ``lxml`` trees.
+
+Parses saved copies of the pages the scrapers read (``Benchmarks/fixtures``)
+both ways, checks that the extracted fields are identical, and reports the
+time per page and the peak memory of building one tree.
+
+The fixtures mirror the structure of the live pages (head scripts, menus,
+sidebars and footers around the elements the scrapers read) with
+placeholder text.
+
+Run from the repository root:
+
+    python -m Benchmarks.HTMLParsingBench
+"""
+from pathlib import Path
+import tracemalloc
+import timeit
+import os
+
+for var in ("ADMIN_USERNAME", "ADMIN_PASSWORD", "DB", "USERS_TABLE", "APP_NAME"):
+    os.environ.setdefault(var, "bench")
+
+from Controllers.NewsCrawler import SECTION_STRAINER, ARTICLE_STRAINER
+from Controllers.WebController import TORRENT_TABLE_STRAINER
+from Utils.Helpers.WebHelpers import parseHTML, HTML_PARSER
+from bs4 import BeautifulSoup
+
+FIXTURES = Path(__file__).parent / "fixtures"
+RUNS = 50
+
+def sectionLinks(sp) -> list:
+    return [(div.a.get("href"), div.a.get_text(strip=True))
+            for div in sp.find_all("div", class_="news_card_small_title") if div.a]
+
+def articleFields(sp) -> tuple:
+    date = sp.find("div", class_="pup_date_news").get_text(strip=True)
+    images = [img.get("src") for img in sp.find("div", class_="news_image").find_all("img")]
+    body = " ".join(p.get_text(strip=True) for p in sp.find("div", class_="Newsbody").find_all("p"))
+    return date, images, body
+
+def torrentRows(sp) -> list:
+    tbl = sp.find("table", class_="table-list")
+    return [(row.find("td", class_="name").select("a:not(.icon)")[0].get("href"),
+             row.find("td", class_="seeds").get_text(strip=True),
+             row.find("td", class_="size").get_text(strip=True))
+            for row in tbl.find_all("tr")[1:]]
+
+PAGES = [
+    ("royanews_section.html", SECTION_STRAINER, sectionLinks),
+    ("royanews_article.html", ARTICLE_STRAINER, articleFields),
+    ("1337x_search.html", TORRENT_TABLE_STRAINER, torrentRows),
+]
+
+def peakKiB(build) -> float:
+    tracemalloc.start()
+    tree = build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del tree
+    return peak / 1024
+
+if __name__ == "__main__":
+    print(f"strained backend: {HTML_PARSER}")
+    for name, strainer, extract in PAGES:
+        html = (FIXTURES / name).read_text()
+        full = lambda: BeautifulSoup(html, "html.parser")
+        strained = lambda: parseHTML(html, strainer)
+
+        assert extract(full()) == extract(strained()), f"{name}: extracted fields differ"
+
+        fullMs = timeit.timeit(full, number=RUNS) / RUNS * 1000
+        strainedMs = timeit.timeit(strained, number=RUNS) / RUNS * 1000
+        print(f"{name:24} full {fullMs:6.2f} ms {peakKiB(full):7.0f} KiB   "
+              f"strained {strainedMs:6.2f} ms {peakKiB(strained):7.0f} KiB   "
+              f"({fullMs / strainedMs:.1f}x faster)")
@@ -0,0 +1,45 @@
+"""
+Serialization cost of a 50k-row dose-history payload: Flask's default JSON
+provider vs ``FastJSONProvider`` (with and without orjson).
+
+Run from the repository root:
+
+    python -m Benchmarks.JSONProviderBench
+"""
+from flask.json.provider import DefaultJSONProvider
+from datetime import datetime, timedelta, timezone
+from flask import Flask
+import timeit
+
+from Utils.Helpers import JSONHelpers
+from Utils.Helpers.JSONHelpers import FastJSONProvider
+
+ROWS = 50_000
+REPEAT = 5
+
+def doseHistoryPayload() -> dict:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return {"data": [{
+        "id": i,
+        "patientId": i % 500,
+        "doseId": i % 40,
+        "taken": i % 3 != 0,
+        "active": True,
+        "createdOn": start + timedelta(minutes=i),
+        "updatedOn": None,
+    } for i in range(ROWS)], "next": None}
+
+def bench(name: str, provider) -> None:
+    payload = doseHistoryPayload()
+    with provider._app.test_request_context():
+        best = min(timeit.repeat(lambda: provider.response(payload).get_data(), number=1, repeat=REPEAT))
+        size = len(provider.response(payload).get_data())
+    print(f"{name:<22} {best * 1000:8.1f} ms  {size / 1024:8.0f} KiB")
+
+if __name__ == "__main__":
+    app = Flask(__name__)
+    bench("flask default", DefaultJSONProvider(app))
+    bench("fast (orjson)", FastJSONProvider(app))
+
+    JSONHelpers.orjson = None
+    bench("fast (stdlib fallback)", FastJSONProvider(app))
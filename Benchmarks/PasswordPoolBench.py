@@ -0,0 +1,82 @@
+"""
+GET latency during a login storm: inline bcrypt vs the bounded hashing limits.
+
+Simulates a threaded worker (``WORKER_THREADS`` request threads) receiving a
+steady stream of cheap GETs while a burst of logins arrives. Inline, every
+login holds a request thread for a full bcrypt check, so GETs queue behind
+them. Bounded, at most ``BCRYPT_MAX_PENDING`` logins hold a thread and the
+rest are answered 503 immediately, leaving threads free for GETs.
+
+Run from the repository root:
+
+    python -m Benchmarks.PasswordPoolBench
+"""
+from concurrent.futures import ThreadPoolExecutor
+import statistics
+import time
+import os
+
+for var in ("ADMIN_USERNAME", "ADMIN_PASSWORD", "DB", "USERS_TABLE", "APP_NAME"):
+    os.environ.setdefault(var, "bench")
+
+from Utils.Helpers.AuthHelpers import verifyPass, PasswordPoolBusy
+from Config import APIConfig
+import bcrypt
+
+WORKER_THREADS = 8
+DURATION = 3.0
+LOGIN_EVERY = 0.02
+GET_EVERY = 0.01
+GET_WORK = 0.002
+
+STORED_HASH = bcrypt.hashpw(b"secret", bcrypt.gensalt(APIConfig.BCRYPT_ROUNDS)).decode()
+
+def inlineLogin():
+    bcrypt.checkpw(b"secret", STORED_HASH.encode())
+    return 200
+
+def boundedLogin():
+    try:
+        verifyPass("secret", STORED_HASH)
+        return 200
+    except PasswordPoolBusy:
+        return 503
+
+def cheapGet():
+    time.sleep(GET_WORK)
+    return 200
+
+def run(login) -> dict:
+    workers = ThreadPoolExecutor(max_workers=WORKER_THREADS)
+    latencies, loginCodes = [], []
+
+    def getJob(queued):
+        cheapGet()
+        latencies.append(time.perf_counter() - queued)
+
+    start = time.perf_counter()
+    nextLogin = nextGet = start
+    while (now := time.perf_counter()) - start < DURATION:
+        if now >= nextLogin:
+            workers.submit(lambda: loginCodes.append(login()))
+            nextLogin += LOGIN_EVERY
+        if now >= nextGet:
+            workers.submit(getJob, time.perf_counter())
+            nextGet += GET_EVERY
+        time.sleep(0.0005)
+
+    workers.shutdown(wait=True)
+    latencies.sort()
+    return {
+        "gets": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "logins_ok": loginCodes.count(200),
+        "logins_503": loginCodes.count(503),
+    }
+
+if __name__ == "__main__":
+    baseline = run(lambda: 200)
+    print(f"no logins  {baseline}")
+    print(f"inline     {run(inlineLogin)}")
+    print(f"bounded    {run(boundedLogin)}")
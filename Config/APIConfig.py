@@ -1,3 +1,5 @@
+import os
+
 NOT_USER_RATELIMIT = "2/minute"
 GENERAL_RATELIMIT = "10/minute"
 PRIVATE_RATELIMIT = "100/minute"
@@ -5,6 +7,33 @@ ADMIN_RATELIMIT = "1000/minute"
 
 CAREGIVER_RATELIMIT = "500/minute"
 
+REDIS_MAX_CONNECTIONS = 50
+REDIS_SOCKET_TIMEOUT = 0.5
+
+RATELIMIT_LEASE_FRACTION = 0.1
+RATELIMIT_REDIS_RETRY = 5
+RATELIMIT_WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+RATELIMIT_MAX_BUCKETS = 100000
+
+AUTH_CACHE_SIZE = 10000
+AUTH_CACHE_TTL = 60
+AUTH_CACHE_FALLBACK_TTL = 5
+AUTH_REDIS_RETRY = 5
+AUTH_VERSION_POLL_INTERVAL = 1
+
+LAST_USE_FLUSH_INTERVAL = 30
+LAST_USE_FLUSH_USERS = 500
+
+BCRYPT_ROUNDS = 12
+BCRYPT_WORKERS = 2
+BCRYPT_MAX_PENDING = 4
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+BULK_MAX_ROWS = 10000
+BULK_CHUNK_SIZE = 1000
+
 def SWAGGER_TEMPLATE(app_name: str):
     return {
         "swagger": "2.0",
@@ -0,0 +1,22 @@
+from . import EnvConfig
+import os
+
+SQL_DSN = os.environ.get("DB_DSN", f"sqlite:///{EnvConfig.SQL_DB}.db")
+ARCHIVE_DSN = os.environ.get("ARCHIVE_DB_DSN", f"sqlite:///{EnvConfig.SQL_DB}_archive.db")
+
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() in ["true", "1", "yes"]
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -64 * 1024)),
+}
+
+SQL_SCHEMA_VERSION_TABLE = "schema_version"
+DB_MIGRATE_ON_STARTUP = os.environ.get("DB_MIGRATE_ON_STARTUP", "true").lower() in ["true", "1", "yes"]
@@ -1,3 +1,5 @@
+import os
+
 SQL_CAREGIVER_TABLE = "caregivers"
 SQL_PATIENT_TABLE = "patients"
 SQL_CAREGIVER_PATIENT_TABLE = "caregivers_patients"
@@ -6,4 +8,22 @@ SQL_PATIENT_SCHEDULE_TABLE = "patients_schedules"
 SQL_PILLS_TABLE = "pills"
 SQL_DOSES_TABLE = "doses"
 SQL_SCHEDULE_DOSES_TABLE = "schedules_doses"
-SQL_DOSE_HISTORY_TABLE = "dose_history"
\ No newline at end of file
+SQL_DOSE_HISTORY_TABLE = "dose_history"
+SQL_ADHERENCE_TABLE = "dose_adherence_daily"
+SQL_DOSE_HISTORY_CHUNKS_TABLE = "dose_history_chunks"
+SQL_DOSE_HISTORY_ARCHIVED_TABLE = "dose_history_archived"
+
+DOSE_INTERVAL_SECONDS = 60 * 60
+TIMELINE_DEFAULT_HOURS = 7 * 24
+TIMELINE_MAX_HOURS = 93 * 24
+TIMELINE_MAX_EVENTS = 10000
+
+DASHBOARD_CACHE_SIZE = 1024
+DASHBOARD_CACHE_TTL = 30
+DASHBOARD_CACHE_FALLBACK_TTL = 5
+DASHBOARD_REDIS_RETRY = 5
+
+HISTORY_ARCHIVE_AFTER_DAYS = int(os.environ.get("DOSE_HISTORY_ARCHIVE_DAYS", 180))
+HISTORY_ARCHIVE_BATCH_SIZE = 5000
+HISTORY_ARCHIVE_COMPRESSION = 6
+HISTORY_ARCHIVE_CHUNK_CACHE = 64
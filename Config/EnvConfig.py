@@ -9,4 +9,6 @@ ADMIN_PASSWORD = os.environ["ADMIN_PASSWORD"]
 SQL_DB = os.environ["DB"]
 SQL_USERS_TABLE = os.environ["USERS_TABLE"]
 
-APP_NAME = os.environ["APP_NAME"]
\ No newline at end of file
+APP_NAME = os.environ["APP_NAME"]
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
\ No newline at end of file
@@ -1,2 +1,28 @@
+import os
+
 SQL_PORTFOLIO_POSTS_TABLE = "portfolio_posts"
-PORTFOLIO_UPLOADS_FOLDER = "/"
\ No newline at end of file
+SQL_PORTFOLIO_IMAGE_VARIANTS_TABLE = "portfolio_image_variants"
+PORTFOLIO_UPLOADS_FOLDER = os.path.abspath(os.environ.get("PORTFOLIO_UPLOADS_FOLDER", "uploads"))
+
+PORTFOLIO_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+PORTFOLIO_UPLOAD_CHUNK_SIZE = 64 * 1024
+PORTFOLIO_SHARD_DEPTH = 2
+PORTFOLIO_IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "jpg",
+    b"\x89PNG\r\n\x1a\n": "png",
+    b"GIF87a": "gif",
+    b"GIF89a": "gif",
+}
+
+PORTFOLIO_IMAGES_BASE_URL = "/api/portfolio/images/"
+PORTFOLIO_IMAGES_MAX_AGE = 365 * 24 * 60 * 60
+# stored originals and variants: ab/cd/<sha256>[_<width>].<ext>, see shardedPath
+PORTFOLIO_IMAGE_PATH_PATTERN = r"[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(_\d+)?\.(jpg|jpeg|png|gif|webp)"
+PORTFOLIO_USE_X_SENDFILE = os.environ.get("USE_X_SENDFILE", "false").lower() in ["true", "1", "yes"]
+PORTFOLIO_VARIANT_WIDTHS = [320, 640, 1280]
+PORTFOLIO_VARIANT_QUALITY = 80
+PORTFOLIO_DERIVATIVE_WORKERS = 2
+PORTFOLIO_DERIVATIVE_MAX_PENDING = 8
+
+PORTFOLIO_POSTS_CACHE_SIZE = 256
+PORTFOLIO_POSTS_CACHE_TTL = 30
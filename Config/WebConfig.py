@@ -0,0 +1,24 @@
+ROYA_BASE_URL = "https://en.royanews.tv"
+ROYA_SECTION_PATH = "/section/1"
+TORRENT_BASE_URL = "https://1337x.to"
+
+WEB_CONNECT_TIMEOUT = 3.05
+WEB_READ_TIMEOUT = 6
+WEB_DEADLINE = 10
+WEB_POOL_SIZE = 16
+WEB_FETCH_WORKERS = 8
+
+TORRENT_CATEGORIES = ["Movies", "TV"]
+TORRENT_PAGES = 1
+TORRENT_ROWS_PER_PAGE = 10
+
+WEB_CACHE_TTL = 60
+WEB_CACHE_STALE = 300
+WEB_CACHE_NEGATIVE_TTL = 30
+WEB_CACHE_REFRESH_LOCK = 30
+
+NEWS_CRAWL_INTERVAL = 300
+NEWS_INDEX_MAX_ARTICLES = 5000
+
+WEB_BREAKER_FAILURES = 5
+WEB_BREAKER_RESET = 30
@@ -1,11 +1,15 @@
 from . import EnvConfig
+from . import DBConfig
 from . import APIConfig
 from . import DoseGuardConfig
 from . import MPortfolioConfig
+from . import WebConfig
 
 __all__ = [
     "EnvConfig",
+    "DBConfig",
     "APIConfig",
     "DoseGuardConfig",
-    "MPortfolioConfig"
+    "MPortfolioConfig",
+    "WebConfig"
 ]
\ No newline at end of file
@@ -0,0 +1,161 @@
+from .ArchiveController import iterArchivedHistory
+from Utils.Helpers.DBHelpers import UPSERT_DIALECTS
+from Models import DoseHistory, AdherenceRollup
+from datetime import datetime, date
+import sqlalchemy as sa
+
+def adherenceKey(entry: DoseHistory) -> tuple[int, int, date] | None:
+    """
+    The rollup row a dose history entry counts towards, ``None`` for legacy
+    entries without a creation time (which the rollup ignores).
+    """
+    if entry.createdOn is None:
+        return None
+    return entry.patientId, entry.doseId, entry.createdOn.date()
+
+def addContribution(deltas: dict, key: tuple, taken: bool, sign: int = 1) -> None:
+    """
+    Accumulate one entry's (``sign=1``) or the removal of one entry's
+    (``sign=-1``) contribution into ``deltas``.
+
+    Parameters:
+        ``deltas`` (``dict``):
+            Maps rollup keys to ``[taken, missed]`` changes; updated in place.
+        ``key`` (``tuple``):
+            ``(patientId, doseId, day)`` from ``adherenceKey``; ``None`` is
+            ignored.
+        ``taken`` (``bool``):
+            Whether the entry records a taken or a missed dose.
+    """
+    if key is None:
+        return
+    counts = deltas.setdefault(key, [0, 0])
+    counts[0 if taken else 1] += sign
+
+def applyAdherenceDeltas(conn, deltas: dict) -> None:
+    """
+    Add accumulated changes to the rollup inside the caller's transaction.
+
+    Uses a single ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite and
+    PostgreSQL and update-then-insert elsewhere. Rows whose counts drop to
+    zero are removed so the table only holds days with history.
+
+    Parameters:
+        ``conn`` (``Connection``):
+            The connection of the transaction that changed the history.
+        ``deltas`` (``dict``):
+            Output of ``addContribution``.
+    """
+    rows = [{"patientId": p, "doseId": d, "day": day, "taken": t, "missed": m}
+            for (p, d, day), (t, m) in deltas.items() if t or m]
+    if not rows:
+        return
+
+    table = AdherenceRollup.__table__
+    if (insert := UPSERT_DIALECTS.get(conn.dialect.name)) is not None:
+        stmt = insert(table)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[c.name for c in table.primary_key.columns],
+            set_={"taken": table.c.taken + stmt.excluded.taken, "missed": table.c.missed + stmt.excluded.missed}
+        ), rows)
+    else:
+        for row in rows:
+            updated = conn.execute(
+                sa.update(table)
+                .where(table.c.patientId == row["patientId"], table.c.doseId == row["doseId"], table.c.day == row["day"])
+                .values(taken=table.c.taken + row["taken"], missed=table.c.missed + row["missed"])
+            )
+            if not updated.rowcount:
+                conn.execute(sa.insert(table).values(**row))
+
+    if emptied := [row for row in rows if row["taken"] < 0 or row["missed"] < 0]:
+        conn.execute(sa.delete(table).where(
+            table.c.patientId == sa.bindparam("p"), table.c.doseId == sa.bindparam("d"),
+            table.c.day == sa.bindparam("dy"), table.c.taken == 0, table.c.missed == 0
+        ), [{"p": row["patientId"], "d": row["doseId"], "dy": row["day"]} for row in emptied])
+
+def _historyDay(conn):
+    """
+    SQL expression for the UTC day of ``DoseHistory.createdOn``, stored the
+    way the ``Date`` column expects on each backend.
+    """
+    if conn.dialect.name == "sqlite":
+        return sa.func.date(DoseHistory.createdOn)
+    return sa.cast(DoseHistory.createdOn, sa.Date)
+
+def recomputeAdherence(conn):
+    """
+    Brute-force aggregate of the active hot dose history, shaped like the
+    rollup. Archived rows are added by ``archivedAdherence``.
+
+    Returns:
+        ``Select``:
+            Columns `patientId`, `doseId`, `day`, `taken`, `missed`.
+    """
+    day = _historyDay(conn).label("day")
+    return (sa.select(DoseHistory.patientId, DoseHistory.doseId, day,
+                      sa.func.sum(sa.case((DoseHistory.taken == sa.true(), 1), else_=0)).label("taken"),
+                      sa.func.sum(sa.case((DoseHistory.taken == sa.true(), 0), else_=1)).label("missed"))
+            .where(DoseHistory.active == sa.true(), DoseHistory.createdOn.isnot(None))
+            .group_by(DoseHistory.patientId, DoseHistory.doseId, day))
+
+def archivedAdherence() -> dict:
+    """
+    Contributions of the active archived dose history, as rollup deltas.
+    """
+    deltas = {}
+    for row in iterArchivedHistory():
+        if row["active"] and row["createdOn"] is not None:
+            addContribution(deltas, (row["patientId"], row["doseId"], row["createdOn"].date()), row["taken"])
+    return deltas
+
+def rebuildAdherence(conn) -> int:
+    """
+    Replace the whole rollup with a fresh aggregate of the dose history,
+    hot and archived. Used to backfill the table and to repair it.
+
+    Parameters:
+        ``conn`` (``Connection``):
+            Connection to run in; the caller owns the transaction.
+
+    Returns:
+        ``int``:
+            Number of rollup rows written.
+    """
+    table = AdherenceRollup.__table__
+    conn.execute(sa.delete(table))
+    conn.execute(sa.insert(table).from_select(
+        ["patientId", "doseId", "day", "taken", "missed"], recomputeAdherence(conn)))
+    applyAdherenceDeltas(conn, archivedAdherence())
+    return conn.scalar(sa.select(sa.func.count()).select_from(table))
+
+def adherenceDrift(conn) -> list[dict]:
+    """
+    Compare the rollup against ``recomputeAdherence`` plus
+    ``archivedAdherence``.
+
+    Returns:
+        ``list[dict]``:
+            One entry per mismatching key with keys `patientId`, `doseId`,
+            `day`, `rollup` and `expected` (``[taken, missed]``); empty when
+            the rollup is exact.
+    """
+    def load(stmt):
+        counts = {}
+        for p, d, day, t, m in conn.execute(stmt):
+            day = date.fromisoformat(day) if isinstance(day, str) else day
+            counts[(p, d, day.date() if isinstance(day, datetime) else day)] = [t, m]
+        return counts
+
+    table = AdherenceRollup.__table__
+    stored = load(sa.select(table.c.patientId, table.c.doseId, table.c.day, table.c.taken, table.c.missed))
+    expected = load(recomputeAdherence(conn))
+    for key, (taken, missed) in archivedAdherence().items():
+        counts = expected.setdefault(key, [0, 0])
+        counts[0] += taken
+        counts[1] += missed
+
+    return [{"patientId": p, "doseId": d, "day": day,
+             "rollup": stored.get((p, d, day)), "expected": expected.get((p, d, day))}
+            for p, d, day in sorted(stored.keys() | expected.keys())
+            if stored.get((p, d, day)) != expected.get((p, d, day))]
@@ -1,3 +1,4 @@
+from Utils.Helpers.AuthHelpers import authCache
 from datetime import datetime, timezone
 from .DBController import getSession
 from Utils.Enums import Permissions
@@ -57,4 +58,16 @@ def _listUsers() -> tuple[list[dict], int]:
                     "createdOn": user.createdOn,
                     "updatedOn": user.updatedOn,
                     "lastUse": user.lastUse
-                } for user in users], 200
\ No newline at end of file
+                } for user in users], 200
+
+def _authCacheStats() -> tuple[dict, int]:
+    """
+    Returns the API-key cache statistics used by authorize
+
+    Returns:
+        ``tuple``:
+            Containing:
+            - dict keys: `size`, `maxSize`, `ttl`, `hits`, `misses`, `hitRate`
+            - int: HTTP status code
+    """
+    return authCache.stats(), 200
\ No newline at end of file
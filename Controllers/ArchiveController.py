@@ -0,0 +1,129 @@
+from .DBController import getSession, archiveEngine
+from Models import DoseHistory, DoseHistoryChunk, ArchivedDoseHistory
+from datetime import datetime, timedelta, timezone
+from Config import DoseGuardConfig
+from functools import lru_cache
+import sqlalchemy as sa
+import json
+import zlib
+
+_CHUNK_COLUMNS = ("id", "patientId", "doseId", "taken", "active", "createdOn", "updatedOn")
+_DATETIME_COLUMNS = ("createdOn", "updatedOn")
+
+def _encodeChunk(rows) -> bytes:
+    """
+    Compress dose history rows column by column; datetimes become ISO strings.
+    """
+    columns = {name: [getattr(row, name) for row in rows] for name in _CHUNK_COLUMNS}
+    for name in _DATETIME_COLUMNS:
+        columns[name] = [value.isoformat() if value else None for value in columns[name]]
+    return zlib.compress(json.dumps(columns, separators=(",", ":")).encode(), DoseGuardConfig.HISTORY_ARCHIVE_COMPRESSION)
+
+def _decodeChunk(data: bytes) -> list[dict]:
+    """
+    Inverse of ``_encodeChunk``: rows shaped like ``DoseHistory.toDict()``
+    plus `archived`.
+    """
+    columns = json.loads(zlib.decompress(data))
+    for name in _DATETIME_COLUMNS:
+        columns[name] = [datetime.fromisoformat(value) if value else None for value in columns[name]]
+    return [dict(zip(_CHUNK_COLUMNS, values)) | {"archived": True} for values in zip(*(columns[name] for name in _CHUNK_COLUMNS))]
+
+@lru_cache(maxsize=DoseGuardConfig.HISTORY_ARCHIVE_CHUNK_CACHE)
+def _chunkRows(chunkId: int) -> dict[int, dict]:
+    """
+    Decoded rows of one chunk by id. Chunks are immutable, so recently read
+    ones stay decompressed in memory.
+    """
+    with archiveEngine.connect() as cold:
+        data = cold.scalar(sa.select(DoseHistoryChunk.data).where(DoseHistoryChunk.id == chunkId))
+    return {row["id"]: row for row in _decodeChunk(data)}
+
+def archiveDoseHistory(olderThanDays: int | None = None, batchSize: int | None = None) -> dict:
+    """
+    Move dose history rows created more than ``olderThanDays`` ago, and
+    every soft-deleted row, out of the hot table into compressed chunks in
+    the archive database.
+
+    Each batch is committed to the archive before it is deleted from the hot
+    table; rows left in both by an interrupted run are only deleted on the
+    next one. Archived rows keep counting towards the adherence rollup.
+
+    Parameters:
+        ``olderThanDays`` (``int``):
+            Age in days; defaults to ``HISTORY_ARCHIVE_AFTER_DAYS``.
+        ``batchSize`` (``int``):
+            Rows per chunk and transaction; defaults to ``HISTORY_ARCHIVE_BATCH_SIZE``.
+
+    Returns:
+        ``dict``:
+            keys: `archived` (rows moved), `chunks` (chunks written)
+    """
+    days = DoseGuardConfig.HISTORY_ARCHIVE_AFTER_DAYS if olderThanDays is None else olderThanDays
+    batchSize = batchSize or DoseGuardConfig.HISTORY_ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    table = DoseHistory.__table__
+
+    archived = chunks = 0
+    while True:
+        with getSession() as session:
+            rows = session.execute(
+                sa.select(table)
+                .where(sa.or_(table.c.createdOn < cutoff, table.c.active == sa.false()))
+                .order_by(table.c.id)
+                .limit(batchSize)
+            ).all()
+            if not rows:
+                break
+
+            ids = [row.id for row in rows]
+            with archiveEngine.begin() as cold:
+                known = set(cold.scalars(sa.select(ArchivedDoseHistory.id).where(ArchivedDoseHistory.id.in_(ids))))
+                if fresh := [row for row in rows if row.id not in known]:
+                    chunkId = cold.execute(sa.insert(DoseHistoryChunk).values(
+                        firstId=fresh[0].id, lastId=fresh[-1].id, rowCount=len(fresh),
+                        archivedOn=datetime.now(timezone.utc), data=_encodeChunk(fresh)
+                    )).inserted_primary_key[0]
+                    cold.execute(sa.insert(ArchivedDoseHistory),
+                                 [{"id": row.id, "chunkId": chunkId, "active": bool(row.active)} for row in fresh])
+                    chunks += 1
+
+            session.execute(sa.delete(table).where(table.c.id.in_(ids)))
+            # Consumed on commit by the DoseGuard dashboard cache
+            session.info.setdefault("dashboardTags", set()).update(("patient", row.patientId) for row in rows)
+            archived += len(ids)
+
+    return {"archived": archived, "chunks": chunks}
+
+def getArchivedHistory(entryId: int) -> dict | None:
+    """
+    An active archived dose history row, or ``None``.
+    """
+    with archiveEngine.connect() as cold:
+        chunkId = cold.scalar(sa.select(ArchivedDoseHistory.chunkId)
+                              .where(ArchivedDoseHistory.id == entryId, ArchivedDoseHistory.active == sa.true()))
+    return _chunkRows(chunkId)[entryId] if chunkId is not None else None
+
+def listArchivedHistory(afterId: int, limit: int) -> list[dict]:
+    """
+    Up to ``limit`` active archived rows with ids above ``afterId``, in id order.
+    """
+    with archiveEngine.connect() as cold:
+        located = cold.execute(
+            sa.select(ArchivedDoseHistory.id, ArchivedDoseHistory.chunkId)
+            .where(ArchivedDoseHistory.id > afterId, ArchivedDoseHistory.active == sa.true())
+            .order_by(ArchivedDoseHistory.id)
+            .limit(limit)
+        ).all()
+    return [_chunkRows(chunkId)[entryId] for entryId, chunkId in located]
+
+def iterArchivedHistory():
+    """
+    Yield every archived row, active or not, one chunk in memory at a time.
+    """
+    with archiveEngine.connect() as cold:
+        chunkIds = cold.scalars(sa.select(DoseHistoryChunk.id).order_by(DoseHistoryChunk.id)).all()
+    for chunkId in chunkIds:
+        with archiveEngine.connect() as cold:
+            data = cold.scalar(sa.select(DoseHistoryChunk.data).where(DoseHistoryChunk.id == chunkId))
+        yield from _decodeChunk(data)
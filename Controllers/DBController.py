@@ -1,17 +1,75 @@
-from Utils.Helpers.AuthHelpers import hashPass
+from Utils.Helpers.AuthHelpers import hashPass, invalidateAuthCache
+from sqlalchemy import create_engine, event, inspect as sa_inspect
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
 from contextlib import contextmanager
-from sqlalchemy import create_engine
 from Utils.Enums import Permissions
-from Models._base import Base
-from Config import EnvConfig
+from Config import EnvConfig, DBConfig
+from Models._base import Base, ArchiveBase
 from Models import User
 
-engine = create_engine(f"sqlite:///{EnvConfig.SQL_DB}.db", echo=False)
+def _engineOptions(dsn: str) -> dict:
+    """
+    Build the ``create_engine`` keyword arguments for a DSN.
+
+    In-memory SQLite databases use a single shared connection, so the
+    pool sizing options only apply to every other backend.
+    """
+    options = {"echo": False, "pool_pre_ping": DBConfig.DB_POOL_PRE_PING}
+
+    url = make_url(dsn)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        pool_size=DBConfig.DB_POOL_SIZE,
+        max_overflow=DBConfig.DB_MAX_OVERFLOW,
+        pool_timeout=DBConfig.DB_POOL_TIMEOUT,
+        pool_recycle=DBConfig.DB_POOL_RECYCLE,
+    )
+    return options
+
+engine = create_engine(DBConfig.SQL_DSN, **_engineOptions(DBConfig.SQL_DSN))
 Session = sessionmaker(bind=engine)
 
+# Cold store for archived rows (see ArchiveController)
+archiveEngine = create_engine(DBConfig.ARCHIVE_DSN, **_engineOptions(DBConfig.ARCHIVE_DSN))
+
+def _applySQLitePragmas(dbapiConnection, _):
+    cursor = dbapiConnection.cursor()
+    for pragma, value in DBConfig.SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+for _engine in (engine, archiveEngine):
+    if _engine.dialect.name == "sqlite":
+        event.listen(_engine, "connect", _applySQLitePragmas)
+
+@event.listens_for(Session, "after_flush")
+def _collectAuthKeys(session, _):
+    """
+    Remember the API keys of users changed or deleted in this transaction
+    (including a replaced key) so their cached logins can be dropped once
+    it commits.
+    """
+    keys = session.info.setdefault("authKeys", set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            history = sa_inspect(obj).attrs.apiKey.history
+            keys.update(key for key in (obj.__dict__.get("apiKey"), *history.deleted) if key)
+
+@event.listens_for(Session, "after_commit")
+def _invalidateAuthKeys(session):
+    for apiKey in session.info.pop("authKeys", ()):
+        invalidateAuthCache(apiKey)
+
+@event.listens_for(Session, "after_rollback")
+def _discardAuthKeys(session):
+    session.info.pop("authKeys", None)
+
 def initDB():
     Base.metadata.create_all(engine)
+    ArchiveBase.metadata.create_all(archiveEngine)
     setupAdminUser()
 
 @contextmanager
@@ -33,4 +91,4 @@ def setupAdminUser():
                             username=EnvConfig.ADMIN_USERNAME,
                             passwordHash=hashPass(EnvConfig.ADMIN_PASSWORD),
                             perms=Permissions.GENERAL|Permissions.PRIVATE|Permissions.ADMIN
-                        ))
\ No newline at end of file
+                        ))
@@ -1,10 +1,77 @@
 from Models import (User, Caregiver, Patient, Pill, Dose, Schedule, ScheduleDoses,
-                    CaregiverPatient, PatientSchedule, DoseHistory)
-from Utils.Helpers.DBHelpers import createInDB, hardDeleteLinkFromDB, updateInDB, getFromDB
-from Controllers.DBController import getSession
+                    CaregiverPatient, PatientSchedule, DoseHistory, AdherenceRollup)
+from Utils.Helpers.DBHelpers import (createInDB, bulkCreateInDB, hardDeleteLinkFromDB, updateInDB, getFromDB, listFromDB,
+                                     serializeOptions, pageSize, encodeCursor, decodeCursor)
+from Controllers.ArchiveController import getArchivedHistory, listArchivedHistory
+from Controllers.AdherenceController import adherenceKey, addContribution, applyAdherenceDeltas
+from Controllers.DBController import getSession, Session
+from Controllers.RedisController import redisClient
 from Utils.Types import ResponsePayload
-from Utils.Enums import Permissions
+from Utils.Enums import Permissions, Granularity
 from Utils.Helpers.AuthHelpers import hashPass, verifyPass
+from Utils.Helpers.TimelineHelpers import expandOccurrences, epochSeconds, isoStrings
+from Utils.Helpers.CacheHelpers import TaggedCache, SharedVersions
+from datetime import datetime, timedelta, timezone
+from Config import DoseGuardConfig
+from sqlalchemy import event
+import sqlalchemy as sa
+import numpy as np
+import time
+
+dashboardCache = TaggedCache(DoseGuardConfig.DASHBOARD_CACHE_SIZE, DoseGuardConfig.DASHBOARD_CACHE_TTL)
+# pollInterval=0: rebuilds compare the epoch before and after, which must be current
+dashboardVersions = SharedVersions(redisClient, "dashboard:tag", 2 * DoseGuardConfig.DASHBOARD_CACHE_TTL,
+                                   DoseGuardConfig.DASHBOARD_REDIS_RETRY, pollInterval=0)
+
+# (tag, attribute) pairs naming the dashboard inputs each model's rows feed
+_DASHBOARD_TAGS = {
+    User: (("user", "id"),),
+    Caregiver: (("caregiver", "id"), ("user", "userId")),
+    CaregiverPatient: (("caregiver", "caregiverId"),),
+    Patient: (("patient", "id"),),
+    PatientSchedule: (("patient", "patientId"),),
+    DoseHistory: (("patient", "patientId"),),
+    Schedule: (("schedule", "id"),),
+    ScheduleDoses: (("schedule", "scheduleId"),),
+    Dose: (("dose", "id"),),
+    Pill: (("pill", "id"),),
+}
+
+def _tagKeys(tags) -> list[str]:
+    return sorted(f"{tag}:{value}" for tag, value in tags)
+
+@event.listens_for(Session, "after_flush")
+def _collectDashboardTags(session, _):
+    """
+    Record which dashboard inputs the flushed rows touched, including the
+    previous value of any changed reference, for invalidation on commit.
+    """
+    tags = session.info.setdefault("dashboardTags", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        state = sa.inspect(obj)
+        for tag, attr in _DASHBOARD_TAGS.get(type(obj), ()):
+            tags.update((tag, value) for value in (state.dict.get(attr), *state.attrs[attr].history.deleted)
+                        if value is not None)
+
+@event.listens_for(Session, "after_commit")
+def _invalidateDashboards(session):
+    if tags := session.info.pop("dashboardTags", None):
+        dashboardCache.invalidate(tags)
+        dashboardVersions.bump(_tagKeys(tags))
+
+@event.listens_for(Session, "after_rollback")
+def _discardDashboardTags(session):
+    session.info.pop("dashboardTags", None)
+
+def _tagInsertedRows(model):
+    """
+    ``bulkCreateInDB`` hook recording the dashboard inputs of rows inserted
+    without going through the ORM flush.
+    """
+    def tagRows(session, rows: list[dict]) -> None:
+        session.info.setdefault("dashboardTags", set()).update(
+            (tag, row[attr]) for row in rows for tag, attr in _DASHBOARD_TAGS[model] if row.get(attr) is not None)
+    return tagRows
 
 ### CREATE ###
 def _createCaregiver(name: str, username: str, password: str) -> ResponsePayload:
@@ -66,13 +133,69 @@ def _attachPatientToCaregiver(caregiverId: int, patientId: int) -> ResponsePaylo
     )), 201
     
 def _createDoseHistory(patientId: int, doseId: int, taken: bool) -> ResponsePayload:
-    return createInDB(DoseHistory(
-        patientId=patientId,
-        doseId=doseId,
-        taken=taken
-    )), 201
+    with getSession() as session:
+        entry = DoseHistory(
+            patientId=patientId,
+            doseId=doseId,
+            taken=taken
+        )
+        session.add(entry)
+        session.flush()
+
+        deltas = {}
+        addContribution(deltas, adherenceKey(entry), entry.taken)
+        applyAdherenceDeltas(session.connection(), deltas)
+        return entry.toDict(), 201
+
+### BULK CREATE ###
+def _bulkCreatePatients(rows: list[dict]) -> ResponsePayload:
+    return bulkCreateInDB(Patient, rows)
+
+def _bulkCreatePills(rows: list[dict]) -> ResponsePayload:
+    return bulkCreateInDB(Pill, rows)
+
+def _bulkCreateDoses(rows: list[dict]) -> ResponsePayload:
+    return bulkCreateInDB(Dose, rows)
+
+def _bulkCreateSchedules(rows: list[dict]) -> ResponsePayload:
+    return bulkCreateInDB(Schedule, rows)
+
+def _bulkAttachDosesToSchedules(rows: list[dict]) -> ResponsePayload:
+    return bulkCreateInDB(ScheduleDoses, rows, _tagInsertedRows(ScheduleDoses))
+
+def _bulkAttachSchedulesToPatients(rows: list[dict]) -> ResponsePayload:
+    return bulkCreateInDB(PatientSchedule, rows, _tagInsertedRows(PatientSchedule))
+
+def _bulkAttachPatientsToCaregivers(rows: list[dict]) -> ResponsePayload:
+    return bulkCreateInDB(CaregiverPatient, rows, _tagInsertedRows(CaregiverPatient))
+
+def _rollupInsertedHistory(session, rows: list[dict]) -> None:
+    _tagInsertedRows(DoseHistory)(session, rows)
+    deltas = {}
+    for row in rows:
+        addContribution(deltas, (row["patientId"], row["doseId"], row["createdOn"].date()), row["taken"])
+    applyAdherenceDeltas(session.connection(), deltas)
+
+def _bulkCreateDoseHistory(rows: list[dict]) -> ResponsePayload:
+    now = datetime.now(timezone.utc)
+    return bulkCreateInDB(DoseHistory, [row | {"createdOn": now} for row in rows], _rollupInsertedHistory)
 
 ### DELETE ###
+def _deleteDoseHistory(entryId: int) -> ResponsePayload:
+    with getSession() as session:
+        entry = session.get(DoseHistory, entryId)
+
+        if not entry or not entry.active:
+            return {"error": "Dose history not found"}, 404
+
+        entry.active = False
+        session.flush()
+
+        deltas = {}
+        addContribution(deltas, adherenceKey(entry), entry.taken, -1)
+        applyAdherenceDeltas(session.connection(), deltas)
+        return {"message": "Deleted"}, 200
+
 def _deleteDoseFromSchedule(payload: dict):
     return hardDeleteLinkFromDB(
         ScheduleDoses,
@@ -130,4 +253,346 @@ def _updateSchedule(scheduleId: int, updates: dict):
     return updateInDB(Schedule, scheduleId, updates, "Schedule not found")
 
 def _updateDoseHistory(entryId: int, updates: dict):
-    return updateInDB(DoseHistory, entryId, updates, "Dose history not found")
\ No newline at end of file
+    with getSession() as session:
+        entry = session.get(DoseHistory, entryId)
+
+        if not entry or not entry.active:
+            return {"error": "Dose history not found"}, 404
+
+        deltas = {}
+        addContribution(deltas, adherenceKey(entry), entry.taken, -1)
+
+        for key, value in updates.items():
+            setattr(entry, key, value)
+        session.flush()
+
+        addContribution(deltas, adherenceKey(entry), entry.taken)
+        applyAdherenceDeltas(session.connection(), deltas)
+        return entry.toDict(), 200
+
+### DOSE HISTORY ###
+def _getDoseHistory(entryId: int, includeArchived: bool = False) -> ResponsePayload:
+    """
+    One dose history entry; with ``includeArchived`` the archive is searched
+    when it is no longer in the hot table.
+    """
+    response, code = getFromDB(DoseHistory, entryId, "Dose history not found")
+    if code == 404 and includeArchived and (archived := getArchivedHistory(entryId)):
+        return archived, 200
+    return response, code
+
+def _listDoseHistory(limit: int | None = None, after: str | None = None, includeArchived: bool = False) -> ResponsePayload:
+    """
+    One page of active dose history in id order. With ``includeArchived``
+    hot and archived rows (flagged by `archived`) are merged into the same
+    keyset pagination.
+
+    Returns:
+        ``tuple``:
+            - dict keys: `data`, `next` (cursor or ``None``)
+            - HTTP status code.
+    """
+    if not includeArchived:
+        return listFromDB(DoseHistory, limit, after)
+
+    limit = pageSize(limit)
+    try:
+        afterId = decodeCursor(after) if after else 0
+    except ValueError:
+        return {"error": "Invalid cursor"}, 400
+
+    with getSession() as session:
+        hot = session.scalars(
+            sa.select(DoseHistory)
+            .where(DoseHistory.active == sa.true(), DoseHistory.id > afterId)
+            .order_by(DoseHistory.id)
+            .limit(limit + 1)
+        ).all()
+        rows = {entry.id: entry.toDict() | {"archived": False} for entry in hot}
+
+    # A row caught mid-archival is in both stores; the hot copy wins
+    rows = {row["id"]: row for row in listArchivedHistory(afterId, limit + 1)} | rows
+    page = [rows[entryId] for entryId in sorted(rows)]
+
+    nextCursor = encodeCursor(page[limit - 1]["id"]) if len(page) > limit else None
+    return {"data": page[:limit], "next": nextCursor}, 200
+
+### TIMELINE ###
+def _timelineWindow(start: datetime | None, end: datetime | None):
+    start = start or datetime.now(timezone.utc).replace(tzinfo=None)
+    end = end or start + timedelta(hours=DoseGuardConfig.TIMELINE_DEFAULT_HOURS)
+
+    if end <= start:
+        return None, None, {"error": "'to' must be after 'from'"}
+    if end - start > timedelta(hours=DoseGuardConfig.TIMELINE_MAX_HOURS):
+        return None, None, {"error": f"Window may span at most {DoseGuardConfig.TIMELINE_MAX_HOURS} hours"}
+    return start, end, None
+
+def _buildTimeline(session, patientIds, start: datetime, end: datetime) -> dict:
+    """
+    Load every active (patient, dose) pair reachable through the patients'
+    active schedules in one query and expand them into due events.
+
+    A dose is due every ``interval`` units (``DOSE_INTERVAL_SECONDS``):
+    one interval after the patient last took it, or from the dose's creation
+    if it was never taken.
+    """
+    lastTaken = (sa.select(DoseHistory.patientId, DoseHistory.doseId,
+                           sa.func.max(DoseHistory.createdOn).label("lastTaken"))
+                 .where(DoseHistory.patientId.in_(patientIds), DoseHistory.active == sa.true(),
+                        DoseHistory.taken == sa.true())
+                 .group_by(DoseHistory.patientId, DoseHistory.doseId)
+                 .subquery())
+
+    rows = session.execute(
+        sa.select(PatientSchedule.patientId, Dose.id, Dose.pillId, Dose.amount, Dose.interval,
+                  lastTaken.c.lastTaken, Dose.createdOn)
+        .join(Schedule, Schedule.id == PatientSchedule.scheduleId)
+        .join(ScheduleDoses, ScheduleDoses.scheduleId == Schedule.id)
+        .join(Dose, Dose.id == ScheduleDoses.doseId)
+        .outerjoin(lastTaken, (lastTaken.c.patientId == PatientSchedule.patientId) & (lastTaken.c.doseId == Dose.id))
+        .where(PatientSchedule.patientId.in_(patientIds), Schedule.active == sa.true(),
+               Dose.active == sa.true(), Dose.interval > 0, Dose.createdOn.isnot(None))
+        .distinct()
+    ).all()
+
+    window = {"from": start, "to": end}
+    if not rows:
+        return window | {"events": [], "truncated": False}
+
+    patientCol, doseCol, pillCol, amountCol, intervalCol, lastTakenCol, createdCol = zip(*rows)
+    intervals = np.array(intervalCol, dtype=np.int64) * DoseGuardConfig.DOSE_INTERVAL_SECONDS
+    lastTakenAt = np.array(lastTakenCol, dtype="datetime64[s]")
+    anchors = np.where(np.isnat(lastTakenAt), epochSeconds(createdCol), lastTakenAt.astype(np.int64) + intervals)
+
+    idx, times, truncated = expandOccurrences(
+        anchors, intervals, int(epochSeconds([start])[0]), int(epochSeconds([end])[0]),
+        DoseGuardConfig.TIMELINE_MAX_EVENTS)
+
+    columns = {name: np.array(col)[idx].tolist() for name, col in
+               (("patientId", patientCol), ("doseId", doseCol), ("pillId", pillCol), ("amount", amountCol))}
+    events = [{"time": t, "patientId": p, "doseId": d, "pillId": pl, "amount": a}
+              for t, p, d, pl, a in zip(isoStrings(times).tolist(), columns["patientId"], columns["doseId"],
+                                        columns["pillId"], columns["amount"])]
+    return window | {"events": events, "truncated": truncated}
+
+def _patientTimeline(patientId: int, start: datetime | None = None, end: datetime | None = None) -> ResponsePayload:
+    """
+    Upcoming due doses of one patient, merged across their schedules.
+
+    Parameters:
+        ``patientId`` (``int``):
+            The patient.
+        ``start``, ``end`` (``datetime``):
+            Window (naive UTC); defaults to now and ``TIMELINE_DEFAULT_HOURS`` later.
+    Returns:
+        ``tuple``:
+            Containing:
+            - dict keys: `from`, `to`, `events` (time ordered, keys: `time`, `patientId`, `doseId`, `pillId`, `amount`), `truncated`
+            - int: HTTP status code
+    """
+    start, end, err = _timelineWindow(start, end)
+    if err:
+        return err, 400
+
+    with getSession() as session:
+        patient = session.get(Patient, patientId)
+        if not patient or not patient.active:
+            return {"error": "Patient not found"}, 404
+        return _buildTimeline(session, [patientId], start, end), 200
+
+def _caregiverTimeline(caregiverId: int, start: datetime | None = None, end: datetime | None = None) -> ResponsePayload:
+    """
+    Upcoming due doses of every active patient of a caregiver, merged into
+    one time-ordered list.
+
+    Returns:
+        ``tuple``:
+            Containing:
+            - dict keys: `from`, `to`, `events`, `truncated` (see ``_patientTimeline``)
+            - int: HTTP status code
+    """
+    start, end, err = _timelineWindow(start, end)
+    if err:
+        return err, 400
+
+    with getSession() as session:
+        caregiver = session.get(Caregiver, caregiverId)
+        if not caregiver or not caregiver.active:
+            return {"error": "Caregiver not found"}, 404
+
+        patientIds = (sa.select(CaregiverPatient.patientId)
+                      .join(Patient, Patient.id == CaregiverPatient.patientId)
+                      .where(CaregiverPatient.caregiverId == caregiverId, Patient.active == sa.true()))
+        return _buildTimeline(session, patientIds, start, end), 200
+
+### ADHERENCE ###
+def _periodStart(day, granularity: Granularity):
+    if granularity is Granularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity is Granularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+def _adherenceCounts(taken: int, missed: int) -> dict:
+    total = taken + missed
+    return {"taken": taken, "missed": missed, "rate": round(taken / total, 4) if total else None}
+
+def _patientAdherence(patientId: int, granularity: Granularity = Granularity.DAY, doseId: int = None,
+                      start: datetime | None = None, end: datetime | None = None) -> ResponsePayload:
+    """
+    Taken and missed dose counts of a patient per day, week (starting
+    Monday) or calendar month, read from the adherence rollup.
+
+    Parameters:
+        ``patientId`` (``int``):
+            The patient.
+        ``granularity`` (``Granularity``):
+            Period length.
+        ``doseId`` (``int``):
+            Restrict to one dose.
+        ``start``, ``end`` (``datetime``):
+            Inclusive range of UTC days to report.
+    Returns:
+        ``tuple``:
+            Containing:
+            - dict keys: `granularity`, `periods` (keys: `period`, `taken`, `missed`, `rate`), `taken`, `missed`, `rate`
+            - int: HTTP status code
+    """
+    with getSession() as session:
+        patient = session.get(Patient, patientId)
+        if not patient or not patient.active:
+            return {"error": "Patient not found"}, 404
+
+        query = (sa.select(AdherenceRollup.day, sa.func.sum(AdherenceRollup.taken), sa.func.sum(AdherenceRollup.missed))
+                 .where(AdherenceRollup.patientId == patientId)
+                 .group_by(AdherenceRollup.day)
+                 .order_by(AdherenceRollup.day))
+        if doseId is not None:
+            query = query.where(AdherenceRollup.doseId == doseId)
+        if start is not None:
+            query = query.where(AdherenceRollup.day >= start.date())
+        if end is not None:
+            query = query.where(AdherenceRollup.day <= end.date())
+
+        periods = {}
+        for day, taken, missed in session.execute(query):
+            counts = periods.setdefault(_periodStart(day, granularity), [0, 0])
+            counts[0] += taken
+            counts[1] += missed
+
+    taken = sum(t for t, _ in periods.values())
+    missed = sum(m for _, m in periods.values())
+    return {
+        "granularity": granularity.value,
+        "periods": [{"period": period.isoformat()} | _adherenceCounts(t, m) for period, (t, m) in periods.items()],
+    } | _adherenceCounts(taken, missed), 200
+
+### DASHBOARD ###
+def _buildDashboard(session, caregiver: Caregiver) -> tuple[dict, set]:
+    """
+    Assemble a caregiver's dashboard in at most five queries: the caregiver,
+    their patients, the patients' schedules, the schedules' doses joined
+    with their pills, and each patient's latest history entry.
+
+    Returns:
+        ``tuple``:
+            - dict: The dashboard.
+            - set: Tags of every row it was built from.
+    """
+    tags = {("caregiver", caregiver.id), ("user", caregiver.userId)}
+    patients = session.scalars(
+        sa.select(Patient)
+        .join(CaregiverPatient, CaregiverPatient.patientId == Patient.id)
+        .where(CaregiverPatient.caregiverId == caregiver.id, Patient.active == sa.true())
+        .order_by(Patient.id)
+    ).all()
+    patientIds = [patient.id for patient in patients]
+    tags.update(("patient", patientId) for patientId in patientIds)
+
+    schedulesOf, dosesOf, latestOf = {}, {}, {}
+    if patientIds:
+        schedules = {}
+        for patientId, schedule in session.execute(
+            sa.select(PatientSchedule.patientId, Schedule)
+            .join(Schedule, Schedule.id == PatientSchedule.scheduleId)
+            .where(PatientSchedule.patientId.in_(patientIds), Schedule.active == sa.true())
+            .order_by(Schedule.id)
+        ):
+            schedules.setdefault(schedule.id, schedule)
+            schedulesOf.setdefault(patientId, []).append(schedule.id)
+        tags.update(("schedule", scheduleId) for scheduleId in schedules)
+
+        if schedules:
+            for scheduleId, dose, pill in session.execute(
+                sa.select(ScheduleDoses.scheduleId, Dose, Pill)
+                .join(Dose, Dose.id == ScheduleDoses.doseId)
+                .join(Pill, Pill.id == Dose.pillId)
+                .where(ScheduleDoses.scheduleId.in_(list(schedules)), Dose.active == sa.true())
+                .order_by(Dose.id)
+            ):
+                dosesOf.setdefault(scheduleId, []).append(dose.toDict() | {"pill": pill.toDict()})
+                tags.update((("dose", dose.id), ("pill", pill.id)))
+
+        latestIds = (sa.select(sa.func.max(DoseHistory.id))
+                     .where(DoseHistory.patientId.in_(patientIds), DoseHistory.active == sa.true())
+                     .group_by(DoseHistory.patientId))
+        latestOf = {entry.patientId: entry.toDict()
+                    for entry in session.scalars(sa.select(DoseHistory).where(DoseHistory.id.in_(latestIds)))}
+
+        scheduleDicts = {scheduleId: schedule.toDict() | {"doses": dosesOf.get(scheduleId, [])}
+                         for scheduleId, schedule in schedules.items()}
+        schedulesOf = {patientId: [scheduleDicts[scheduleId] for scheduleId in ids]
+                       for patientId, ids in schedulesOf.items()}
+
+    return {
+        "caregiver": caregiver.toDict(),
+        "patients": [patient.toDict() | {"schedules": schedulesOf.get(patient.id, []),
+                                         "latestHistory": latestOf.get(patient.id)}
+                     for patient in patients],
+    }, tags
+
+def _caregiverDashboard(caregiverId: int) -> ResponsePayload:
+    """
+    A caregiver's patients with their schedules, the schedules' doses and
+    pills, and each patient's latest dose history entry.
+
+    Served from ``dashboardCache``. A committed write drops the entries
+    built from the rows it touched in its own worker, and bumps the shared
+    version of those rows so every other worker rebuilds them on their
+    next read. Without Redis, entries are trusted for
+    ``DASHBOARD_CACHE_FALLBACK_TTL`` seconds only.
+
+    The rows a dashboard depends on are only known once it is built, so
+    its versions are read afterwards; the shared epoch is read before the
+    build and again after, and a rebuild that overlapped any published
+    write is returned without being cached.
+
+    Returns:
+        ``tuple``:
+            Containing:
+            - dict keys: `caregiver`, `patients` (patient keys plus `schedules`, each with `doses` and their `pill`, and `latestHistory`)
+            - int: HTTP status code
+    """
+    if (cached := dashboardCache.get(caregiverId)) is not None:
+        tagKeys, versions, cachedAt, dashboard = cached
+        if (current := dashboardVersions.read(tagKeys)) is None:
+            if time.monotonic() - cachedAt < DoseGuardConfig.DASHBOARD_CACHE_FALLBACK_TTL:
+                return dashboard, 200
+        elif current == versions:
+            return dashboard, 200
+        dashboardCache.pop(caregiverId)
+
+    generation = dashboardCache.generation
+    epoch = dashboardVersions.epoch()
+    with getSession() as session:
+        caregiver = session.get(Caregiver, caregiverId, options=serializeOptions(Caregiver))
+        if not caregiver or not caregiver.active:
+            return {"error": "Caregiver not found"}, 404
+        dashboard, tags = _buildDashboard(session, caregiver)
+
+    tagKeys = _tagKeys(tags)
+    versions = dashboardVersions.read(tagKeys)
+    if dashboardVersions.epoch() == epoch:
+        dashboardCache.set(caregiverId, (tagKeys, versions, time.monotonic(), dashboard), tags, since=generation)
+    return dashboard, 200
@@ -0,0 +1,86 @@
+from sqlalchemy.exc import IntegrityError
+from .AdherenceController import rebuildAdherence
+from .DBController import engine, getSession
+from sqlalchemy.schema import CreateIndex
+from Config import DoseGuardConfig
+from Models import SchemaVersion, AdherenceRollup
+from Models._base import Base
+import sqlalchemy as sa
+
+def _createIndexes(*names: str):
+    """
+    Migration step creating the named indexes declared on the models.
+    Safe to re-run: existing indexes are skipped.
+    """
+    def migrate(conn) -> None:
+        declared = {idx.name: idx for table in Base.metadata.tables.values() for idx in table.indexes}
+        for name in names:
+            conn.execute(CreateIndex(declared[name], if_not_exists=True))
+    return migrate
+
+def _backfillAdherence(conn) -> None:
+    """
+    Migration step creating the adherence rollup and filling it from the
+    existing dose history.
+    """
+    AdherenceRollup.__table__.create(conn, checkfirst=True)
+    rebuildAdherence(conn)
+
+MIGRATIONS = [
+    (1, "DoseGuard lookup and partial active indexes", _createIndexes(
+        f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_TABLE}_patientId",
+        f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_TABLE}_doseId",
+        f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_TABLE}_createdOn",
+        f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_TABLE}_active",
+        f"ix_{DoseGuardConfig.SQL_DOSES_TABLE}_pillId",
+        f"ix_{DoseGuardConfig.SQL_DOSES_TABLE}_active",
+        f"ix_{DoseGuardConfig.SQL_CAREGIVER_TABLE}_active",
+        f"ix_{DoseGuardConfig.SQL_PATIENT_TABLE}_active",
+        f"ix_{DoseGuardConfig.SQL_PILLS_TABLE}_active",
+        f"ix_{DoseGuardConfig.SQL_SCHEDULE_TABLE}_active",
+        f"ix_{DoseGuardConfig.SQL_PATIENT_SCHEDULE_TABLE}_scheduleId",
+        f"ix_{DoseGuardConfig.SQL_CAREGIVER_PATIENT_TABLE}_patientId",
+        f"ix_{DoseGuardConfig.SQL_SCHEDULE_DOSES_TABLE}_doseId",
+    )),
+    (2, "DoseGuard daily adherence rollup", _backfillAdherence),
+]
+
+def schemaVersion() -> int:
+    """
+    Returns:
+        ``int``:
+            The highest applied migration version, ``0`` if none.
+    """
+    with getSession() as session:
+        return session.query(sa.func.max(SchemaVersion.version)).scalar() or 0
+
+def migrateDB() -> list[int]:
+    """
+    Apply every pending migration in order, each in its own transaction,
+    and record it in the schema version table.
+
+    Several workers may start at once: a migration another worker already
+    recorded is skipped, and the steps themselves are idempotent.
+
+    Returns:
+        ``list[int]``:
+            Versions applied by this call.
+    """
+    SchemaVersion.__table__.create(engine, checkfirst=True)
+    versions = SchemaVersion.__table__.c.version
+
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        try:
+            with engine.begin() as conn:
+                if conn.execute(sa.select(versions).where(versions == version)).first():
+                    continue
+
+                migrate(conn)
+                conn.execute(sa.insert(SchemaVersion.__table__).values(version=version, description=description))
+        except IntegrityError:
+            continue
+
+        applied.append(version)
+
+    return applied
@@ -0,0 +1,180 @@
+from Utils.Helpers.WebHelpers import fetchPage, fetchPages, upstreamErrorCode, classStrainer, parseHTML, upstreamFlight
+from collections import OrderedDict
+from Config import WebConfig
+import threading
+import time
+import re
+import os
+
+_TOKEN = re.compile(r"\w+")
+
+SECTION_STRAINER = classStrainer("div", "news_card_small_title")
+ARTICLE_STRAINER = classStrainer("div", "pup_date_news", "news_image", "Newsbody")
+
+def tokenize(text: str) -> set[str]:
+    """
+    Split text into lowercase word tokens.
+    """
+    return set(_TOKEN.findall(text.lower()))
+
+def parseArticle(articleId: str, page: str, title: str, html: str) -> dict:
+    """
+    Extract the date, images and body of a Roya News article page.
+
+    Returns:
+        ``dict``:
+            keys: `id`, `page`, `title`, `date`, `images`, `body`
+    """
+    newsSp = parseHTML(html, ARTICLE_STRAINER)
+
+    newsDate = ""
+    if dataDiv := newsSp.find("div", class_="pup_date_news"):
+        for part in dataDiv.contents: # type: ignore
+            if isinstance(part, str) and part.strip():
+                newsDate = part.strip()
+
+    newsImages = []
+    if dataDiv := newsSp.find("div", class_="news_image"):
+        for img in dataDiv.find_all("img"): # type: ignore
+            newsImages.append(img.get("src")) # type: ignore
+
+    newsBody = ""
+    if dataDiv := newsSp.find("div", class_="Newsbody"):
+        newsBody = " ".join(p.get_text(strip=True) for p in dataDiv.find_all('p')) # type: ignore
+
+    return {"id": articleId, "page": page, "title": title,
+            "date": newsDate, "images": newsImages, "body": newsBody}
+
+class NewsIndex:
+    """
+    Bounded in-memory store of parsed articles with an inverted index from
+    title and body tokens to article ids. The oldest articles are evicted
+    once ``maxArticles`` is exceeded.
+    """
+    def __init__(self, maxArticles: int) -> None:
+        self.maxArticles = maxArticles
+        self._articles: OrderedDict[str, dict] = OrderedDict()
+        self._postings: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, articleId: str) -> bool:
+        return articleId in self._articles
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def add(self, article: dict) -> None:
+        tokens = tokenize(article["title"]) | tokenize(article["body"])
+        with self._lock:
+            if article["id"] in self._articles:
+                return
+            self._articles[article["id"]] = article | {"tokens": tokens}
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(article["id"])
+
+            while len(self._articles) > self.maxArticles:
+                oldId, old = self._articles.popitem(last=False)
+                for token in old["tokens"]:
+                    if (ids := self._postings.get(token)) is not None:
+                        ids.discard(oldId)
+                        if not ids:
+                            del self._postings[token]
+
+    def search(self, query: str) -> list[dict]:
+        """
+        Return every article containing all words of ``query``, newest first.
+        """
+        if not (tokens := tokenize(query)):
+            return []
+
+        with self._lock:
+            postings = sorted((self._postings.get(token, set()) for token in tokens), key=len)
+            ids = set.intersection(*postings)
+            matches = [self._articles[i] for i in ids]
+
+        matches.sort(key=lambda a: int(a["id"]) if a["id"].isdigit() else 0, reverse=True)
+        return [{k: v for k, v in a.items() if k != "tokens"} for a in matches]
+
+class RoyaNewsCrawler:
+    """
+    Periodically scans the Roya News section page and fetches every article
+    it has not seen before exactly once, feeding them into a ``NewsIndex``.
+
+    The crawl thread starts lazily on first use in each worker process.
+    """
+    def __init__(self, interval: float, maxArticles: int) -> None:
+        self.interval = interval
+        self.index = NewsIndex(maxArticles)
+        self.lastRefresh = 0.0
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        """
+        Scan the section page once and index new articles.
+
+        Returns:
+            ``int``:
+                ``200`` on success, otherwise the upstream or transport
+                error status.
+        """
+        try:
+            res = fetchPage(WebConfig.ROYA_BASE_URL + WebConfig.ROYA_SECTION_PATH)
+        except Exception as e:
+            return upstreamErrorCode(e)
+        if not (200 <= res.status_code < 300):
+            return res.status_code
+
+        sp = parseHTML(res.text, SECTION_STRAINER)
+
+        pending = {}
+        for div in sp.find_all("div", class_="news_card_small_title"):
+            if not (aTag := div.find("a")): # type: ignore
+                continue
+            page = WebConfig.ROYA_BASE_URL + aTag.get("href", "") # type: ignore
+            articleId = page.rstrip("/").split("/")[-1]
+            if articleId not in self.index and articleId not in pending:
+                pending[articleId] = (page, aTag.get_text(strip=True)) # type: ignore
+
+        ids = list(pending)
+        for articleId, newsRes in zip(ids, fetchPages([pending[i][0] for i in ids])):
+            if isinstance(newsRes, Exception) or not (200 <= newsRes.status_code < 300):
+                continue
+            page, title = pending[articleId]
+            self.index.add(parseArticle(articleId, page, title, newsRes.text))
+
+        self.lastRefresh = time.time()
+        return 200
+
+    def ensureStarted(self) -> int:
+        """
+        Start the crawl thread for this process, running the first refresh
+        synchronously so the index is populated before it is queried.
+        Concurrent callers share that one refresh and its outcome.
+
+        Returns:
+            ``int``:
+                ``200`` if the index is usable, otherwise the status of the
+                failed initial refresh.
+        """
+        if self._pid == os.getpid():
+            return 200
+
+        if (code := upstreamFlight.do("roya:refresh", self.refresh)) != 200:
+            return code
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, name="news-crawler", daemon=True).start()
+        return 200
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                upstreamFlight.do("roya:refresh", self.refresh)
+            except Exception:
+                pass
+
+newsCrawler = RoyaNewsCrawler(WebConfig.NEWS_CRAWL_INTERVAL, WebConfig.NEWS_INDEX_MAX_ARTICLES)
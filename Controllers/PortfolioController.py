@@ -1,50 +1,196 @@
+from Utils.Helpers.UploadHelpers import sniffImageType, shardedPath, streamToTempFile, UploadTooLarge
+from Utils.Helpers.DBHelpers import encodeCursor, decodeCursor, pageSize, UPSERT_DIALECTS
+from Utils.Helpers.ImageHelpers import submitVariants
+from Utils.Helpers.CacheHelpers import TTLCache
+from Utils.Types import Optional, Container
 from werkzeug.datastructures import FileStorage
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from .DBController import getSession
 from Config import MPortfolioConfig
-from Models import Post
-import uuid
+from sqlalchemy.exc import IntegrityError
+from Models import Post, ImageVariant
+import sqlalchemy as sa
+import hashlib
+import re
 import os
 
-def _uploadImage(img:FileStorage) -> tuple[bool, int]:
+_IMAGE_HASH = re.compile(r"([0-9a-f]{64})")
+
+postsCache = TTLCache(MPortfolioConfig.PORTFOLIO_POSTS_CACHE_SIZE, MPortfolioConfig.PORTFOLIO_POSTS_CACHE_TTL)
+
+def _recordVariants(digest: str, job: Future) -> None:
+    """
+    Done-callback of a derivative job: store the variants it produced that
+    are not recorded yet. Failed jobs are dropped; re-uploading the image
+    queues it again.
+
+    Jobs for the same image can finish concurrently (re-uploads, other
+    workers), so rows are inserted with ``ON CONFLICT DO NOTHING`` where the
+    backend supports it; elsewhere a lost race only means the other job
+    already recorded them.
+    """
+    if job.cancelled() or job.exception() is not None or not (variants := job.result()):
+        return
+
+    rows = [{"sha256": digest, **variant} for variant in variants]
+    table = ImageVariant.__table__
+    try:
+        with getSession() as session:
+            if (insert := UPSERT_DIALECTS.get(session.get_bind().dialect.name)) is not None:
+                session.execute(insert(table).on_conflict_do_nothing(
+                    index_elements=["sha256", "width", "format"]), rows)
+            else:
+                known = {(v.width, v.format) for v in session.query(ImageVariant).filter_by(sha256=digest)}
+                if fresh := [row for row in rows if (row["width"], row["format"]) not in known]:
+                    session.execute(sa.insert(table), fresh)
+    except IntegrityError:
+        pass
+    finally:
+        postsCache.clear()
+
+def _queueVariants(fn: str, digest: str, ext: str) -> None:
+    job = submitVariants(fn, MPortfolioConfig.PORTFOLIO_UPLOADS_FOLDER, digest, ext,
+                         MPortfolioConfig.PORTFOLIO_VARIANT_WIDTHS, MPortfolioConfig.PORTFOLIO_VARIANT_QUALITY,
+                         MPortfolioConfig.PORTFOLIO_DERIVATIVE_WORKERS, MPortfolioConfig.PORTFOLIO_DERIVATIVE_MAX_PENDING)
+    if job is not None:
+        job.add_done_callback(lambda done: _recordVariants(digest, done))
+
+def _uploadImage(img:FileStorage) -> tuple[dict, int]:
     """
     Uploads an Image to the servers UPLOADS_FOLDER
 
+    The upload is streamed to disk in chunks while being hashed, and stored
+    content-addressed under a sharded path (``ab/cd/<sha256>.<ext>``).
+    Uploading bytes that are already stored returns the existing file.
+    Resized variants are then generated in a background process pool.
+
     Parameters:
         ``img`` (``filestorage``):
-            image
+            image (JPEG, PNG, GIF or WebP)
     Returns:
         ``tuple``:
             Containing:
-            - dict keys: `filename`
-            - int: HTTP status code
+            - dict keys: `filename` (path relative to the uploads folder),
+              `url` (public image URL), `sha256` (or `error`)
+            - int: HTTP status code (``201`` stored, ``200`` already stored,
+              ``413`` too large, ``415`` not a supported image)
     """
-    fn = os.path.join(MPortfolioConfig.PORTFOLIO_UPLOADS_FOLDER, f"{uuid.uuid4()}.jpg")
-    img.save(fn)
-    return {"filename":fn}, 201
+    root = MPortfolioConfig.PORTFOLIO_UPLOADS_FOLDER
+    head = img.stream.read(MPortfolioConfig.PORTFOLIO_UPLOAD_CHUNK_SIZE)
+
+    if not (ext := sniffImageType(head)):
+        return {"error": "Unsupported image type"}, 415
+
+    os.makedirs(root, exist_ok=True)
+    try:
+        tmpPath, digest = streamToTempFile(img.stream, head, root,
+                                           MPortfolioConfig.PORTFOLIO_MAX_UPLOAD_SIZE,
+                                           MPortfolioConfig.PORTFOLIO_UPLOAD_CHUNK_SIZE)
+    except UploadTooLarge:
+        return {"error": f"Image exceeds {MPortfolioConfig.PORTFOLIO_MAX_UPLOAD_SIZE} bytes"}, 413
+
+    fn = shardedPath(root, digest, ext)
+    if os.path.exists(fn):
+        os.unlink(tmpPath)
+        code = 200
+    else:
+        os.makedirs(os.path.dirname(fn), exist_ok=True)
+        os.replace(tmpPath, fn)
+        code = 201
+
+    _queueVariants(fn, digest, ext)
+    filename = os.path.relpath(fn, root).replace(os.sep, "/")
+    return {"filename": filename, "url": MPortfolioConfig.PORTFOLIO_IMAGES_BASE_URL + filename, "sha256": digest}, code
 
-def _listPosts() -> tuple[dict, int]:
+def _postsVersion(session, filters: list) -> tuple:
     """
-    Lists all posts
+    Cheap fingerprint of everything a post listing depends on: the number of
+    matching posts, their latest change and the newest image variant.
+    """
+    lastVariant = sa.select(sa.func.max(ImageVariant.id)).scalar_subquery()
+    return tuple(session.query(sa.func.count(Post.id), sa.func.max(Post.id),
+                               sa.func.max(sa.func.coalesce(Post.updatedOn, Post.createdOn)), lastVariant)
+                 .filter(*filters).one())
+
+def _listPosts(category: Optional[str] = None, state: bool = True, limit: Optional[int] = None,
+               after: Optional[str] = None, knownETags: Container[str] = ()) -> tuple[Optional[dict], int, Optional[str]]:
+    """
+    Lists posts, one page at a time
+
+    Pages are cached in-process (invalidated when posts or image variants
+    are added) together with an ETag derived from the matching posts' count
+    and latest change. If the client already holds the current ETag the page
+    itself is neither queried nor serialized.
 
+    Parameters:
+        ``category`` (``str``):
+            Only list posts in this category.
+        ``state`` (``bool``):
+            List published (``True``, default) or unpublished posts.
+        ``limit`` (``int``):
+            Page size.
+        ``after`` (``str``):
+            Cursor returned as ``next`` by the previous page.
+        ``knownETags`` (``Container[str]``):
+            ETags the client sent in ``If-None-Match``.
     Returns:
         ``tuple``:
             Containing:
-            - list[dict] keys: `id`, `imageURL`, `title`, `description`, `category`, `state` `createdOn`, `updatedOn`
-            - int: HTTP status code
+            - dict keys: `data`, `next`; `data` is a list[dict] with keys: `id`, `imageURL`, `images`, `title`,
+              `description`, `category`, `state` `createdOn`, `updatedOn`
+              (`images` lists the generated resized variants: `width`, `format`, `url`)
+            - int: HTTP status code (``304`` if the client's ETag is current)
+            - str: the page's ETag
     """
+    key = (category, state, pageSize(limit), after)
+    if cached := postsCache.get(key):
+        etag, page = cached
+        return (None, 304, etag) if etag in knownETags else (page, 200, etag)
+
+    filters = [Post.state == state]
+    if category is not None:
+        filters.append(Post.category == category)
+
     with getSession() as session:
-        posts = session.query(Post).all()
-        return [{
+        version = _postsVersion(session, filters)
+        etag = hashlib.sha1(repr((version, key)).encode()).hexdigest()
+        if etag in knownETags:
+            return None, 304, etag
+
+        query = session.query(Post).filter(*filters)
+        if after:
+            try:
+                query = query.filter(Post.id > decodeCursor(after))
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400, None
+
+        posts = query.order_by(Post.id).limit(key[2] + 1).all()
+        nextCursor = encodeCursor(posts[key[2] - 1].id) if len(posts) > key[2] else None
+        posts = posts[:key[2]]
+
+        hashes = {post.id: m.group(1) for post in posts if (m := _IMAGE_HASH.search(post.imageURL))}
+        variants = {}
+        if hashes:
+            for variant in (session.query(ImageVariant)
+                            .filter(ImageVariant.sha256.in_(set(hashes.values())))
+                            .order_by(ImageVariant.width, ImageVariant.format)):
+                variants.setdefault(variant.sha256, []).append(variant.toDict())
+
+        page = {"data": [{
                     "id": post.id,
                     "imageURL": post.imageURL,
+                    "images": variants.get(hashes.get(post.id), []),
                     "title": post.title,
                     "description": post.description,
                     "category": post.category,
                     "state": post.state,
                     "createdOn": post.createdOn,
                     "updatedOn": post.updatedOn
-                } for post in posts], 200
+                } for post in posts], "next": nextCursor}
+
+    postsCache.set(key, (etag, page))
+    return page, 200, etag
     
 def _createPost(iURL: str, ttl: str,  desc: str,  cat: str) -> tuple[dict, int]:
     """
@@ -69,6 +215,7 @@ def _createPost(iURL: str, ttl: str,  desc: str,  cat: str) -> tuple[dict, int]:
         newPost = Post(imageURL=iURL, title=ttl, description=desc, category=cat)
         session.add(newPost)
         session.flush()
+        postsCache.clear()
         return {"id": newPost.id, "imageURL": newPost.imageURL, 
                 "title": newPost.title, "description": newPost.description,
                 "category": newPost.category, "state": newPost.state}, 201
\ No newline at end of file
@@ -0,0 +1,12 @@
+from redis import Redis, BlockingConnectionPool
+from Config import EnvConfig, APIConfig
+
+redisPool = BlockingConnectionPool.from_url(
+    EnvConfig.REDIS_URL,
+    max_connections=APIConfig.REDIS_MAX_CONNECTIONS,
+    timeout=APIConfig.REDIS_SOCKET_TIMEOUT,
+    socket_timeout=APIConfig.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=APIConfig.REDIS_SOCKET_TIMEOUT,
+    health_check_interval=30,
+)
+redisClient = Redis(connection_pool=redisPool)
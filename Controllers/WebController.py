@@ -1,70 +1,52 @@
+from Utils.Helpers.WebHelpers import fetchPages, upstreamErrorCode, classStrainer, parseHTML
+from .NewsCrawler import newsCrawler
+from Utils.Decorators import ResponseCached, Coalesced
 from Utils.Enums import SortOrder
 from Utils.Types import Optional
-from bs4 import BeautifulSoup
-import requests
+from Config import WebConfig
 
+TORRENT_TABLE_STRAINER = classStrainer("table", "table-list")
 
-def _getRoyaNews(searchWord: str) -> tuple[dict[str, str|list], int]:
+def _normalizeQuery(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def _torrentKey(torrentName: str, time: Optional[SortOrder] = None) -> str:
+    return f"{_normalizeQuery(torrentName)}|{time.value if time else ''}"
+
+def _getRoyaNews(searchWord: str) -> tuple[list[dict[str, str|list]], int]:
     """
-    Webscrapes "https://en.royanews.tv" for the latest news.
+    Searches the latest "https://en.royanews.tv" news.
+
+    Articles are crawled in the background and indexed by keyword, so the
+    search itself never waits on the website (except for the very first
+    call in a worker, which performs the initial crawl).
     
     Parameters:
-        ``searchWord`` (``str``): Keyword to use for search
+        ``searchWord`` (``str``): Keyword(s) to search for; every word must appear
     Returns:
         ``tuple``:
             Containing:
-            - dict keys: `id`, `title`, `page`, `date`, `images`, `body`
+            - list of dicts with keys: `id`, `title`, `page`, `date`, `images`, `body`, newest first
             - int: HTTP status code
     """
+    if (code := newsCrawler.ensureStarted()) != 200:
+        return [], code
 
-    BASE_URL = "https://en.royanews.tv"
-
-    PAGE_EXT = "/section/1"
-
-    res = requests.get(BASE_URL+PAGE_EXT)
-    if not (200 <= res.status_code < 300):
-        return {}, res.status_code
-    sp = BeautifulSoup(res.text, "html.parser")
-
-    flag = False
-    for div in sp.find_all("div", class_="news_card_small_title"):
-        if not (aTag := div.find("a")): # type: ignore
-            continue
-        aText = aTag.get_text(strip=True) # type: ignore
-        if searchWord.lower() in aText.lower():
-            flag = True
-
-            wp = BASE_URL + aTag.get("href", "") # type: ignore
-
-            newsRes = requests.get(wp)
-            newsSp = BeautifulSoup(newsRes.text, "html.parser")
-
-            newsDate = ""
-            if dataDiv := newsSp.find("div", class_="pup_date_news"):
-                for part in dataDiv.contents: # type: ignore
-                    if isinstance(part, str) and part.strip():
-                        newsDate = part.strip()
-
-            newsImages = []
-            if dataDiv := newsSp.find("div", class_="news_image"):
-                for img in dataDiv.find_all("img"): # type: ignore
-                    newsImages.append(img.get("src")) # type: ignore
-
-            newsBody = ""
-            if dataDiv := newsSp.find("div", class_="Newsbody"):
-                newsBody = " ".join(p.get_text(strip=True) for p in dataDiv.find_all('p')) # type: ignore
-            
-            break
-    
-    if flag:
-        return {"id":wp.split("/")[-1], "page":wp,
-                "title":aText, "date":newsDate, "images":newsImages,
-                "body":newsBody}, 200
-    return {}, 204
+    if found := newsCrawler.index.search(searchWord):
+        return found, 200
+    return [], 204
         
+@ResponseCached("1337x", _torrentKey, WebConfig.WEB_CACHE_TTL, WebConfig.WEB_CACHE_STALE,
+                WebConfig.WEB_CACHE_NEGATIVE_TTL, WebConfig.WEB_CACHE_REFRESH_LOCK)
+@Coalesced("1337x", _torrentKey)
 def _find1337xTorrents(torrentName: str, time: Optional[SortOrder] = None) -> tuple[list[dict[str, str]], int]:
     """
-    Webscrapes "https://1337x.to" for a torrent
+    Webscrapes "https://1337x.to" for a torrent.
+
+    All category (and result) pages are fetched concurrently over the shared
+    keep-alive session, so latency tracks the slowest page rather than the sum.
+    Identical searches already in flight in this worker share one scrape, and
+    while the site keeps failing the circuit breaker answers ``503`` at once.
     
     Parameters:
         ``torrentName`` (``str``): Keyword to use for search
@@ -72,38 +54,46 @@ def _find1337xTorrents(torrentName: str, time: Optional[SortOrder] = None) -> tu
     Returns:
         ``tuple``:
             Containing:
-            - set of dicts with keys: `name`, `url`, `seeders`, `leechers`, `time`, `size`
+            - list of dicts with keys: `name`, `url`, `seeders`, `leechers`, `time`, `size`
             - int: HTTP status code
     """
 
-    BASE_URL = "https://1337x.to"
+    BASE_URL = WebConfig.TORRENT_BASE_URL
 
-    TIME_SORT = {"asc": "time/asc/", "desc": "time/desc/"}
+    TIME_SORT = {SortOrder.ASC: "time/asc/", SortOrder.DESC: "time/desc/"}
+
+    query = torrentName.replace(" ", "+")
+    prefix = "sort-" if time else ""
+    sort = TIME_SORT.get(time, "") # type: ignore
+
+    PAGE_EXTS = [f"/{prefix}category-search/{query}/{category}/{sort}{page}/"
+                 for category in WebConfig.TORRENT_CATEGORIES
+                 for page in range(1, WebConfig.TORRENT_PAGES + 1)]
 
-    PAGE_EXTS = [f"/{'sort-' if time else ''}category-search/"+torrentName.replace(" ", "+")+f"/Movies/{TIME_SORT.get(time,'')}1/", # type: ignore
-                 f"/{'sort-' if time else ''}category-search/"+torrentName.replace(" ", "+")+f"/TV/{TIME_SORT.get(time,'')}1/"] # type: ignore
-    
     found = []
+    seen = set()
 
-    for EXT in PAGE_EXTS:
-        print(BASE_URL+EXT)
-        res = requests.get(BASE_URL+EXT)
+    for res in fetchPages([BASE_URL+EXT for EXT in PAGE_EXTS]):
+        if isinstance(res, Exception):
+            return [], upstreamErrorCode(res)
         if not (200 <= res.status_code < 300):
             return [], res.status_code
         
-        sp = BeautifulSoup(res.text, "html.parser")
+        sp = parseHTML(res.text, TORRENT_TABLE_STRAINER)
 
         if not (tbl := sp.find("table", class_="table-list")):
             continue
 
-        for row in tbl.find_all("tr")[1:11]: # type: ignore
+        for row in tbl.find_all("tr")[1:WebConfig.TORRENT_ROWS_PER_PAGE + 1]: # type: ignore
             col1 = row.find("td", class_="name").select("a:not(.icon)")[0] # type: ignore
 
             data = {"name": col1.get_text(strip=True), "url": BASE_URL+col1.get("href", ""), # type: ignore
                         "seeders": row.find("td", class_="seeds").get_text(strip=True), "leechers": row.find("td", class_="leeches").get_text(strip=True), # type: ignore
                         "time": row.find("td", class_="coll-date").get_text(strip=True), "size": row.find("td", class_="size").get_text(strip=True)} # type: ignore
 
-            if data not in found: found.append(data)
+            if data["url"] not in seen:
+                seen.add(data["url"])
+                found.append(data)
     
     if found: 
         return found, 200
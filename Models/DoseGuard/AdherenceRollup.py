@@ -0,0 +1,27 @@
+from Config import DoseGuardConfig
+from Models._base import Base
+import sqlalchemy as sa
+
+
+class AdherenceRollup(Base):
+    """
+    Taken and missed ``DoseHistory`` counts per patient, dose and UTC day,
+    maintained incrementally by the DoseGuard controller.
+    """
+    __tablename__ = DoseGuardConfig.SQL_ADHERENCE_TABLE
+
+    patientId = sa.Column(sa.BigInteger, sa.ForeignKey(DoseGuardConfig.SQL_PATIENT_TABLE + ".id"), primary_key=True)
+    day = sa.Column(sa.Date, primary_key=True)
+    doseId = sa.Column(sa.BigInteger, sa.ForeignKey(DoseGuardConfig.SQL_DOSES_TABLE + ".id"), primary_key=True)
+    taken = sa.Column(sa.Integer, nullable=False, default=0)
+    missed = sa.Column(sa.Integer, nullable=False, default=0)
+
+
+    def toDict(self):
+        return {
+            "patientId": self.patientId,
+            "doseId": self.doseId,
+            "day": self.day,
+            "taken": self.taken,
+            "missed": self.missed,
+        }
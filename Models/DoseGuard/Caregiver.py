@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from Config import DoseGuardConfig
-from Models._base import Base
+from Models._base import Base, activeIndex
 from Config import EnvConfig
 import sqlalchemy as sa
 
@@ -17,9 +17,15 @@ class Caregiver(Base):
     updatedOn = sa.Column(sa.DateTime, onupdate=lambda: datetime.now(timezone.utc))
     active = sa.Column(sa.Boolean, default=True)
 
+    __table_args__ = (
+        activeIndex(f"ix_{DoseGuardConfig.SQL_CAREGIVER_TABLE}_active", active, "id"),
+    )
+
     user = sa.orm.relationship("User", back_populates="caregiverProfile")
     patients = sa.orm.relationship("Patient", secondary=DoseGuardConfig.SQL_CAREGIVER_PATIENT_TABLE, back_populates="caregivers")
 
+    serializedRelations = ("user",)
+
     def toDict(self):
         return {
             "id": self.id,
@@ -10,6 +10,10 @@ class CaregiverPatient(Base):
     caregiverId = sa.Column(sa.BigInteger, sa.ForeignKey(DoseGuardConfig.SQL_CAREGIVER_TABLE + ".id"), primary_key=True)
     patientId = sa.Column(sa.BigInteger, sa.ForeignKey(DoseGuardConfig.SQL_PATIENT_TABLE + ".id"), primary_key=True)
 
+    __table_args__ = (
+        sa.Index(f"ix_{DoseGuardConfig.SQL_CAREGIVER_PATIENT_TABLE}_patientId", "patientId"),
+    )
+
 
     def toDict(self):
         return {
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from Config import DoseGuardConfig
-from Models._base import Base
+from Models._base import Base, activeIndex
 import sqlalchemy as sa
 
 
@@ -16,6 +16,11 @@ class Dose(Base):
     updatedOn = sa.Column(sa.DateTime, onupdate=lambda: datetime.now(timezone.utc))
     active = sa.Column(sa.Boolean, default=True)
 
+    __table_args__ = (
+        sa.Index(f"ix_{DoseGuardConfig.SQL_DOSES_TABLE}_pillId", "pillId"),
+        activeIndex(f"ix_{DoseGuardConfig.SQL_DOSES_TABLE}_active", active, "id"),
+    )
+
 
     pill = sa.orm.relationship("Pill", back_populates="doses")
     schedules = sa.orm.relationship("Schedule", secondary=DoseGuardConfig.SQL_SCHEDULE_DOSES_TABLE, back_populates="doses")
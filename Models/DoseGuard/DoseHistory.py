@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from Config import DoseGuardConfig
-from Models._base import Base
+from Models._base import Base, activeIndex
 import sqlalchemy as sa
 
 
@@ -16,6 +16,13 @@ class DoseHistory(Base):
     updatedOn = sa.Column(sa.DateTime, onupdate=lambda: datetime.now(timezone.utc))
     active = sa.Column(sa.Boolean, default=True)
 
+    __table_args__ = (
+        sa.Index(f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_TABLE}_patientId", "patientId"),
+        sa.Index(f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_TABLE}_doseId", "doseId"),
+        sa.Index(f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_TABLE}_createdOn", "createdOn"),
+        activeIndex(f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_TABLE}_active", active, "id"),
+    )
+
 
     patient = sa.orm.relationship("Patient", back_populates="doseHistory")
     dose = sa.orm.relationship("Dose", back_populates="history")
@@ -0,0 +1,34 @@
+from Config import DoseGuardConfig
+from Models._base import ArchiveBase
+import sqlalchemy as sa
+
+
+class DoseHistoryChunk(ArchiveBase):
+    """
+    A batch of archived ``DoseHistory`` rows, stored column-wise as
+    zlib-compressed JSON in the cold database.
+    """
+    __tablename__ = DoseGuardConfig.SQL_DOSE_HISTORY_CHUNKS_TABLE
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    firstId = sa.Column(sa.Integer, nullable=False)
+    lastId = sa.Column(sa.Integer, nullable=False)
+    rowCount = sa.Column(sa.Integer, nullable=False)
+    archivedOn = sa.Column(sa.DateTime, nullable=False)
+    data = sa.Column(sa.LargeBinary, nullable=False)
+
+
+class ArchivedDoseHistory(ArchiveBase):
+    """
+    Locates an archived ``DoseHistory`` row inside its chunk, so single rows
+    and id-ordered pages can be read without scanning the chunks.
+    """
+    __tablename__ = DoseGuardConfig.SQL_DOSE_HISTORY_ARCHIVED_TABLE
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=False)
+    chunkId = sa.Column(sa.Integer, sa.ForeignKey(DoseGuardConfig.SQL_DOSE_HISTORY_CHUNKS_TABLE + ".id"), nullable=False)
+    active = sa.Column(sa.Boolean, nullable=False)
+
+    __table_args__ = (
+        sa.Index(f"ix_{DoseGuardConfig.SQL_DOSE_HISTORY_ARCHIVED_TABLE}_chunkId", "chunkId"),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from Config import DoseGuardConfig
-from Models._base import Base
+from Models._base import Base, activeIndex
 import sqlalchemy as sa
 
 
@@ -18,6 +18,10 @@ class Patient(Base):
     updatedOn = sa.Column(sa.DateTime, onupdate=lambda: datetime.now(timezone.utc))
     active = sa.Column(sa.Boolean, default=True)
 
+    __table_args__ = (
+        activeIndex(f"ix_{DoseGuardConfig.SQL_PATIENT_TABLE}_active", active, "id"),
+    )
+
 
     caregivers = sa.orm.relationship("Caregiver", secondary=DoseGuardConfig.SQL_CAREGIVER_PATIENT_TABLE, back_populates="patients")
     schedules = sa.orm.relationship("Schedule", secondary=DoseGuardConfig.SQL_PATIENT_SCHEDULE_TABLE, back_populates="patients")
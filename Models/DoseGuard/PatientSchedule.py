@@ -10,6 +10,10 @@ class PatientSchedule(Base):
     patientId = sa.Column(sa.BigInteger, sa.ForeignKey(DoseGuardConfig.SQL_PATIENT_TABLE + ".id"), primary_key=True)
     scheduleId = sa.Column(sa.BigInteger, sa.ForeignKey(DoseGuardConfig.SQL_SCHEDULE_TABLE + ".id"), primary_key=True)
 
+    __table_args__ = (
+        sa.Index(f"ix_{DoseGuardConfig.SQL_PATIENT_SCHEDULE_TABLE}_scheduleId", "scheduleId"),
+    )
+
 
     def toDict(self):
         return {
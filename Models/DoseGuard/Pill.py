@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from Config import DoseGuardConfig
-from Models._base import Base
+from Models._base import Base, activeIndex
 import sqlalchemy as sa
 
 
@@ -15,6 +15,10 @@ class Pill(Base):
     updatedOn = sa.Column(sa.DateTime, onupdate=lambda: datetime.now(timezone.utc))
     active = sa.Column(sa.Boolean, default=True)
 
+    __table_args__ = (
+        activeIndex(f"ix_{DoseGuardConfig.SQL_PILLS_TABLE}_active", active, "id"),
+    )
+
 
     doses = sa.orm.relationship("Dose", back_populates="pill")
 
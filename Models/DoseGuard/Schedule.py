@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from Config import DoseGuardConfig
-from Models._base import Base
+from Models._base import Base, activeIndex
 import sqlalchemy as sa
 
 
@@ -14,6 +14,10 @@ class Schedule(Base):
     updatedOn = sa.Column(sa.DateTime, onupdate=lambda: datetime.now(timezone.utc))
     active = sa.Column(sa.Boolean, default=True)
 
+    __table_args__ = (
+        activeIndex(f"ix_{DoseGuardConfig.SQL_SCHEDULE_TABLE}_active", active, "id"),
+    )
+
     
     patients = sa.orm.relationship("Patient", secondary=DoseGuardConfig.SQL_PATIENT_SCHEDULE_TABLE, back_populates="schedules")
     doses = sa.orm.relationship("Dose", secondary=DoseGuardConfig.SQL_SCHEDULE_DOSES_TABLE, back_populates="schedules")
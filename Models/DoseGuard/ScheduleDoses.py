@@ -10,6 +10,10 @@ class ScheduleDoses(Base):
     scheduleId = sa.Column(sa.BigInteger, sa.ForeignKey(DoseGuardConfig.SQL_SCHEDULE_TABLE + ".id"), primary_key=True)
     doseId = sa.Column(sa.BigInteger, sa.ForeignKey(DoseGuardConfig.SQL_DOSES_TABLE + ".id"), primary_key=True)
 
+    __table_args__ = (
+        sa.Index(f"ix_{DoseGuardConfig.SQL_SCHEDULE_DOSES_TABLE}_doseId", "doseId"),
+    )
+
 
     def toDict(self):
         return {
@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from Config import MPortfolioConfig
+from .._base import Base
+import sqlalchemy as sa
+
+class ImageVariant(Base):
+    __tablename__ = MPortfolioConfig.SQL_PORTFOLIO_IMAGE_VARIANTS_TABLE
+    __table_args__ = (
+        sa.UniqueConstraint("sha256", "width", "format"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    sha256 = sa.Column(sa.String(64), nullable=False, index=True)
+    width = sa.Column(sa.Integer, nullable=False)
+    format = sa.Column(sa.String, nullable=False)
+    path = sa.Column(sa.String, nullable=False)
+    size = sa.Column(sa.Integer, nullable=False)
+
+    createdOn = sa.Column(sa.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def toDict(self):
+        return {
+            "width": self.width,
+            "format": self.format,
+            "url": MPortfolioConfig.PORTFOLIO_IMAGES_BASE_URL + self.path,
+        }
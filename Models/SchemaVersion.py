@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from Config import DBConfig
+from ._base import Base
+import sqlalchemy as sa
+
+class SchemaVersion(Base):
+    __tablename__ = DBConfig.SQL_SCHEMA_VERSION_TABLE
+
+    version = sa.Column(sa.Integer, primary_key=True, autoincrement=False)
+    description = sa.Column(sa.String, nullable=False)
+    appliedOn = sa.Column(sa.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def toDict(self):
+        return {
+            "version": self.version,
+            "description": self.description,
+            "appliedOn": self.appliedOn,
+        }
@@ -1,10 +1,14 @@
 from .User import User, DetachedUser
+from .SchemaVersion import SchemaVersion
 from .MPortfolio.Post import Post
+from .MPortfolio.ImageVariant import ImageVariant
 
 from .DoseGuard.CaregiverPatient import CaregiverPatient
 from .DoseGuard.PatientSchedule import PatientSchedule
 from .DoseGuard.ScheduleDoses import ScheduleDoses
 from .DoseGuard.DoseHistory import DoseHistory
+from .DoseGuard.AdherenceRollup import AdherenceRollup
+from .DoseGuard.DoseHistoryArchive import DoseHistoryChunk, ArchivedDoseHistory
 from .DoseGuard.Caregiver import Caregiver
 from .DoseGuard.Schedule import Schedule
 from .DoseGuard.Patient import Patient
@@ -15,7 +19,9 @@ __all__ = [
     "Base",
     "User",
     "DetachedUser",
+    "SchemaVersion",
     "Post",
+    "ImageVariant",
 
     # DoseGuard models
     "Caregiver",
@@ -25,6 +31,9 @@ __all__ = [
     "Pill",
     "Dose",
     "DoseHistory",
+    "AdherenceRollup",
+    "DoseHistoryChunk",
+    "ArchivedDoseHistory",
     "Schedule",
     "ScheduleDoses",
 ]
@@ -1,3 +1,12 @@
 from sqlalchemy.orm import declarative_base
+import sqlalchemy as sa
 
 Base = declarative_base()
+ArchiveBase = declarative_base()
+
+def activeIndex(name: str, active: sa.Column, *columns: str) -> sa.Index:
+    """
+    Index restricted to ``active`` rows where the backend supports partial
+    indexes (SQLite, PostgreSQL), and a plain index elsewhere.
+    """
+    return sa.Index(name, *columns, sqlite_where=active == sa.true(), postgresql_where=active == sa.true())
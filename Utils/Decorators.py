@@ -1,11 +1,20 @@
-from Utils.Helpers.AuthHelpers import getUserRatelimit
+from Utils.Helpers.AuthHelpers import getUserRatelimit, authStamp, cachedUser, cacheUser
+from Utils.Helpers.RatelimitHelpers import TwoTierLimiter
+from Utils.Helpers.UsageHelpers import lastUseBuffer
+from Utils.Helpers.WebHelpers import upstreamFlight
+from Controllers.RedisController import redisClient
 from Controllers.DBController import getSession
-from datetime import datetime, timezone
 from Models import User, DetachedUser
 from flask import request, jsonify, g
 from Utils.Enums import Permissions
-from flask_limiter import Limiter 
+from Config import APIConfig
 from functools import wraps
+from redis import RedisError
+import threading
+import hashlib
+import json
+import math
+import time
 
 def Authorize(authPerms=Permissions.GENERAL):
     def decorator(f):
@@ -14,25 +23,125 @@ def Authorize(authPerms=Permissions.GENERAL):
             if not (apiKey := request.headers.get("X-API-KEY")):
                 return jsonify(error="Missing API key"), 401
 
-            with getSession() as session:
-                if not (user := session.query(User).filter_by(apiKey=apiKey).first()):
-                    return jsonify(error="Invalid API key"), 401
-                
-                user.lastUse = datetime.now(timezone.utc) # type: ignore
-                
-                if not (Permissions(user.perms) & authPerms):
-                    return jsonify(error="Insufficient permissions"), 403
-                
-                g.user = DetachedUser(user)
+            if not (user := cachedUser(apiKey)):
+                stamp = authStamp(apiKey)
+                with getSession() as session:
+                    if not (dbUser := session.query(User).filter_by(apiKey=apiKey).first()):
+                        return jsonify(error="Invalid API key"), 401
+                    user = DetachedUser(dbUser)
+
+                cacheUser(apiKey, user, stamp)
+
+            lastUseBuffer.record(user.id)
+
+            if not (Permissions(user.perms) & authPerms):
+                return jsonify(error="Insufficient permissions"), 403
+
+            g.user = user
 
             return f(*args, **kwargs)
         return decorated
     return decorator
 
-Ratelimiter = Limiter(
-    key_func=lambda: (request.headers.get("X-API-Key") or request.remote_addr), # type:ignore   
-    storage_uri="redis://localhost:6379"
-)
+Ratelimiter = TwoTierLimiter(redisClient, APIConfig.RATELIMIT_LEASE_FRACTION, APIConfig.RATELIMIT_REDIS_RETRY,
+                             APIConfig.RATELIMIT_WORKERS, APIConfig.RATELIMIT_MAX_BUCKETS)
 
 def Ratelimited(f):
-    return Ratelimiter.limit(lambda: getUserRatelimit())(f)
\ No newline at end of file
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        limit = getUserRatelimit()
+        key = request.headers.get("X-API-Key") or request.remote_addr or ""
+        allowed, resetIn = Ratelimiter.hit(request.endpoint or f.__name__, key, limit)
+        if not allowed:
+            return jsonify(error=f"Rate limit exceeded: {limit}"), 429, {"Retry-After": str(math.ceil(resetIn))}
+        return f(*args, **kwargs)
+    return decorated
+
+def _refreshCached(key: str, f, args, kwargs, ttl: float, stale: float, negativeTtl: float):
+    try:
+        _storeCached(key, *f(*args, **kwargs), ttl, stale, negativeTtl)
+    finally:
+        try:
+            redisClient.delete(key + ":refresh")
+        except RedisError:
+            pass
+
+def _storeCached(key: str, body, code: int, ttl: float, stale: float, negativeTtl: float):
+    if code not in (200, 204):
+        return
+
+    fresh = ttl if code == 200 else negativeTtl
+    entry = json.dumps({"body": body, "code": code, "freshUntil": time.time() + fresh})
+    try:
+        redisClient.set(key, entry, ex=int(fresh + stale))
+    except RedisError:
+        pass
+
+def ResponseCached(namespace: str, keyFunc, ttl: float, stale: float = 0, negativeTtl: float = 0, refreshLock: float = 30):
+    """
+    Cache a controller's ``(body, code)`` result in Redis, shared by every
+    worker.
+
+    ``200`` results stay fresh for ``ttl`` seconds and ``204`` results for
+    ``negativeTtl``; other codes are never cached. For ``stale`` seconds
+    after that the old result is still served while one caller (guarded by
+    a Redis lock) recomputes it in the background. If Redis is unreachable
+    the controller simply runs uncached.
+
+    Parameters:
+        ``namespace`` (``str``):
+            Key prefix for this controller.
+        ``keyFunc`` (``callable``):
+            Maps the controller's arguments to a normalized cache key.
+        ``ttl``, ``stale``, ``negativeTtl`` (``float``):
+            Freshness windows in seconds.
+        ``refreshLock`` (``float``):
+            Seconds a background refresh may hold the key's refresh lock.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            digest = hashlib.sha1(keyFunc(*args, **kwargs).encode()).hexdigest()
+            key = f"cache:{namespace}:{digest}"
+
+            try:
+                raw = redisClient.get(key)
+            except RedisError:
+                return f(*args, **kwargs)
+
+            if raw:
+                entry = json.loads(raw)
+                if entry["freshUntil"] < time.time():
+                    try:
+                        if redisClient.set(key + ":refresh", 1, nx=True, ex=int(refreshLock)):
+                            threading.Thread(target=_refreshCached, daemon=True,
+                                             args=(key, f, args, kwargs, ttl, stale, negativeTtl)).start()
+                    except RedisError:
+                        pass
+                return entry["body"], entry["code"]
+
+            body, code = f(*args, **kwargs)
+            _storeCached(key, body, code, ttl, stale, negativeTtl)
+            return body, code
+        return decorated
+    return decorator
+
+
+def Coalesced(namespace: str, keyFunc):
+    """
+    Share one execution of the controller between all concurrent calls in
+    this worker that map to the same key. Callers arriving while a call is
+    in flight wait for it and receive the same result.
+
+    Parameters:
+        ``namespace`` (``str``):
+            Key prefix for this controller.
+        ``keyFunc`` (``callable``):
+            Maps the controller's arguments to a normalized key.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            return upstreamFlight.do(f"{namespace}:{keyFunc(*args, **kwargs)}", f, *args, **kwargs)
+        return decorated
+    return decorator
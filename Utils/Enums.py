@@ -8,4 +8,10 @@ class Permissions(IntFlag):
 
 class SortOrder(Enum):
     ASC = "asc"
-    DESC = "desc"
\ No newline at end of file
+    DESC = "desc"
+
+
+class Granularity(Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
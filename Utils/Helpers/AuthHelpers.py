@@ -1,11 +1,46 @@
+from Utils.Helpers.CacheHelpers import TTLCache, SharedVersions
+from Controllers.RedisController import redisClient
 from Utils.Enums import Permissions
 from Config import APIConfig
 from flask import g
+import threading
+import hashlib
 import bcrypt
+import time
+
+authCache = TTLCache(APIConfig.AUTH_CACHE_SIZE, APIConfig.AUTH_CACHE_TTL)
+authVersions = SharedVersions(redisClient, "auth:gen", 2 * APIConfig.AUTH_CACHE_TTL, APIConfig.AUTH_REDIS_RETRY,
+                              APIConfig.AUTH_VERSION_POLL_INTERVAL)
+
+_hashSlots = threading.BoundedSemaphore(APIConfig.BCRYPT_MAX_PENDING)
+_hashRunners = threading.BoundedSemaphore(APIConfig.BCRYPT_WORKERS)
+
+class PasswordPoolBusy(Exception):
+    """
+    Raised when more than ``BCRYPT_MAX_PENDING`` password hashes are already
+    running or queued; surfaced to clients as HTTP 503.
+    """
+
+
+def _runHashJob(fn, *args):
+    """
+    Run a bcrypt call on the calling thread, at most ``BCRYPT_WORKERS`` at a
+    time, refusing new work once ``BCRYPT_MAX_PENDING`` calls are running or
+    waiting. bcrypt releases the GIL, so no separate pool is needed; the
+    semaphores only cap the CPU a login burst can take.
+    """
+    if not _hashSlots.acquire(blocking=False):
+        raise PasswordPoolBusy("Password hashing backlog is full")
+    try:
+        with _hashRunners:
+            return fn(*args)
+    finally:
+        _hashSlots.release()
+
 
 def hashPass(passStr: str) -> str:
     """
-    Hash a plaintext password using bcrypt.
+    Hash a plaintext password using bcrypt, subject to the hashing limits.
 
     Parameters:
         ``passStr`` (``str``):
@@ -14,14 +49,19 @@ def hashPass(passStr: str) -> str:
     Returns:
         ``str``:
             The hashed password.
+
+    Raises:
+        ``PasswordPoolBusy``:
+            If the hashing backlog is full.
     """
-    hashed = bcrypt.hashpw(passStr.encode(), bcrypt.gensalt())
+    hashed = _runHashJob(bcrypt.hashpw, passStr.encode(), bcrypt.gensalt(APIConfig.BCRYPT_ROUNDS))
     return hashed.decode()
 
 
 def verifyPass(passStr: str, passHash: str) -> bool:
     """
-    Verify a plaintext password against its stored hash.
+    Verify a plaintext password against its stored hash, subject to the
+    hashing limits.
 
     Parameters:
         ``passStr`` (``str``):
@@ -33,8 +73,99 @@ def verifyPass(passStr: str, passHash: str) -> bool:
     Returns:
         ``bool``:
             True if the password matches, False otherwise.
+
+    Raises:
+        ``PasswordPoolBusy``:
+            If the hashing backlog is full.
+    """
+    return _runHashJob(bcrypt.checkpw, passStr.encode(), passHash.encode())
+
+
+def needsRehash(passHash: str) -> bool:
+    """
+    Check whether a stored hash was made with a different cost factor than
+    ``BCRYPT_ROUNDS``.
+
+    Parameters:
+        ``passHash`` (``str``):
+            The stored bcrypt hash (``$2b$<cost>$...``).
+
+    Returns:
+        ``bool``:
+            True if the password should be rehashed.
+    """
+    try:
+        return int(passHash.split("$")[2]) != APIConfig.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def _authVersionKey(apiKey: str) -> str:
+    return hashlib.sha1(apiKey.encode()).hexdigest()
+
+
+def authStamp(apiKey: str) -> tuple:
+    """
+    Shared epoch and version of an API key's cache entry; read them before
+    loading the user so a change committed meanwhile is not cached as
+    current.
+    """
+    return authVersions.epoch(), authVersions.read([_authVersionKey(apiKey)])
+
+
+def cachedUser(apiKey: str):
+    """
+    The user cached for an API key, unless another worker invalidated it
+    since it was cached.
+
+    Hits only go to Redis when the shared epoch has moved since the entry
+    was last checked, and the epoch itself is polled at most once per
+    ``AUTH_VERSION_POLL_INTERVAL``, which bounds how long an invalidation
+    takes to reach other workers. Without Redis, entries older than
+    ``AUTH_CACHE_FALLBACK_TTL`` are not trusted.
+    """
+    if not (entry := authCache.get(apiKey)):
+        return None
+
+    epoch, version, cachedAt, user = entry
+    current = authVersions.epoch()
+    if current is None:
+        if time.monotonic() - cachedAt < APIConfig.AUTH_CACHE_FALLBACK_TTL:
+            return user
+    elif current == epoch:
+        return user
+    elif version is not None and authVersions.read([_authVersionKey(apiKey)]) == version:
+        # still current; remember the epoch it was checked at (keeps the original expiry)
+        entry[0] = current
+        return user
+
+    authCache.pop(apiKey)
+    return None
+
+
+def cacheUser(apiKey: str, user, stamp: tuple) -> None:
+    """
+    Cache a user resolved from an API key with the stamp read by
+    ``authStamp`` before it was loaded.
+    """
+    epoch, version = stamp
+    if version is None:
+        epoch = None
+    authCache.set(apiKey, [epoch, version, time.monotonic(), user])
+
+
+def invalidateAuthCache(apiKey: str) -> None:
+    """
+    Drop a cached user resolved from an API key in this worker and, through
+    the shared version, in every other one. Call it once the change is
+    committed.
+
+    Parameters:
+        ``apiKey`` (``str``):
+            The API key the user was cached under.
     """
-    return bcrypt.checkpw(passStr.encode(), passHash.encode())
+    authCache.pop(apiKey)
+    authVersions.bump([_authVersionKey(apiKey)])
 
 
 def getUserRatelimit() -> str:
@@ -0,0 +1,240 @@
+from collections import OrderedDict
+from Utils.Types import Any, Optional
+from redis import RedisError
+import threading
+import time
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a fixed TTL.
+
+    Parameters:
+        ``maxSize`` (``int``):
+            Maximum number of entries kept before the least recently used
+            one is evicted.
+        ``ttl`` (``float``):
+            Seconds an entry stays valid after it was set.
+    """
+    def __init__(self, maxSize: int, ttl: float) -> None:
+        self.maxSize = maxSize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default: Optional[Any] = None) -> Any:
+        """
+        Return the cached value for ``key`` or ``default`` if it is missing
+        or expired. Counts towards the hit/miss statistics.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value: Any) -> None:
+        """
+        Store ``value`` under ``key``, evicting the least recently used
+        entries if the cache is full.
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxSize:
+                self._data.popitem(last=False)
+
+    def pop(self, key) -> None:
+        """
+        Drop ``key`` from the cache if present.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop every entry from the cache.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            ``dict``:
+                keys: `size`, `maxSize`, `ttl`, `hits`, `misses`, `hitRate`
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxSize": self.maxSize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / total if total else 0.0,
+            }
+
+
+class SharedVersions:
+    """
+    Version counters kept in Redis so that every worker sees an invalidation
+    made by any of them.
+
+    A process-local cache stores the versions of its entry's keys next to
+    the value. On a hit it compares them with ``read()``; ``bump()`` after a
+    committed write makes the entry stale in every worker. While Redis is
+    unreachable ``read()`` returns ``None`` and is not retried for
+    ``retryAfter`` seconds, so callers can fall back to a short local TTL.
+
+    Every ``bump()`` also increments a namespace-wide ``epoch()``, which is
+    polled at most once per ``pollInterval``. Hot caches can skip ``read()``
+    while the epoch is unchanged and only re-check their entries after it
+    moves, trading up to ``pollInterval`` of staleness for a round trip per
+    hit.
+
+    Parameters:
+        ``client`` (``Redis``):
+            Shared Redis client.
+        ``namespace`` (``str``):
+            Key prefix.
+        ``keyTtl`` (``int``):
+            Seconds a counter lives after its last bump; must exceed the
+            TTL of the local entries it guards.
+        ``retryAfter`` (``float``):
+            Seconds to skip Redis after an error.
+        ``pollInterval`` (``float``):
+            Seconds ``epoch()`` reuses the last value it read.
+    """
+    def __init__(self, client, namespace: str, keyTtl: int, retryAfter: float, pollInterval: float = 1.0) -> None:
+        self.client = client
+        self.namespace = namespace
+        self.keyTtl = keyTtl
+        self.retryAfter = retryAfter
+        self.pollInterval = pollInterval
+        self._downUntil = 0.0
+        self._epoch: Optional[int] = None
+        self._nextPoll = 0.0
+
+    def _keys(self, keys) -> list[str]:
+        return [f"{self.namespace}:{key}" for key in keys]
+
+    def read(self, keys) -> Optional[tuple]:
+        """
+        Returns:
+            ``tuple | None``:
+                Current version of each key (``0`` if never bumped), or
+                ``None`` if Redis is unavailable.
+        """
+        if time.monotonic() < self._downUntil:
+            return None
+        if not keys:
+            return ()
+        try:
+            return tuple(int(v or 0) for v in self.client.mget(self._keys(keys)))
+        except RedisError:
+            self._downUntil = time.monotonic() + self.retryAfter
+            return None
+
+    def epoch(self) -> Optional[int]:
+        """
+        Returns:
+            ``int | None``:
+                The namespace's bump counter as of the last poll, or
+                ``None`` if Redis is unavailable.
+        """
+        now = time.monotonic()
+        if now < self._downUntil:
+            return None
+        if now >= self._nextPoll:
+            try:
+                self._epoch = int(self.client.get(f"{self.namespace}:epoch") or 0)
+            except RedisError:
+                self._downUntil = now + self.retryAfter
+                return None
+            self._nextPoll = now + self.pollInterval
+        return self._epoch
+
+    def bump(self, keys) -> None:
+        """
+        Increment the versions of ``keys`` and the epoch, invalidating local
+        entries built from them in every worker.
+        """
+        if not keys:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            for key in self._keys(keys):
+                pipe.incr(key)
+                pipe.expire(key, self.keyTtl)
+            pipe.incr(f"{self.namespace}:epoch")
+            pipe.execute()
+        except RedisError:
+            self._downUntil = time.monotonic() + self.retryAfter
+
+
+class TaggedCache(TTLCache):
+    """
+    ``TTLCache`` whose entries carry tags naming the rows they were built
+    from, so a write can drop exactly the entries that read what it changed.
+
+    Invalidation bumps a generation counter: a value computed from reads
+    that started before an invalidation is not stored, which keeps a slow
+    reader from caching data a concurrent write just replaced.
+    """
+    def __init__(self, maxSize: int, ttl: float) -> None:
+        super().__init__(maxSize, ttl)
+        self.generation = 0
+        self._tagged: dict = {}
+
+    def set(self, key, value: Any, tags=(), since: Optional[int] = None) -> bool:
+        """
+        Store ``value`` under ``key`` with its ``tags``.
+
+        Parameters:
+            ``since`` (``int``):
+                ``generation`` read before the value was computed; if any
+                invalidation happened since, nothing is stored.
+
+        Returns:
+            ``bool``:
+                Whether the value was stored.
+        """
+        with self._lock:
+            if since is not None and since != self.generation:
+                return False
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxSize:
+                self._data.popitem(last=False)
+            return True
+
+    def invalidate(self, tags) -> int:
+        """
+        Drop every entry carrying any of ``tags``.
+
+        Returns:
+            ``int``:
+                Number of entries dropped.
+        """
+        with self._lock:
+            self.generation += 1
+            keys = set().union(*(self._tagged.pop(tag, ()) for tag in tags))
+            for key in keys:
+                self._data.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._tagged.clear()
+            self._data.clear()
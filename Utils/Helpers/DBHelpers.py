@@ -1,4 +1,114 @@
 from Controllers.DBController import getSession
+from sqlalchemy.orm import with_parent, aliased, joinedload, selectinload
+from sqlalchemy.dialects import sqlite, postgresql
+from Config import APIConfig
+import sqlalchemy as sa
+import base64
+import json
+
+# Dialects whose insert() supports ON CONFLICT
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+def serializeOptions(model) -> list:
+    """
+    Build loader options for the relationships a model's ``toDict()`` reads.
+
+    Models list those relationship names in ``serializedRelations``.
+    Many-to-one relationships are joined into the main query and
+    collections are fetched with one extra ``IN`` query, so serializing
+    any number of rows costs at most one query per declared relationship.
+
+    Parameters:
+        ``model``:
+            The SQLAlchemy model class being serialized.
+
+    Returns:
+        ``list``:
+            Options to pass to ``query.options()`` or ``session.get()``.
+    """
+    options = []
+    for name in getattr(model, "serializedRelations", ()):
+        relation = getattr(model, name)
+        options.append(selectinload(relation) if relation.property.uselist else joinedload(relation))
+    return options
+
+def encodeCursor(lastId: int) -> str:
+    """
+    Encode the last primary key of a page into an opaque cursor.
+
+    Parameters:
+        ``lastId`` (``int``):
+            Primary key of the last item on the page.
+
+    Returns:
+        ``str``:
+            URL-safe cursor to pass back as ``after``.
+    """
+    raw = json.dumps({"id": lastId}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decodeCursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by ``encodeCursor``.
+
+    Parameters:
+        ``cursor`` (``str``):
+            The opaque cursor.
+
+    Returns:
+        ``int``:
+            The primary key the next page starts after.
+
+    Raises:
+        ``ValueError``:
+            If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return int(json.loads(raw)["id"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def pageSize(limit: int | None) -> int:
+    """
+    Clamp a requested page size to ``[1, MAX_PAGE_SIZE]``, falling back to
+    ``DEFAULT_PAGE_SIZE`` when none was requested.
+    """
+    if limit is None:
+        return APIConfig.DEFAULT_PAGE_SIZE
+    return max(1, min(limit, APIConfig.MAX_PAGE_SIZE))
+
+def paginateQuery(query, idColumn, limit: int | None = None, after: str | None = None):
+    """
+    Apply keyset pagination over a primary key column and serialize the page.
+
+    Parameters:
+        ``query``:
+            SQLAlchemy query selecting the objects to list.
+        ``idColumn``:
+            Indexed, unique column to page over (usually the primary key).
+        ``limit`` (``int``):
+            Requested page size.
+        ``after`` (``str``):
+            Cursor returned as ``next`` by the previous page.
+
+    Returns:
+        ``tuple``:
+            - dict keys: `data` (serialized objects), `next` (cursor or ``None``)
+            - HTTP status code.
+    """
+    limit = pageSize(limit)
+
+    if after:
+        try:
+            query = query.filter(idColumn > decodeCursor(after))
+        except ValueError:
+            return {"error": "Invalid cursor"}, 400
+
+    objs = query.order_by(idColumn).limit(limit + 1).all()
+
+    nextCursor = encodeCursor(objs[limit - 1].id) if len(objs) > limit else None
+    return {"data": [obj.toDict() for obj in objs[:limit]], "next": nextCursor}, 200
 
 def getFromDB(model, idValue: int, notFoundMessage: str):
     """
@@ -18,7 +128,7 @@ def getFromDB(model, idValue: int, notFoundMessage: str):
             - HTTP status code.
     """
     with getSession() as session:
-        obj = session.get(model, idValue)
+        obj = session.get(model, idValue, options=serializeOptions(model))
         if not obj or getattr(obj, "active", True) is False:
             return {"error": notFoundMessage}, 404
         return obj.toDict(), 200
@@ -41,6 +151,93 @@ def createInDB(model):
         session.flush()
         return model.toDict()
     
+def _bulkRowErrors(session, model, rows: list[dict]) -> list[dict]:
+    """
+    Check a bulk payload against the database in a handful of set-based
+    queries: every foreign key must reference an existing row, and rows that
+    supply the whole primary key (link tables) must not repeat each other or
+    an existing row.
+
+    Returns:
+        ``list[dict]``:
+            Per-row errors with keys `index` and `error`.
+    """
+    errors = []
+    chunk = APIConfig.BULK_CHUNK_SIZE
+
+    for fk in model.__table__.foreign_keys:
+        key = fk.parent.key
+        wanted = list({row[key] for row in rows if row.get(key) is not None})
+        existing = set()
+        for i in range(0, len(wanted), chunk):
+            existing.update(session.scalars(sa.select(fk.column).where(fk.column.in_(wanted[i:i + chunk]))))
+
+        errors.extend({"index": i, "error": f"{key} {row[key]} does not exist"}
+                      for i, row in enumerate(rows) if row.get(key) is not None and row[key] not in existing)
+
+    pkKeys = [col.key for col in model.__table__.primary_key.columns]
+    if rows and all(key in rows[0] for key in pkKeys):
+        keyOf = lambda row: tuple(row[key] for key in pkKeys)
+        wanted = list({keyOf(row) for row in rows})
+        existing = set()
+        pkTuple = sa.tuple_(*model.__table__.primary_key.columns)
+        for i in range(0, len(wanted), chunk):
+            existing.update(tuple(r) for r in session.execute(sa.select(*model.__table__.primary_key.columns)
+                                                             .where(pkTuple.in_(wanted[i:i + chunk]))))
+
+        seen = set()
+        for i, row in enumerate(rows):
+            rowKey = keyOf(row)
+            if rowKey in existing or rowKey in seen:
+                errors.append({"index": i, "error": "Link already exists"})
+            seen.add(rowKey)
+
+    return sorted(errors, key=lambda e: e["index"])
+
+def bulkCreateInDB(model, rows: list[dict], afterInsert=None):
+    """
+    Validate and insert many rows of a model in a single transaction.
+
+    References are checked up front for the whole payload; if any row fails,
+    nothing is written. Rows are then inserted with multi-row INSERT
+    statements of ``BULK_CHUNK_SIZE`` rows each.
+
+    Parameters:
+        ``model``:
+            The SQLAlchemy model class.
+        ``rows`` (``list[dict]``):
+            Already type-validated column values, one dict per row. Columns
+            given on some rows but not others are stored as NULL where absent.
+        ``afterInsert`` (``Callable``):
+            Optional ``afterInsert(session, rows)`` run in the same
+            transaction once every row is inserted, to maintain derived data.
+
+    Returns:
+        ``tuple``:
+            - dict keys: `created`, `ids` (primary keys in payload order),
+              or `errors` (list of `index`/`error` dicts).
+            - HTTP status code.
+    """
+    with getSession() as session:
+        if errors := _bulkRowErrors(session, model, rows):
+            return {"errors": errors}, 400
+
+        keys = set().union(*rows)
+        rows = [{key: row.get(key) for key in keys} for row in rows]
+
+        pkCols = list(model.__table__.primary_key.columns)
+        stmt = sa.insert(model).returning(*pkCols, sort_by_parameter_order=True)
+
+        ids = []
+        for i in range(0, len(rows), APIConfig.BULK_CHUNK_SIZE):
+            result = session.execute(stmt, rows[i:i + APIConfig.BULK_CHUNK_SIZE])
+            ids.extend(r[0] if len(pkCols) == 1 else dict(r._mapping) for r in result)
+
+        if afterInsert:
+            afterInsert(session, rows)
+
+        return {"created": len(ids), "ids": ids}, 201
+
 def softDeleteFromDB(model, idValue: int, notFoundMessage: str):
     """
     Soft-delete a database record by setting ``active`` to False.
@@ -97,17 +294,27 @@ def hardDeleteLinkFromDB(model, filters: dict, notFoundMessage: str):
 
         return {"message": "Deleted"}, 200
     
-def listFromDB(model):
+def listFromDB(model, limit: int | None = None, after: str | None = None):
     """
-    Fetch all active records from the given model.
+    Fetch one page of active records from the given model, ordered by ID.
+
+    Parameters:
+        ``model``:
+            The SQLAlchemy model class.
+        ``limit`` (``int``):
+            Page size, capped at ``MAX_PAGE_SIZE``.
+        ``after`` (``str``):
+            Cursor returned by the previous page.
 
     Returns:
-        - List of serialized objects (via toDict())
-        - HTTP 200 status code
+        - dict keys: `data` (serialized objects via toDict()), `next` (cursor)
+        - HTTP status code
     """
     with getSession() as session:
-        objs = session.query(model).filter_by(active=True).all()
-        return [obj.toDict() for obj in objs], 200
+        query = (session.query(model)
+                 .options(*serializeOptions(model))
+                 .filter(model.active == sa.true()))
+        return paginateQuery(query, model.id, limit, after)
     
 def updateInDB(model, idValue: int, updates: dict, notFoundMessage: str):
     """
@@ -123,7 +330,7 @@ def updateInDB(model, idValue: int, updates: dict, notFoundMessage: str):
         (dict, int): Updated model serialized, HTTP code.
     """
     with getSession() as session:
-        obj = session.get(model, idValue)
+        obj = session.get(model, idValue, options=serializeOptions(model))
 
         if not obj or getattr(obj, "active", True) is False:
             return {"error": notFoundMessage}, 404
@@ -134,20 +341,23 @@ def updateInDB(model, idValue: int, updates: dict, notFoundMessage: str):
         session.flush()
         return obj.toDict(), 200
 
-def listRelatedFromDB(model, idValue: int, relationName: str, notFoundMessage: str):
+def listRelatedFromDB(model, idValue: int, relationName: str, notFoundMessage: str,
+                      limit: int | None = None, after: str | None = None):
     """
-    Fetch a parent object, validate it, extract a relationship, filter active
-    children, and serialize them.
+    Fetch a parent object, validate it, and return one page of its active
+    related children, filtered and ordered in SQL.
 
     Parameters:
         model: SQLAlchemy model class.
         idValue (int): ID of the parent object.
         relationName (str): Relationship attribute name on the model.
         notFoundMessage (str): Error when parent not found.
+        limit (int): Page size, capped at ``MAX_PAGE_SIZE``.
+        after (str): Cursor returned by the previous page.
 
     Returns:
         tuple:
-            - list of serialized children
+            - dict keys: `data` (serialized children), `next` (cursor)
             - HTTP status code
     """
     with getSession() as session:
@@ -155,18 +365,29 @@ def listRelatedFromDB(model, idValue: int, relationName: str, notFoundMessage: s
         if not parent or not parent.active:
             return {"error": notFoundMessage}, 404
 
-        related = getattr(parent, relationName, None)
-        if related is None:
+        relation = getattr(model, relationName, None)
+        if relation is None or not hasattr(relation.property, "mapper"):
             return {"error": f"Relationship '{relationName}' does not exist"}, 500
 
-        results = [obj.toDict() for obj in related if getattr(obj, "active", True)]
-        return results, 200
+        target = relation.property.mapper.class_
+        query = (session.query(target)
+                 .options(*serializeOptions(target))
+                 .filter(with_parent(parent, relation)))
+        if hasattr(target, "active"):
+            query = query.filter(target.active == sa.true())
 
-def listNestedRelatedFromDB(model, idValue: int, path: list[str], notFoundMessage: str):
+        return paginateQuery(query, target.id, limit, after)
+
+def listNestedRelatedFromDB(model, idValue: int, path: list[str], notFoundMessage: str,
+                            limit: int | None = None, after: str | None = None):
     """
     Traverse a multi-level relationship chain starting from a root model and
     return all nested related objects.
 
+    The chain is compiled into a single JOIN used as an ``IN`` subquery, so
+    the lookup costs the same number of queries regardless of how many
+    objects sit at each level.
+
     Parameters:
         ``model``:
             The SQLAlchemy model class used as the root of the lookup.
@@ -183,17 +404,26 @@ def listNestedRelatedFromDB(model, idValue: int, path: list[str], notFoundMessag
             Error message returned if the root object does not exist
             or is marked inactive.
 
+        ``limit`` (``int``):
+            Page size, capped at ``MAX_PAGE_SIZE``.
+
+        ``after`` (``str``):
+            Cursor returned by the previous page.
+
     Returns:
         ``tuple``:
-            - ``list``: A list of serialized objects from the final
-              relationship level, using ``toDict()``.
+            - ``dict``: `data`, the serialized objects from the final
+              relationship level ordered by ID, and `next`, the cursor
+              for the following page.
             - ``int``: HTTP status code.
                 - ``200`` on success.
+                - ``400`` if the cursor is malformed.
                 - ``404`` if the root object is not found or inactive.
                 - ``500`` if a relationship in the chain does not exist.
 
     Notes:
-        - Only objects with ``active == True`` are included.
+        - Only objects with ``active == True`` are included, once each;
+          inactive intermediate objects prune their whole branch.
         - Supports any depth of traversal as long as each relationship
           name in ``path`` exists on the previous model.
     """
@@ -202,17 +432,22 @@ def listNestedRelatedFromDB(model, idValue: int, path: list[str], notFoundMessag
         if not obj or not obj.active:
             return {"error": notFoundMessage}, 404
 
-        current = [obj]
+        current = model
+        reachable = sa.select(model.id).where(model.id == idValue)
 
         for rel in path:
-            nextRelation = []
-            for item in current:
-                related = getattr(item, rel, None)
-                if related is None:
-                    return {"error": f"Relationship '{rel}' not found"}, 500
+            relation = getattr(current, rel, None)
+            if relation is None or not hasattr(getattr(relation, "property", None), "mapper"):
+                return {"error": f"Relationship '{rel}' not found"}, 500
 
-                nextRelation.extend([child for child in related if getattr(child, "active", True)])
+            current = aliased(relation.property.mapper.class_)
+            reachable = reachable.join(relation.of_type(current))
+            if hasattr(current, "active"):
+                reachable = reachable.where(current.active == sa.true())
 
-            current = nextRelation
+        target = sa.inspect(current).mapper.class_
+        query = (session.query(target)
+                 .options(*serializeOptions(target))
+                 .filter(target.id.in_(reachable.with_only_columns(current.id))))
 
-        return [c.toDict() for c in current], 200
+        return paginateQuery(query, target.id, limit, after)
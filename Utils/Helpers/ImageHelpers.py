@@ -0,0 +1,136 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+import multiprocessing
+import threading
+import os
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+# Pillow format and file extension to write each variant in, by original extension
+VARIANT_FORMATS = {"jpg": ("JPEG", "jpg"), "png": ("PNG", "png"), "gif": ("PNG", "png"), "webp": ("WEBP", "webp")}
+
+_pool = None
+_poolPid = None
+_poolLock = threading.Lock()
+_jobSlots = None
+
+def _poolContext():
+    """
+    ``forkserver`` where available, else ``spawn``: forking the multithreaded
+    worker directly could copy locks held by its other threads (logging,
+    the DB pool, the Redis pool) into the children.
+
+    The fork server preloads only this module instead of the default
+    ``__main__``, so it never imports the app.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+def _save(img, path: str, fmt: str, quality: int) -> None:
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    elif fmt == "WEBP" and img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+
+    tmpPath = f"{path}.tmp-{os.getpid()}"
+    img.save(tmpPath, format=fmt, quality=quality, optimize=True)
+    os.replace(tmpPath, path)
+
+
+def generateVariants(srcPath: str, root: str, digest: str, ext: str, widths: list[int], quality: int) -> list[dict]:
+    """
+    Write downscaled copies of a stored image next to it, in its own format
+    and (when Pillow supports it) as WebP. Runs in a worker process.
+
+    Variants are named ``<sha256>_<width>.<ext>``, so a variant that already
+    exists is reported without being regenerated. Widths not smaller than
+    the original are skipped.
+
+    Parameters:
+        ``srcPath`` (``str``):
+            The stored original.
+        ``root`` (``str``):
+            Uploads folder the returned paths are relative to.
+        ``digest`` (``str``):
+            SHA-256 of the original.
+        ``ext`` (``str``):
+            Extension of the original.
+        ``widths`` (``list[int]``):
+            Target widths in pixels.
+        ``quality`` (``int``):
+            Lossy encoder quality.
+
+    Returns:
+        ``list[dict]``:
+            keys: `width`, `format`, `path`, `size`
+    """
+    fmt, outExt = VARIANT_FORMATS[ext]
+    targets = [(fmt, outExt)]
+    if outExt != "webp" and features.check("webp"):
+        targets.append(("WEBP", "webp"))
+
+    directory = os.path.dirname(srcPath)
+    variants = []
+    with Image.open(srcPath) as original:
+        img = ImageOps.exif_transpose(original)
+        srcWidth, srcHeight = img.size
+
+        for width in sorted(widths, reverse=True):
+            if width >= srcWidth:
+                continue
+
+            resized = None
+            for targetFmt, targetExt in targets:
+                path = os.path.join(directory, f"{digest}_{width}.{targetExt}")
+                if not os.path.exists(path):
+                    if resized is None:
+                        resized = img.resize((width, max(1, round(srcHeight * width / srcWidth))), Image.LANCZOS)
+                    _save(resized, path, targetFmt, quality)
+
+                variants.append({"width": width, "format": targetExt,
+                                 "path": os.path.relpath(path, root).replace(os.sep, "/"),
+                                 "size": os.path.getsize(path)})
+    return variants
+
+
+def submitVariants(srcPath: str, root: str, digest: str, ext: str, widths: list[int], quality: int,
+                   workers: int, maxPending: int) -> Future | None:
+    """
+    Queue ``generateVariants`` on this process's image worker pool (at most
+    ``workers`` images are processed at a time).
+
+    At most ``maxPending`` jobs are running or queued per process; beyond
+    that the image is skipped rather than queued, and uploading it again
+    retries.
+
+    Returns:
+        ``Future | None``:
+            The pending job, or ``None`` when Pillow is not installed or the
+            pool is saturated.
+    """
+    global _pool, _poolPid, _jobSlots
+    if Image is None:
+        return None
+
+    with _poolLock:
+        if _poolPid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_poolContext())
+            _jobSlots = threading.BoundedSemaphore(maxPending)
+            _poolPid = os.getpid()
+
+    if not _jobSlots.acquire(blocking=False):
+        return None
+
+    slots = _jobSlots
+    try:
+        job = _pool.submit(generateVariants, srcPath, root, digest, ext, widths, quality)
+    except BaseException:
+        slots.release()
+        raise
+    job.add_done_callback(lambda _: slots.release())
+    return job
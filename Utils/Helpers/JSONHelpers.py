@@ -0,0 +1,60 @@
+from flask.json.provider import JSONProvider
+from datetime import date, time
+from Utils.Types import Any
+from decimal import Decimal
+from enum import Enum
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def jsonDefault(obj: Any) -> Any:
+    """
+    Fallback serializer for values the encoder does not handle natively.
+
+    Dates and times become ISO 8601 strings, enums their value, sets lists
+    and decimals strings.
+    """
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class FastJSONProvider(JSONProvider):
+    """
+    Flask JSON provider producing compact output.
+
+    Uses ``orjson`` when it is installed, which serializes datetimes, enums
+    and dataclasses natively, and the standard library otherwise. Both paths
+    render datetimes as ISO 8601.
+    """
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=jsonDefault, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        kwargs.setdefault("default", jsonDefault)
+        kwargs.setdefault("ensure_ascii", False)
+        kwargs.setdefault("separators", (",", ":"))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is not None:
+            body = orjson.dumps(obj, default=jsonDefault, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            body = self.dumps(obj)
+        return self._app.response_class(body, mimetype="application/json")
@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from redis import Redis, RedisError
+import threading
+import hashlib
+import math
+import time
+import re
+
+_LIMIT = re.compile(r"^\s*(\d+)\s*/\s*(\d+)?\s*(second|minute|hour|day)s?\s*$")
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+def parseLimit(limit: str) -> tuple[int, int]:
+    """
+    Parse a rate limit string such as ``"10/minute"`` or ``"100/5 minutes"``.
+
+    Returns:
+        ``tuple``:
+            Containing:
+            - int: requests allowed per window
+            - int: window length in seconds
+
+    Raises:
+        ``ValueError``:
+            If the string is not a valid limit.
+    """
+    if not (m := _LIMIT.match(limit)):
+        raise ValueError(f"Invalid rate limit '{limit}'")
+    return int(m.group(1)), int(m.group(2) or 1) * _PERIODS[m.group(3)]
+
+
+class _Bucket:
+    __slots__ = ("redisKey", "window", "expires", "tokens", "served", "offline", "exhausted", "lock")
+
+    def __init__(self, redisKey: str, window: int, expires: float) -> None:
+        self.redisKey = redisKey
+        self.window = window
+        self.expires = expires
+        self.tokens = 0
+        self.served = 0
+        self.offline = 0
+        self.exhausted = False
+        self.lock = threading.Lock()
+
+
+class TwoTierLimiter:
+    """
+    Fixed-window rate limiter with a per-worker token tier in front of Redis.
+
+    Each worker leases tokens from the shared Redis window counter in batches
+    (``leaseFraction`` of the limit, at least one) with a single pipelined
+    ``INCRBY``/``EXPIRE`` and then admits requests locally until the lease
+    runs out, so most requests never touch Redis. Leases are taken out of
+    the global budget up front, so the limit is never exceeded while Redis
+    is reachable.
+
+    If Redis fails, the worker falls back to enforcing its share of the
+    limit (``1/workers``) locally and retries Redis after ``retryAfter``
+    seconds. The requests it admitted in the meantime are added to the
+    window counter with the next successful lease.
+
+    Parameters:
+        ``client`` (``Redis``):
+            Client for the shared counters.
+        ``leaseFraction`` (``float``):
+            Share of the limit leased per Redis round trip.
+        ``retryAfter`` (``float``):
+            Seconds to stay local-only after a Redis error.
+        ``workers`` (``int``):
+            Number of workers sharing the limit, for local-only mode.
+        ``maxBuckets`` (``int``):
+            Most buckets kept per worker. The least recently used ones are
+            evicted, giving their unused leased tokens back to Redis.
+    """
+    def __init__(self, client: Redis, leaseFraction: float, retryAfter: float, workers: int, maxBuckets: int) -> None:
+        self.client = client
+        self.leaseFraction = leaseFraction
+        self.retryAfter = retryAfter
+        self.workers = max(1, workers)
+        self.maxBuckets = maxBuckets
+        self.enabled = True
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redisRetryAt = 0.0
+
+    def init_app(self, app) -> None:
+        """
+        Register the limiter on ``app``; ``RATELIMIT_ENABLED = False`` in the
+        app config turns limiting off.
+        """
+        self.enabled = app.config.get("RATELIMIT_ENABLED", True)
+        app.extensions["ratelimiter"] = self
+
+    def hit(self, scope: str, key: str, limit: str) -> tuple[bool, float]:
+        """
+        Consume one request for ``key`` under ``scope`` (usually the
+        endpoint).
+
+        Returns:
+            ``tuple``:
+                Containing:
+                - bool: whether the request is allowed
+                - float: seconds until the current window resets
+        """
+        if not self.enabled:
+            return True, 0.0
+
+        amount, period = parseLimit(limit)
+        now = time.time()
+        window = int(now // period)
+        resetIn = (window + 1) * period - now
+
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        bucket = self._bucket(f"{scope}:{digest}:{amount}/{period}", window, now + resetIn)
+
+        with bucket.lock:
+            if bucket.tokens > 0:
+                bucket.tokens -= 1
+                bucket.served += 1
+                return True, resetIn
+            if bucket.exhausted:
+                return False, resetIn
+
+            if now >= self._redisRetryAt:
+                try:
+                    granted = self._lease(bucket.redisKey, bucket, amount, period)
+                except RedisError:
+                    self._redisRetryAt = now + self.retryAfter
+                else:
+                    if not granted:
+                        bucket.exhausted = True
+                        return False, resetIn
+                    bucket.tokens = granted - 1
+                    bucket.served += 1
+                    return True, resetIn
+
+            if bucket.served >= math.ceil(amount / self.workers):
+                return False, resetIn
+            bucket.served += 1
+            bucket.offline += 1
+            return True, resetIn
+
+    def _lease(self, redisKey: str, bucket: _Bucket, amount: int, period: int) -> int:
+        batch = max(1, int(amount * self.leaseFraction))
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.incrby(redisKey, batch + bucket.offline)
+        pipe.expire(redisKey, period + 1)
+        total, _ = pipe.execute()
+
+        before = total - batch
+        bucket.offline = 0
+        return max(0, min(batch, amount - before))
+
+    def _bucket(self, bucketKey: str, window: int, expires: float) -> _Bucket:
+        evicted = []
+        with self._lock:
+            bucket = self._buckets.get(bucketKey)
+            if bucket is None or bucket.window != window:
+                bucket = self._buckets[bucketKey] = _Bucket(f"rl:{bucketKey}:{window}", window, expires)
+                while len(self._buckets) > self.maxBuckets:
+                    evicted.append(self._buckets.popitem(last=False)[1])
+            self._buckets.move_to_end(bucketKey)
+
+        if evicted:
+            self._release(evicted)
+        return bucket
+
+    def _release(self, buckets: list[_Bucket]) -> None:
+        """
+        Settle evicted buckets with Redis: return the leased tokens they did
+        not use and report the requests they admitted offline.
+        """
+        now = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        for bucket in buckets:
+            with bucket.lock:
+                delta, bucket.tokens, bucket.offline = bucket.offline - bucket.tokens, 0, 0
+            if delta and bucket.expires > now:
+                pipe.incrby(bucket.redisKey, delta)
+                pipe.expire(bucket.redisKey, math.ceil(bucket.expires - now) + 1)
+
+        if len(pipe) and now >= self._redisRetryAt:
+            try:
+                pipe.execute()
+            except RedisError:
+                self._redisRetryAt = now + self.retryAfter
@@ -1,115 +1,207 @@
-from Utils.Types import Any, Tuple, Optional, List, FieldSpec, HandlerFunc, JSONDict, Response
+from Utils.Types import Any, Tuple, Optional, List, Callable, FieldSpec, HandlerFunc, JSONDict, Response
 from werkzeug.datastructures import FileStorage
+from datetime import datetime, timezone
+from functools import lru_cache
+from Config import APIConfig
 from flask import jsonify
 from enum import Enum
 
-def requireField(data: dict, key: str) -> Tuple[Optional[Any], Optional[Response], Optional[int]]:
+class _FieldError(Exception):
     """
-    Validate that a required key exists in request data.
+    Raised by compiled converters. ``message`` contains a ``{field}``
+    placeholder; ``path`` collects field names and list indexes from the
+    innermost value outwards while the error propagates.
+    """
+    def __init__(self, message: str, path: Optional[list] = None) -> None:
+        self.message = message
+        self.path = path or []
 
-    Parameters:
-        ``data`` (``dict``):
-            The request JSON payload.
-        ``key`` (``str``):
-            The required field name.
+    def field(self) -> str:
+        out = ""
+        for part in reversed(self.path):
+            out += f"[{part}]" if isinstance(part, int) else (f".{part}" if out else part)
+        return out
 
-    Returns:
-        ``tuple``:
-            - The extracted value (or ``None`` if missing).
-            - ``jsonify`` error response on error.
-            - HTTP status code on error.
+    def toDict(self) -> JSONDict:
+        field = self.field()
+        return {"error": self.message.format(field=field), "field": field}
+
+
+_BOOLS = {"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False}
+
+def _compileType(expectedType) -> Callable[[Any], Any]:
+    """
+    Build the converter for one field type once, so validation does no type
+    dispatch per value.
     """
-    if key not in data:
-        return None, jsonify({"error": f"{key} required"}), 400
-    return data[key], None, None
+    if isinstance(expectedType, (Validator, ListOf)):
+        return expectedType
 
+    if expectedType is FileStorage:
+        return lambda value: value
 
-def convertField(value: Any, expectedType: type, key: str):
+    if expectedType is bool:
+        def convertBool(value):
+            try:
+                return _BOOLS[str(value).lower()]
+            except KeyError:
+                raise _FieldError("Invalid bool for field '{field}'") from None
+        return convertBool
+
+    if expectedType is datetime:
+        def convertDatetime(value):
+            try:
+                parsed = datetime.fromisoformat(str(value))
+            except ValueError:
+                raise _FieldError("Invalid datetime for field '{field}', expected ISO 8601") from None
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+        return convertDatetime
+
+    if isinstance(expectedType, type) and issubclass(expectedType, Enum):
+        accepted = {e.value.lower(): e for e in expectedType}
+        enumError = f"Invalid value for '{{field}}', expected one of {[e.value for e in expectedType]}"
+
+        def convertEnum(value):
+            try:
+                return accepted[str(value).lower()]
+            except KeyError:
+                raise _FieldError(enumError) from None
+        return convertEnum
+
+    typeError = f"Invalid type for field '{{field}}', expected {expectedType.__name__}"
+
+    def convert(value):
+        if type(value) is expectedType:
+            return value
+        try:
+            return expectedType(value)
+        except (ValueError, TypeError):
+            raise _FieldError(typeError) from None
+    return convert
+
+
+class ListOf:
     """
-    Convert a field value into a required type.
+    Field type for a JSON array whose items are all of ``itemType`` (a plain
+    type, an Enum, a nested ``Validator`` or another ``ListOf``).
 
     Parameters:
-        ``value`` (``any``):
-            The raw value.
-        ``expectedType`` (``type``):
-            The desired type.
-        ``key`` (``str``):
-            The field name.
-
-    Returns:
-        ``tuple``:
-            - Converted value or ``None``.
-            - Error response or ``None``.
-            - Error code or ``None``.
+        ``itemType``:
+            Type of each item.
+        ``maxItems`` (``int``):
+            Optional upper bound on the array length.
     """
-    try:
-        if expectedType == bool:
-            lower = str(value).lower()
-            if lower in ["true", "1", "yes"]:
-                return True, None, None
-            if lower in ["false", "0", "no"]:
-                return False, None, None
-            return None, jsonify({"error": f"Invalid bool for field '{key}'"}), 400
+    def __init__(self, itemType, maxItems: Optional[int] = None) -> None:
+        self.maxItems = maxItems
+        self._convert = _compileType(itemType)
 
-        return expectedType(value), None, None
+    def __call__(self, value):
+        if not isinstance(value, list):
+            raise _FieldError("Expected a list for field '{field}'")
+        if self.maxItems is not None and len(value) > self.maxItems:
+            raise _FieldError(f"At most {self.maxItems} items allowed for field '{{field}}'")
 
-    except (ValueError, TypeError):
-        return None, jsonify({
-            "error": f"Invalid type for field '{key}', expected {expectedType.__name__}"
-        }), 400
+        convert = self._convert
+        out = []
+        for index, item in enumerate(value):
+            try:
+                out.append(convert(item))
+            except _FieldError as e:
+                e.path.append(index)
+                raise
+        return out
 
 
-def validateFields(data: JSONDict, fields: List[FieldSpec]):
+class Validator:
     """
-    Validate endpoint input fields and convert them to their correct types.
+    Field specifications compiled once (at route definition) into a
+    validator for request payloads.
+
+    Each field type is resolved to a converter up front (Enum lookup tables
+    included), so validating is a single loop over ``(name, required,
+    converter)`` triples. A ``Validator`` can itself be used as a field type
+    for nested objects, and inside ``ListOf`` for arrays of objects.
+    ``datetime`` fields accept ISO 8601 and are normalized to naive UTC.
 
     Parameters:
-        ``data`` (``dict``):
-            The request JSON payload.
         ``fields`` (``list``):
             Field definitions in the format (name, type, required).
-
-    Returns:
-        ``tuple``:
-            - Fields or ``None``.
-            - Error response or ``None``.
-            - Error code or ``None``.
     """
-    finalFields = {}
+    def __init__(self, fields: List[FieldSpec]) -> None:
+        self.fields = list(fields)
+        self._compiled = tuple((name, isRequired, _compileType(expectedType))
+                               for name, expectedType, isRequired in fields)
 
-    for field, expectedType, isRequired in fields:
-        if isRequired:
-            value, err, code = requireField(data, field)
-            if err:
-                return None, err, code
-        else:
-            if field not in data:
-                continue
-            value = data[field]
+    def __call__(self, data):
+        if not isinstance(data, dict):
+            raise _FieldError("Expected an object for field '{field}'")
+        return self._convert(data)
 
-        if isinstance(value, FileStorage):
-            finalFields[field] = value
-            continue
+    def _convert(self, data) -> JSONDict:
+        final = {}
+        for name, isRequired, convert in self._compiled:
+            if name in data:
+                try:
+                    final[name] = convert(data[name])
+                except _FieldError as e:
+                    e.path.append(name)
+                    raise
+            elif isRequired:
+                raise _FieldError("{field} required", [name])
+        return final
 
-        if isinstance(expectedType, type) and issubclass(expectedType, Enum):
-            lowerVal = str(value).lower()
-            acceptedVals = {e.value.lower(): e for e in expectedType}
+    def validate(self, data) -> Tuple[Optional[JSONDict], Optional[JSONDict], Optional[int]]:
+        """
+        Validate ``data`` (a dict or request ``MultiDict``) and convert its
+        fields to their declared types.
 
-            if lowerVal not in acceptedVals:
-                return None, {
-                    "error": f"Invalid value for '{field}', expected one of {[e.value for e in expectedType]}"
-                }, 400
+        Returns:
+            ``tuple``:
+                - Fields or ``None``.
+                - Error dict (keys: `error`, `field`; the field is a path such
+                  as ``doses[2].amount`` for nested values) or ``None``.
+                - Error code or ``None``.
+        """
+        try:
+            return self._convert(data), None, None
+        except _FieldError as e:
+            return None, e.toDict(), 400
 
-            finalFields[field] = acceptedVals[lowerVal]
-            continue
 
-        value, err, code = convertField(value, expectedType, field)
-        if err:
-            return None, err, code
+@lru_cache(maxsize=256)
+def _validatorFor(fields: tuple) -> Validator:
+    return Validator(list(fields))
 
-        finalFields[field] = value
+def compileFields(fields) -> Validator:
+    """
+    Return ``fields`` as a ``Validator``, compiling (and memoizing) plain
+    field lists.
+    """
+    if isinstance(fields, Validator):
+        return fields
+    return _validatorFor(tuple(fields))
 
-    return finalFields, None, None
+
+def validateFields(data: JSONDict, fields: List[FieldSpec]):
+    """
+    Validate endpoint input fields and convert them to their correct types.
+
+    Parameters:
+        ``data`` (``dict``):
+            The request JSON payload.
+        ``fields`` (``list`` | ``Validator``):
+            Field definitions in the format (name, type, required), or an
+            already compiled ``Validator``.
+
+    Returns:
+        ``tuple``:
+            - Fields or ``None``.
+            - Error dict or ``None``.
+            - Error code or ``None``.
+    """
+    return compileFields(fields).validate(data)
 
 def handleKwargsEndpoint(data, fields, handler):
     """
@@ -119,7 +211,7 @@ def handleKwargsEndpoint(data, fields, handler):
         ``data``:
             Incoming request dictionary (JSON or args).
         ``fields``:
-            Field specifications: (name, type, required).
+            ``Validator`` or field specifications: (name, type, required).
         ``handler``:
             Function that accepts validated fields via **kwargs.
 
@@ -143,7 +235,7 @@ def handleDictEndpoint(data, fields, handler):
         ``data``:
             Incoming request dictionary (typically request.args).
         ``fields``:
-            Field specifications: (name, type, required).
+            ``Validator`` or field specifications: (name, type, required).
         ``handler``:
             Function that accepts one argument: a dict of validated fields.
 
@@ -158,3 +250,49 @@ def handleDictEndpoint(data, fields, handler):
 
     response, code = handler(final)
     return jsonify(response), code
+
+
+def handleBulkEndpoint(data, fields, handler):
+    """
+    Validate every item of a JSON array and pass the validated rows to the
+    handler as a single list.
+
+    Parameters:
+        ``data``:
+            Incoming request payload, expected to be a list of objects.
+        ``fields``:
+            ``Validator`` or field specifications applied to each item:
+            (name, type, required).
+        ``handler``:
+            Function that accepts one argument: a list of validated dicts.
+
+    Returns:
+        ``tuple``:
+            - jsonify(...) response; on validation failure
+              ``{"errors": [{"index", "error", "field"}, ...]}`` covering every bad item
+            - HTTP status code
+    """
+    if not isinstance(data, list) or not data:
+        return jsonify({"error": "Expected a non-empty JSON array"}), 400
+
+    if len(data) > APIConfig.BULK_MAX_ROWS:
+        return jsonify({"error": f"At most {APIConfig.BULK_MAX_ROWS} items per request"}), 413
+
+    validate = compileFields(fields).validate
+    rows, errors = [], []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "error": "Expected an object"})
+            continue
+
+        final, err, _ = validate(item)
+        if err:
+            errors.append({"index": index, **err})
+        else:
+            rows.append(final)
+
+    if errors:
+        return jsonify({"errors": errors}), 400
+
+    response, code = handler(rows)
+    return jsonify(response), code
@@ -0,0 +1,74 @@
+from datetime import datetime
+import numpy as np
+
+def expandOccurrences(anchors: np.ndarray, intervals: np.ndarray, start: int, end: int,
+                      maxEvents: int) -> tuple[np.ndarray, np.ndarray, bool]:
+    """
+    Expand periodic schedules into their occurrences inside ``[start, end)``
+    without a per-event Python loop.
+
+    Row ``i`` occurs at ``anchors[i] + k * intervals[i]`` for every ``k >= 0``.
+    Per-row occurrence counts are computed in closed form, rows are
+    repeated by their counts, and each repetition gets its own ``k`` from a
+    running offset; the merged result is sorted by time.
+
+    When the window holds more than ``maxEvents`` occurrences it is first
+    shrunk, by bisecting on the closed-form counts, to the shortest prefix
+    holding at least ``maxEvents``, so at most ``maxEvents + len(anchors)``
+    occurrences are ever materialized however long the window is.
+
+    Parameters:
+        ``anchors`` (``np.ndarray``):
+            First occurrence of each row, in epoch seconds (int64).
+        ``intervals`` (``np.ndarray``):
+            Period of each row in seconds (int64, positive).
+        ``start``, ``end`` (``int``):
+            Window bounds in epoch seconds.
+        ``maxEvents`` (``int``):
+            Maximum number of occurrences returned (the earliest ones).
+
+    Returns:
+        ``tuple``:
+            Containing:
+            - np.ndarray: row index of each occurrence
+            - np.ndarray: time of each occurrence in epoch seconds, ascending
+            - bool: whether occurrences past ``maxEvents`` were dropped
+    """
+    first = np.maximum(0, -((anchors - start) // intervals))
+
+    def countsBefore(t: int) -> np.ndarray:
+        return np.maximum(0, np.maximum(0, -((anchors - t) // intervals)) - first)
+
+    counts = countsBefore(end)
+    truncated = int(counts.sum()) > maxEvents
+    if truncated:
+        lo, hi = start, end
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if int(countsBefore(mid).sum()) >= maxEvents:
+                hi = mid
+            else:
+                lo = mid
+        counts = np.minimum(countsBefore(hi), maxEvents)
+
+    total = int(counts.sum())
+    rows = np.repeat(np.arange(len(anchors)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    times = anchors[rows] + (first[rows] + offsets) * intervals[rows]
+
+    order = np.argsort(times, kind="stable")[:maxEvents]
+    return rows[order], times[order], truncated
+
+
+def epochSeconds(values: list[datetime]) -> np.ndarray:
+    """
+    Naive UTC datetimes to an int64 array of epoch seconds.
+    """
+    return np.array(values, dtype="datetime64[s]").astype(np.int64)
+
+
+def isoStrings(seconds: np.ndarray) -> np.ndarray:
+    """
+    Epoch seconds to naive ISO 8601 strings, vectorized.
+    """
+    return np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s")
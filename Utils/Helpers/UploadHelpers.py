@@ -0,0 +1,87 @@
+from Config import MPortfolioConfig
+from typing import BinaryIO
+import tempfile
+import hashlib
+import os
+
+class UploadTooLarge(Exception):
+    """
+    Raised when an upload exceeds the configured maximum size.
+    """
+
+
+def sniffImageType(head: bytes) -> str | None:
+    """
+    Identify an image from its leading bytes.
+
+    Parameters:
+        ``head`` (``bytes``):
+            The first bytes of the file (at least 12).
+
+    Returns:
+        ``str | None``:
+            The file extension for the detected format, or ``None`` if the
+            bytes are not a supported image.
+    """
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    for signature, ext in MPortfolioConfig.PORTFOLIO_IMAGE_SIGNATURES.items():
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+def shardedPath(root: str, digest: str, ext: str, depth: int = MPortfolioConfig.PORTFOLIO_SHARD_DEPTH) -> str:
+    """
+    Content-addressed location of a file: ``root/ab/cd/abcd….ext`` for
+    ``depth`` two-character directory levels taken from ``digest``.
+    """
+    shards = [digest[i * 2:i * 2 + 2] for i in range(depth)]
+    return os.path.join(root, *shards, f"{digest}.{ext}")
+
+
+def streamToTempFile(stream: BinaryIO, head: bytes, directory: str, maxSize: int, chunkSize: int) -> tuple[str, str]:
+    """
+    Copy ``head`` followed by the rest of ``stream`` into a temporary file
+    in ``directory`` chunk by chunk, hashing it on the way.
+
+    Parameters:
+        ``stream`` (``BinaryIO``):
+            The upload, positioned just after ``head``.
+        ``head`` (``bytes``):
+            Bytes already read from the stream.
+        ``directory`` (``str``):
+            Where to create the temporary file (same filesystem as the
+            final location, so it can be moved atomically).
+        ``maxSize`` (``int``):
+            Maximum number of bytes accepted.
+        ``chunkSize`` (``int``):
+            Bytes read per iteration.
+
+    Returns:
+        ``tuple``:
+            Containing:
+            - str: path of the temporary file
+            - str: hex SHA-256 of its contents
+
+    Raises:
+        ``UploadTooLarge``:
+            The upload exceeded ``maxSize``; the temporary file is removed.
+    """
+    sha = hashlib.sha256()
+    size = 0
+    fd, tmpPath = tempfile.mkstemp(prefix=".upload-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > maxSize:
+                    raise UploadTooLarge(f"Upload exceeds {maxSize} bytes")
+                sha.update(chunk)
+                out.write(chunk)
+                chunk = stream.read(chunkSize)
+    except BaseException:
+        os.unlink(tmpPath)
+        raise
+    return tmpPath, sha.hexdigest()
@@ -0,0 +1,96 @@
+from Controllers.DBController import getSession
+from datetime import datetime, timezone
+from sqlalchemy import update, bindparam
+from Config import APIConfig
+from Models import User
+import threading
+import atexit
+import os
+
+class LastUseBuffer:
+    """
+    Write-behind aggregator for ``User.lastUse``.
+
+    Requests only record the latest use time per user in memory; a background
+    thread writes them out in a single bulk UPDATE every ``interval`` seconds,
+    or sooner once ``maxUsers`` distinct users are pending. Pending entries are
+    flushed again when the worker exits.
+
+    Parameters:
+        ``interval`` (``float``):
+            Seconds between periodic flushes.
+        ``maxUsers`` (``int``):
+            Number of pending users that triggers an early flush.
+    """
+    def __init__(self, interval: float, maxUsers: int) -> None:
+        self.interval = interval
+        self.maxUsers = maxUsers
+        self._pending: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+
+    def record(self, userId: int, when: datetime | None = None) -> None:
+        """
+        Remember that ``userId`` was used at ``when`` (defaults to now).
+        Never touches the database.
+        """
+        self._ensureWorker()
+        with self._lock:
+            self._pending[userId] = when or datetime.now(timezone.utc)
+            full = len(self._pending) >= self.maxUsers
+
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write every pending use time in one bulk UPDATE.
+
+        Returns:
+            ``int``:
+                Number of pending users written.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        users = User.__table__
+        stmt = (update(users)
+                .where(users.c.id == bindparam("uid"))
+                .values(lastUse=bindparam("ts"), updatedOn=users.c.updatedOn))
+
+        try:
+            with getSession() as session:
+                session.execute(stmt, [{"uid": uid, "ts": ts} for uid, ts in pending.items()])
+        except Exception:
+            with self._lock:
+                for uid, ts in pending.items():
+                    self._pending.setdefault(uid, ts)
+            raise
+
+        return len(pending)
+
+    def _ensureWorker(self) -> None:
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="lastUse-flusher", daemon=True).start()
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+lastUseBuffer = LastUseBuffer(APIConfig.LAST_USE_FLUSH_INTERVAL, APIConfig.LAST_USE_FLUSH_USERS)
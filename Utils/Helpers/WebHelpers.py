@@ -0,0 +1,260 @@
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urlsplit
+from Config import WebConfig
+import importlib.util
+import threading
+import requests
+import time
+
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+httpSession = requests.Session()
+_adapter = HTTPAdapter(pool_connections=WebConfig.WEB_POOL_SIZE, pool_maxsize=WebConfig.WEB_POOL_SIZE)
+httpSession.mount("https://", _adapter)
+httpSession.mount("http://", _adapter)
+
+_fetchPool = ThreadPoolExecutor(max_workers=WebConfig.WEB_FETCH_WORKERS, thread_name_prefix="web-fetch")
+
+class DeadlineExceeded(requests.Timeout):
+    """
+    Raised in place of a response when a page was still loading at the
+    overall deadline of ``fetchPages``.
+    """
+
+
+class CircuitOpen(requests.RequestException):
+    """
+    Raised instead of contacting an upstream whose circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+
+    After ``failureThreshold`` consecutive failures (transport errors,
+    timeouts or ``5xx`` responses) the circuit opens and calls fail fast with
+    ``CircuitOpen``. Once ``resetTimeout`` seconds have passed it goes
+    half-open and lets a single probe through: success closes the circuit,
+    failure opens it for another ``resetTimeout``.
+
+    Parameters:
+        ``failureThreshold`` (``int``):
+            Consecutive failures that open the circuit.
+        ``resetTimeout`` (``float``):
+            Seconds to stay open before probing again.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failureThreshold: int, resetTimeout: float) -> None:
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.failures = 0
+        self._openedAt = 0.0
+        self._state = self.CLOSED
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._openedAt >= self.resetTimeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def acquire(self) -> None:
+        """
+        Admit a call, or raise ``CircuitOpen`` if the upstream is considered
+        down (or a half-open probe is already in flight).
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN:
+                if time.monotonic() - self._openedAt < self.resetTimeout:
+                    raise CircuitOpen("Upstream unavailable")
+                self._state = self.HALF_OPEN
+            if self._probing:
+                raise CircuitOpen("Upstream unavailable")
+            self._probing = True
+
+    def recordSuccess(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._state = self.CLOSED
+
+    def recordFailure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self.failures >= self.failureThreshold:
+                self._state = self.OPEN
+                self._openedAt = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakersLock = threading.Lock()
+
+def breakerFor(url: str) -> CircuitBreaker:
+    """
+    The circuit breaker shared by every URL on ``url``'s host.
+    """
+    host = urlsplit(url).netloc
+    if (breaker := _breakers.get(host)) is None:
+        with _breakersLock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(WebConfig.WEB_BREAKER_FAILURES, WebConfig.WEB_BREAKER_RESET))
+    return breaker
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the
+    function and every caller that arrives while it is running waits for and
+    shares its result (or exception) instead of repeating the work.
+    """
+    def __init__(self) -> None:
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` unless a call for ``key`` is already in
+        flight, in which case wait for that call's outcome.
+        """
+        with self._lock:
+            if (call := self._calls.get(key)) is not None:
+                leader = False
+            else:
+                call = self._calls[key] = Future()
+                leader = True
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+upstreamFlight = SingleFlight()
+
+
+def fetchPage(url: str) -> requests.Response:
+    """
+    GET a page over the shared keep-alive session with connect/read timeouts,
+    through the host's circuit breaker.
+
+    Parameters:
+        ``url`` (``str``):
+            The page to fetch.
+
+    Returns:
+        ``requests.Response``:
+            The upstream response.
+
+    Raises:
+        ``CircuitOpen``:
+            The host has been failing and is not being contacted.
+    """
+    breaker = breakerFor(url)
+    breaker.acquire()
+    try:
+        res = httpSession.get(url, timeout=(WebConfig.WEB_CONNECT_TIMEOUT, WebConfig.WEB_READ_TIMEOUT))
+    except Exception:
+        breaker.recordFailure()
+        raise
+
+    if res.status_code >= 500:
+        breaker.recordFailure()
+    else:
+        breaker.recordSuccess()
+    return res
+
+
+def fetchPages(urls: list[str], deadline: float = WebConfig.WEB_DEADLINE) -> list[requests.Response | Exception]:
+    """
+    Fetch several pages concurrently, waiting at most ``deadline`` seconds
+    for all of them.
+
+    Parameters:
+        ``urls`` (``list[str]``):
+            Pages to fetch.
+        ``deadline`` (``float``):
+            Overall time budget in seconds.
+
+    Returns:
+        ``list``:
+            One entry per URL, in order: the response, or the exception
+            raised while fetching it (``DeadlineExceeded`` if it did not
+            finish in time).
+    """
+    futures = [_fetchPool.submit(fetchPage, url) for url in urls]
+    done, _ = wait(futures, timeout=deadline)
+
+    results = []
+    for future in futures:
+        if future not in done:
+            future.cancel()
+            results.append(DeadlineExceeded(f"Deadline of {deadline}s exceeded"))
+        elif (err := future.exception()) is not None:
+            results.append(err)
+        else:
+            results.append(future.result())
+    return results
+
+
+def upstreamErrorCode(err: Exception) -> int:
+    """
+    Map a fetch exception to the HTTP status returned to the client:
+    ``503`` while the circuit is open, ``504`` for timeouts and ``502`` for
+    anything else.
+    """
+    if isinstance(err, CircuitOpen):
+        return 503
+    return 504 if isinstance(err, requests.Timeout) else 502
+
+
+def classStrainer(tag: str, *classes: str) -> SoupStrainer:
+    """
+    Strainer keeping only ``tag`` elements (and their contents) that carry at
+    least one of ``classes``.
+
+    Strainers see the raw ``class`` attribute before it is split, so
+    multi-class elements are matched word by word.
+    """
+    wanted = set(classes)
+
+    def matches(value) -> bool:
+        if not value:
+            return False
+        return not wanted.isdisjoint(value.split() if isinstance(value, str) else value)
+
+    return SoupStrainer(tag, class_=matches)
+
+
+def parseHTML(markup: str, strainer: SoupStrainer | None = None) -> BeautifulSoup:
+    """
+    Parse HTML with the fastest installed backend (``lxml`` if available),
+    building a tree only for the elements ``strainer`` keeps.
+
+    Parameters:
+        ``markup`` (``str``):
+            The page source.
+        ``strainer`` (``SoupStrainer``):
+            Restricts which elements are parsed into the tree.
+
+    Returns:
+        ``BeautifulSoup``:
+            The (partial) document.
+    """
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=strainer)
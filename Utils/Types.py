@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Tuple, Callable, Optional
+from typing import Any, Dict, List, Tuple, Callable, Optional, Container
 from werkzeug.datastructures import FileStorage
 from flask import Response
 from enum import Enum
@@ -1,10 +1,16 @@
-from Config import EnvConfig, APIConfig, MPortfolioConfig
-from Controllers.DBController import initDB
+from Config import EnvConfig, APIConfig, MPortfolioConfig, DBConfig
+from Controllers.AdherenceController import rebuildAdherence, adherenceDrift
+from Controllers.ArchiveController import archiveDoseHistory
+from Controllers.MigrationController import migrateDB, schemaVersion
+from Controllers.DBController import initDB, engine
+from Utils.Helpers.JSONHelpers import FastJSONProvider
+from Utils.Helpers.AuthHelpers import PasswordPoolBusy
+from werkzeug.exceptions import RequestEntityTooLarge
+from flask import Flask, Blueprint, jsonify
 from Utils.Decorators import Ratelimiter
-from flask import Flask, Blueprint
 from flasgger import Swagger
 from flask_cors import CORS
-from redis import Redis
+import click
 import os
 
 from APIs.PortfolioAPI import portfolioBP
@@ -15,12 +21,54 @@ from APIs.UserAPI import userBP
 from APIs.DoseGuardAPI import doseGuardBP
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+app.config["USE_X_SENDFILE"] = MPortfolioConfig.PORTFOLIO_USE_X_SENDFILE
 CORS(app, origins=["http://localhost:63342", "http://127.0.0.1:3000"])
 
-redisClient = Redis(host="0.0.0.0", port=6379)
+@app.errorhandler(PasswordPoolBusy)
+def passwordPoolBusy(e):
+    return jsonify(error="Server busy, please retry"), 503, {"Retry-After": "1"}
+
+@app.errorhandler(RequestEntityTooLarge)
+def requestTooLarge(e):
+    return jsonify(error="Request body too large"), 413
+
 Ratelimiter.init_app(app)
 
 initDB()
+if DBConfig.DB_MIGRATE_ON_STARTUP:
+    migrateDB()
+
+@app.cli.command("migrate")
+def migrateCommand():
+    """Apply pending database migrations."""
+    applied = migrateDB()
+    print(f"Applied migrations: {applied or 'none'}; schema version {schemaVersion()}")
+
+@app.cli.command("rebuild-adherence")
+def rebuildAdherenceCommand():
+    """Recompute the DoseGuard adherence rollup from the dose history."""
+    with engine.begin() as conn:
+        rows = rebuildAdherence(conn)
+    print(f"Rebuilt adherence rollup: {rows} rows")
+
+@app.cli.command("archive-history")
+@click.option("--days", type=int, default=None, help="Archive entries older than this many days.")
+def archiveHistoryCommand(days):
+    """Move old and soft-deleted dose history into the archive database."""
+    result = archiveDoseHistory(days)
+    print(f"Archived {result['archived']} dose history rows in {result['chunks']} chunks")
+
+@app.cli.command("check-adherence")
+def checkAdherenceCommand():
+    """Compare the adherence rollup with a full recompute; exits 1 on drift."""
+    with engine.connect() as conn:
+        drift = adherenceDrift(conn)
+    for row in drift:
+        print(row)
+    print(f"Adherence rollup {'drifted on ' + str(len(drift)) + ' keys' if drift else 'matches the dose history'}")
+    if drift:
+        raise SystemExit(1)
 
 swagger = Swagger(app, template=APIConfig.SWAGGER_TEMPLATE(EnvConfig.APP_NAME), config=APIConfig.SWAGGER_CONFIG(EnvConfig.APP_NAME))
 
@@ -0,0 +1,39 @@
+import tempfile
+import sys
+import os
+
+# Point the app at throwaway SQLite databases before any module reads its config
+_dataDir = tempfile.mkdtemp(prefix="kapi-tests-")
+os.environ.update(
+    ADMIN_USERNAME="admin",
+    ADMIN_PASSWORD="admin",
+    DB=os.path.join(_dataDir, "test"),
+    USERS_TABLE="users",
+    APP_NAME="K-API tests",
+    REDIS_URL="redis://127.0.0.1:1",
+)
+os.environ.pop("DB_DSN", None)
+os.environ.pop("ARCHIVE_DB_DSN", None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+@pytest.fixture(scope="session")
+def app():
+    from Utils.Decorators import Ratelimiter
+    from setup import app
+    # Same effect as RATELIMIT_ENABLED = False; tests that need it turn it back on
+    Ratelimiter.enabled = False
+    return app
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+@pytest.fixture(scope="session")
+def adminKey(app) -> str:
+    from Controllers.DBController import getSession
+    from Models import User
+    with getSession() as session:
+        return session.query(User).filter_by(username="admin").one().apiKey
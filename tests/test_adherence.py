@@ -0,0 +1,84 @@
+from Controllers.DoseGuardController import (_bulkCreatePatients, _bulkCreatePills, _bulkCreateDoses, _createDoseHistory,
+                                             _bulkCreateDoseHistory, _updateDoseHistory, _deleteDoseHistory)
+from Controllers.AdherenceController import adherenceDrift, rebuildAdherence
+from Controllers.ArchiveController import archiveDoseHistory
+from Controllers.DBController import initDB, engine, getSession
+from Models import AdherenceRollup, DoseHistory
+import sqlalchemy as sa
+import random
+import pytest
+
+PATIENTS = 4
+DOSES = 3
+
+@pytest.fixture(scope="module", autouse=True)
+def catalog():
+    initDB()
+    assert _bulkCreatePatients([{"name": f"p{i}"} for i in range(PATIENTS)])[1] == 201
+    assert _bulkCreatePills([{"name": "pill", "strength": 1.0}])[1] == 201
+    assert _bulkCreateDoses([{"pillId": 1, "interval": 8, "amount": 1} for _ in range(DOSES)])[1] == 201
+
+def drift() -> list[dict]:
+    with engine.connect() as conn:
+        return adherenceDrift(conn)
+
+def rollup() -> dict:
+    with getSession() as session:
+        return {(r.patientId, r.doseId, r.day): (r.taken, r.missed) for r in session.query(AdherenceRollup)}
+
+def randomEntry(rng: random.Random) -> dict:
+    return {"patientId": rng.randint(1, PATIENTS), "doseId": rng.randint(1, DOSES), "taken": rng.random() < 0.6}
+
+def test_update_moves_contribution():
+    entry, code = _createDoseHistory(1, 1, True)
+    assert code == 201
+    before = rollup()
+
+    assert _updateDoseHistory(entry["id"], {"patientId": 2, "taken": False})[1] == 200
+    after = rollup()
+    day = entry["createdOn"].date()
+
+    assert after.get((1, 1, day), (0, 0))[0] == before[(1, 1, day)][0] - 1
+    assert after[(2, 1, day)][1] == before.get((2, 1, day), (0, 0))[1] + 1
+    assert drift() == []
+
+def test_incremental_rollup_matches_recompute():
+    rng = random.Random(23)
+    ids = [_createDoseHistory(**randomEntry(rng))[0]["id"] for _ in range(40)]
+
+    response, code = _bulkCreateDoseHistory([randomEntry(rng) for _ in range(200)])
+    assert code == 201
+    ids += response["ids"]
+
+    for _ in range(150):
+        entryId, op = rng.choice(ids), rng.random()
+        if op < 0.3:
+            _updateDoseHistory(entryId, {"taken": rng.random() < 0.5})
+        elif op < 0.5:
+            _updateDoseHistory(entryId, {"patientId": rng.randint(1, PATIENTS)})
+        elif op < 0.7:
+            _updateDoseHistory(entryId, {"doseId": rng.randint(1, DOSES)})
+        elif op < 0.9:
+            _deleteDoseHistory(entryId)
+        else:
+            ids.append(_createDoseHistory(**randomEntry(rng))[0]["id"])
+
+    assert rollup()
+    assert all(taken or missed for taken, missed in rollup().values())
+    assert drift() == []
+
+def test_archival_and_rebuild_keep_rollup_exact():
+    before = rollup()
+
+    result = archiveDoseHistory(olderThanDays=0, batchSize=64)
+    assert result["archived"] > 0
+    with getSession() as session:
+        assert session.query(DoseHistory).count() == 0
+
+    assert rollup() == before
+    assert drift() == []
+
+    with engine.begin() as conn:
+        rebuildAdherence(conn)
+    assert rollup() == before
+    assert drift() == []
@@ -0,0 +1,46 @@
+from Utils.Helpers import AuthHelpers
+from Controllers.DBController import getSession
+from Config import APIConfig
+from Models import User
+import threading
+import bcrypt
+
+def passwordHash(username: str) -> str:
+    with getSession() as session:
+        return session.query(User).filter_by(username=username).one().passwordHash
+
+def test_register_and_login(client):
+    response = client.post("/api/auth/register", json={"username": "alice", "password": "secret"})
+    assert response.status_code == 201
+    assert response.json["username"] == "alice"
+
+    response = client.post("/api/auth/login", json={"username": "alice", "password": "secret"})
+    assert response.status_code == 200
+    apiKey = response.json["apiKey"]
+
+    assert client.get("/api/user", headers={"X-API-Key": apiKey}).status_code == 200
+
+def test_register_conflict_and_bad_credentials(client):
+    client.post("/api/auth/register", json={"username": "bob", "password": "secret"})
+    assert client.post("/api/auth/register", json={"username": "bob", "password": "other"}).status_code == 409
+    assert client.post("/api/auth/login", json={"username": "bob", "password": "wrong"}).status_code == 401
+    assert client.post("/api/auth/login", json={"username": "nobody", "password": "secret"}).status_code == 404
+    assert client.post("/api/auth/login", json={"username": "bob"}).status_code == 400
+
+def test_login_rehashes_outdated_password(client):
+    with getSession() as session:
+        session.add(User(username="carol", passwordHash=bcrypt.hashpw(b"secret", bcrypt.gensalt(4)).decode()))
+
+    assert client.post("/api/auth/login", json={"username": "carol", "password": "secret"}).status_code == 200
+    assert int(passwordHash("carol").split("$")[2]) == APIConfig.BCRYPT_ROUNDS
+    assert client.post("/api/auth/login", json={"username": "carol", "password": "secret"}).status_code == 200
+
+def test_login_when_hashing_is_saturated(client, monkeypatch):
+    client.post("/api/auth/register", json={"username": "dave", "password": "secret"})
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(AuthHelpers, "_hashSlots", slots)
+
+    response = client.post("/api/auth/login", json={"username": "dave", "password": "secret"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,109 @@
+from Utils.Helpers.AuthHelpers import authCache, authVersions, _authVersionKey
+from Utils.Helpers.CacheHelpers import SharedVersions
+from Controllers.AdminController import _patchUser
+from Controllers.DBController import getSession, engine
+from Utils.Enums import Permissions
+from redis import ConnectionError
+from Config import APIConfig
+from Models import User
+import sqlalchemy as sa
+import itertools
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+_userIds = itertools.count()
+
+class CountingRedis:
+    """
+    Delegates to a fake Redis and counts the commands sent to it.
+    """
+    def __init__(self, client):
+        self.client = client
+        self.calls = 0
+
+    def __getattr__(self, name):
+        self.calls += 1
+        return getattr(self.client, name)
+
+class DownRedis:
+    def __getattr__(self, name):
+        raise ConnectionError("down")
+
+@pytest.fixture()
+def redisServer(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(authVersions, "client", CountingRedis(fakeredis.FakeRedis(server=server)))
+    monkeypatch.setattr(authVersions, "_downUntil", 0.0)
+    monkeypatch.setattr(authVersions, "_nextPoll", 0.0)
+    authCache.clear()
+    return server
+
+@pytest.fixture()
+def admin(app):
+    with getSession() as session:
+        user = User(username=f"cache-admin-{next(_userIds)}", passwordHash="x", perms=int(Permissions.ADMIN))
+        session.add(user)
+        session.flush()
+        return user.id, user.apiKey
+
+def listUsers(client, apiKey: str) -> int:
+    return client.get("/api/admin/users", headers={"X-API-Key": apiKey}).status_code
+
+def demote(uid: int) -> None:
+    # a raw write, as another worker's commit looks to this one
+    with engine.begin() as conn:
+        conn.execute(sa.update(User.__table__).where(User.__table__.c.id == uid).values(perms=int(Permissions.GENERAL)))
+
+def test_hits_do_not_query_redis_per_request(client, redisServer, admin):
+    _, apiKey = admin
+    assert listUsers(client, apiKey) == 200
+    calls = authVersions.client.calls
+
+    for _ in range(20):
+        assert listUsers(client, apiKey) == 200
+    assert authVersions.client.calls - calls <= 1
+
+def test_invalidation_from_another_worker(client, redisServer, admin, monkeypatch):
+    uid, apiKey = admin
+    assert listUsers(client, apiKey) == 200
+
+    demote(uid)
+    otherWorker = SharedVersions(fakeredis.FakeRedis(server=redisServer), authVersions.namespace,
+                                 authVersions.keyTtl, authVersions.retryAfter)
+    otherWorker.bump([_authVersionKey(apiKey)])
+
+    # until the next poll the cached epoch is still trusted
+    assert listUsers(client, apiKey) == 200
+    monkeypatch.setattr(authVersions, "_nextPoll", 0.0)
+    assert listUsers(client, apiKey) == 403
+
+def test_unrelated_bump_keeps_entry(client, redisServer, admin, monkeypatch):
+    _, apiKey = admin
+    assert listUsers(client, apiKey) == 200
+
+    authVersions.bump([_authVersionKey("someone-else")])
+    monkeypatch.setattr(authVersions, "_nextPoll", 0.0)
+    assert listUsers(client, apiKey) == 200
+    assert authCache.get(apiKey) is not None
+
+def test_orm_change_invalidates_after_commit(client, redisServer, admin):
+    uid, apiKey = admin
+    assert listUsers(client, apiKey) == 200
+
+    assert _patchUser(uid, {"perms": int(Permissions.GENERAL)})[1] == 200
+    assert authCache.get(apiKey) is None
+    assert authVersions.read([_authVersionKey(apiKey)]) == (1,)
+    assert listUsers(client, apiKey) == 403
+
+def test_fallback_ttl_without_redis(client, redisServer, admin, monkeypatch):
+    uid, apiKey = admin
+    assert listUsers(client, apiKey) == 200
+
+    monkeypatch.setattr(authVersions, "client", DownRedis())
+    monkeypatch.setattr(authVersions, "_nextPoll", 0.0)
+    demote(uid)
+    assert listUsers(client, apiKey) == 200
+
+    monkeypatch.setattr(APIConfig, "AUTH_CACHE_FALLBACK_TTL", 0)
+    assert listUsers(client, apiKey) == 403
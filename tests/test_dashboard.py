@@ -0,0 +1,63 @@
+from Controllers import DoseGuardController
+from Controllers.DoseGuardController import (_createCaregiver, _createPatient, _attachPatientToCaregiver, _caregiverDashboard,
+                                             dashboardCache, dashboardVersions)
+from Utils.Helpers.CacheHelpers import SharedVersions
+from Controllers.DBController import engine
+from Models import Patient
+import sqlalchemy as sa
+import itertools
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+_caregiverIds = itertools.count()
+
+@pytest.fixture()
+def redisServer(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(dashboardVersions, "client", fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(dashboardVersions, "_downUntil", 0.0)
+    dashboardCache.clear()
+    return server
+
+@pytest.fixture()
+def caregiver(app):
+    caregiverId = _createCaregiver("carer", f"carer-{next(_caregiverIds)}", "secret")[0]["id"]
+    patientId = _createPatient("patient")[0]["id"]
+    assert _attachPatientToCaregiver(caregiverId, patientId)[1] == 201
+    return caregiverId, patientId
+
+def rename(patientId: int, name: str) -> None:
+    # a raw write, as another worker's commit looks to this one
+    with engine.begin() as conn:
+        conn.execute(sa.update(Patient.__table__).where(Patient.__table__.c.id == patientId).values(name=name))
+
+def test_other_worker_write_invalidates(redisServer, caregiver):
+    caregiverId, patientId = caregiver
+    assert _caregiverDashboard(caregiverId)[0]["patients"][0]["name"] == "patient"
+
+    rename(patientId, "renamed")
+    assert _caregiverDashboard(caregiverId)[0]["patients"][0]["name"] == "patient"
+
+    otherWorker = fakeredis.FakeRedis(server=redisServer)
+    SharedVersions(otherWorker, dashboardVersions.namespace, dashboardVersions.keyTtl,
+                   dashboardVersions.retryAfter).bump([f"patient:{patientId}"])
+    assert _caregiverDashboard(caregiverId)[0]["patients"][0]["name"] == "renamed"
+
+def test_write_during_rebuild_is_not_cached(redisServer, caregiver, monkeypatch):
+    caregiverId, patientId = caregiver
+    build = DoseGuardController._buildDashboard
+
+    def buildThenWrite(session, caregiverRow):
+        result = build(session, caregiverRow)
+        rename(patientId, "during")
+        dashboardVersions.bump([f"patient:{patientId}"])
+        return result
+
+    monkeypatch.setattr(DoseGuardController, "_buildDashboard", buildThenWrite)
+    assert _caregiverDashboard(caregiverId)[0]["patients"][0]["name"] == "patient"
+    assert dashboardCache.get(caregiverId) is None
+
+    monkeypatch.setattr(DoseGuardController, "_buildDashboard", build)
+    assert _caregiverDashboard(caregiverId)[0]["patients"][0]["name"] == "during"
+    assert dashboardCache.get(caregiverId) is not None
@@ -0,0 +1,98 @@
+from Utils.Helpers.DBHelpers import encodeCursor
+import itertools
+import pytest
+
+_caregiverIds = itertools.count()
+
+def page(client, headers, url: str, **params):
+    response = client.get(url, headers=headers, query_string=params)
+    assert response.status_code == 200, response.json
+    return response.json
+
+@pytest.fixture()
+def headers(adminKey):
+    return {"X-API-Key": adminKey}
+
+@pytest.fixture()
+def caregiverWithPatients(client, headers):
+    caregiverId = client.post("/api/doseguard/caregivers", headers=headers,
+                              json={"name": "pager", "username": f"pager-{next(_caregiverIds)}", "password": "secret"}).json["id"]
+    response = client.post("/api/doseguard/patients/bulk", headers=headers, json=[{"name": f"p{i}"} for i in range(25)])
+    assert response.status_code == 201
+    patientIds = response.json["ids"]
+
+    links = [{"caregiverId": caregiverId, "patientId": patientId} for patientId in patientIds]
+    assert client.post("/api/doseguard/caregivers/patients/bulk", headers=headers, json=links).status_code == 201
+    return caregiverId, patientIds
+
+def test_bulk_create_returns_ids_in_order(client, headers):
+    response = client.post("/api/doseguard/pills/bulk", headers=headers,
+                           json=[{"name": f"pill{i}", "strength": i + 1} for i in range(5)])
+    assert response.status_code == 201
+    assert response.json["created"] == 5
+
+    names = [client.get(f"/api/doseguard/pills/{pillId}", headers=headers).json["name"] for pillId in response.json["ids"]]
+    assert names == [f"pill{i}" for i in range(5)]
+
+def test_bulk_create_is_all_or_nothing(client, headers):
+    before = len(page(client, headers, "/api/doseguard/patients", limit=1000)["data"])
+    response = client.post("/api/doseguard/patients/bulk", headers=headers, json=[{"name": "ok"}, {"age": 3}])
+    assert response.status_code == 400
+    assert len(page(client, headers, "/api/doseguard/patients", limit=1000)["data"]) == before
+
+    response = client.post("/api/doseguard/doses/bulk", headers=headers,
+                           json=[{"pillId": 10 ** 6, "interval": 8, "amount": 1}])
+    assert response.status_code == 400
+    assert response.json["errors"] == [{"index": 0, "error": f"pillId {10 ** 6} does not exist"}]
+
+def test_cursor_walks_every_row_once(client, headers, caregiverWithPatients):
+    caregiverId, patientIds = caregiverWithPatients
+    url = f"/api/doseguard/caregivers/{caregiverId}/patients"
+
+    seen, after, pages = [], None, 0
+    while True:
+        params = {"limit": 10} | ({"after": after} if after else {})
+        body = page(client, headers, url, **params)
+        seen += [patient["id"] for patient in body["data"]]
+        pages += 1
+        if not (after := body["next"]):
+            break
+
+    assert seen == patientIds
+    assert pages == 3
+
+def test_exact_page_has_no_next(client, headers, caregiverWithPatients):
+    caregiverId, patientIds = caregiverWithPatients
+    url = f"/api/doseguard/caregivers/{caregiverId}/patients"
+
+    first = page(client, headers, url, limit=20)
+    last = page(client, headers, url, limit=5, after=first["next"])
+    assert [patient["id"] for patient in last["data"]] == patientIds[20:]
+    assert last["next"] is None
+
+def test_cursor_skips_rows_deleted_between_pages(client, headers, caregiverWithPatients):
+    caregiverId, patientIds = caregiverWithPatients
+    url = f"/api/doseguard/caregivers/{caregiverId}/patients"
+
+    first = page(client, headers, url, limit=10)
+    assert client.delete(f"/api/doseguard/patients/{patientIds[10]}", headers=headers).status_code == 200
+    second = page(client, headers, url, limit=10, after=first["next"])
+    assert [patient["id"] for patient in second["data"]] == patientIds[11:21]
+
+def test_invalid_cursor(client, headers):
+    assert client.get("/api/doseguard/patients", headers=headers, query_string={"after": "not-a-cursor"}).status_code == 400
+    assert page(client, headers, "/api/doseguard/patients", after=encodeCursor(10 ** 9))["data"] == []
+
+def test_posts_etag(client):
+    first = client.get("/api/portfolio/posts", query_string={"category": "etag"})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    assert client.get("/api/portfolio/posts", query_string={"category": "etag"},
+                      headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/api/portfolio/posts", json={"imageURL": "x", "title": "t", "description": "d", "category": "etag"})
+    changed = client.get("/api/portfolio/posts", query_string={"category": "etag"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [post["title"] for post in changed.json["data"]] == ["t"]
@@ -0,0 +1,61 @@
+from Controllers import PortfolioController
+from Controllers.DBController import getSession
+from concurrent.futures import Future
+from Config import MPortfolioConfig
+from Models import ImageVariant
+import pytest
+import os
+import io
+
+PNG = b"\x89PNG\r\n\x1a\n" + os.urandom(4096)
+
+@pytest.fixture(autouse=True)
+def uploads(tmp_path, monkeypatch):
+    monkeypatch.setattr(MPortfolioConfig, "PORTFOLIO_UPLOADS_FOLDER", str(tmp_path))
+    # variants need Pillow and a process pool; the upload response does not depend on them
+    monkeypatch.setattr(PortfolioController, "_queueVariants", lambda *args: None)
+    return tmp_path
+
+def upload(client, data: bytes):
+    return client.post("/api/portfolio/image", data={"image": (io.BytesIO(data), "a.png")},
+                       content_type="multipart/form-data")
+
+def test_upload_returns_public_path(client, uploads):
+    response = upload(client, PNG)
+    assert response.status_code == 201
+    body = response.json
+    digest = body["sha256"]
+
+    assert body["filename"] == f"{digest[:2]}/{digest[2:4]}/{digest}.png"
+    assert body["url"] == MPortfolioConfig.PORTFOLIO_IMAGES_BASE_URL + body["filename"]
+    assert str(uploads) not in response.get_data(as_text=True)
+
+    image = client.get(body["url"])
+    assert image.status_code == 200
+    assert image.data == PNG
+
+    again = upload(client, PNG)
+    assert again.status_code == 200
+    assert again.json == body
+
+def test_images_outside_the_store_are_not_served(client, uploads):
+    (uploads / "secret.txt").write_text("x")
+    for path in ("secret.txt", "../secret.txt", "etc/passwd"):
+        assert client.get(MPortfolioConfig.PORTFOLIO_IMAGES_BASE_URL + path).status_code == 404
+
+def finishedJob(variants: list[dict]) -> Future:
+    job = Future()
+    job.set_result(variants)
+    return job
+
+def test_duplicate_variant_jobs_record_once():
+    digest = "ab" * 32
+    variants = [{"width": 320, "format": fmt, "path": f"ab/ab/{digest}_320.{fmt}", "size": 10} for fmt in ("png", "webp")]
+
+    PortfolioController._recordVariants(digest, finishedJob(variants[:1]))
+    PortfolioController.postsCache.set("page", "stale")
+    PortfolioController._recordVariants(digest, finishedJob(variants))
+
+    with getSession() as session:
+        assert sorted(v.format for v in session.query(ImageVariant).filter_by(sha256=digest)) == ["png", "webp"]
+    assert PortfolioController.postsCache.get("page") is None
@@ -0,0 +1,61 @@
+from Utils.Helpers.RatelimitHelpers import TwoTierLimiter, parseLimit
+from redis import ConnectionError
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+class DownRedis:
+    def pipeline(self, **kwargs):
+        raise ConnectionError("down")
+
+def limiter(client, workers: int = 1, maxBuckets: int = 100) -> TwoTierLimiter:
+    return TwoTierLimiter(client, 0.2, 5, workers, maxBuckets)
+
+def test_parse_limit():
+    assert parseLimit("10/minute") == (10, 60)
+    assert parseLimit("100/5 minutes") == (100, 300)
+    with pytest.raises(ValueError):
+        parseLimit("ten per minute")
+
+def test_limit_shared_between_workers():
+    client = fakeredis.FakeRedis()
+    workers = [limiter(client), limiter(client)]
+
+    allowed = sum(workers[i % 2].hit("ep", "user", "10/minute")[0] for i in range(30))
+    assert allowed == 10
+
+def test_local_share_without_redis():
+    local = limiter(DownRedis(), workers=4)
+    allowed = sum(local.hit("ep", "user", "10/minute")[0] for _ in range(10))
+    assert allowed == 3
+
+def test_bucket_count_is_bounded():
+    client = fakeredis.FakeRedis()
+    bounded = limiter(client, maxBuckets=3)
+    for i in range(50):
+        assert bounded.hit("ep", f"user-{i}", "10/minute")[0]
+    assert len(bounded._buckets) == 3
+
+def test_eviction_returns_unused_tokens():
+    client = fakeredis.FakeRedis()
+    bounded = limiter(client, maxBuckets=1)
+    other = limiter(client)
+
+    assert bounded.hit("ep", "user", "10/minute")[0]
+    assert int(client.get(next(iter(bounded._buckets.values())).redisKey)) == 2
+
+    bounded.hit("ep", "someone-else", "10/minute")
+    # one request served, the other leased token went back
+    assert sum(other.hit("ep", "user", "10/minute")[0] for _ in range(20)) == 9
+
+def test_eviction_reports_offline_requests():
+    client = fakeredis.FakeRedis()
+    bounded = limiter(client, maxBuckets=1)
+
+    bounded.client = DownRedis()
+    assert bounded.hit("ep", "user", "10/minute")[0]
+    bounded.client, bounded._redisRetryAt = client, 0.0
+
+    bounded.hit("ep", "someone-else", "10/minute")
+    other = limiter(client)
+    assert sum(other.hit("ep", "user", "10/minute")[0] for _ in range(20)) == 9
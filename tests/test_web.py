@@ -0,0 +1,65 @@
+from Utils.Helpers.WebHelpers import SingleFlight, CircuitBreaker, CircuitOpen, upstreamErrorCode, DeadlineExceeded
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import requests
+import pytest
+import time
+
+def test_single_flight_shares_one_call():
+    flight, calls, started, release = SingleFlight(), [], threading.Event(), threading.Event()
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "page"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flight.do, "url", slow)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "url", slow) for _ in range(3)]
+        time.sleep(0.05)
+        release.set()
+        results = [leader.result(), *(f.result() for f in followers)]
+
+    assert results == ["page"] * 4
+    assert len(calls) == 1
+    assert flight.do("url", lambda: "again") == "again"
+
+def test_single_flight_shares_errors():
+    def failing():
+        raise ValueError("upstream")
+
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("url", failing)
+    assert flight.do("url", lambda: "ok") == "ok"
+
+def test_breaker_opens_and_probes():
+    breaker = CircuitBreaker(failureThreshold=2, resetTimeout=0.05)
+    for _ in range(2):
+        breaker.acquire()
+        breaker.recordFailure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.acquire()
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.acquire()
+    with pytest.raises(CircuitOpen):
+        breaker.acquire()
+
+    breaker.recordFailure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    breaker.acquire()
+    breaker.recordSuccess()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.acquire()
+
+def test_upstream_error_codes():
+    assert upstreamErrorCode(CircuitOpen()) == 503
+    assert upstreamErrorCode(DeadlineExceeded()) == 504
+    assert upstreamErrorCode(requests.ConnectionError()) == 502